@@ -0,0 +1,49 @@
+"""Notify the analytics mirror on audit/usage log inserts
+
+Revision ID: 2e8d5a6b9c31
+Revises: 7b9e1f4c2d08
+Create Date: 2026-10-16 15:48:56.302174
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e8d5a6b9c31'
+down_revision: Union[str, Sequence[str], None] = '7b9e1f4c2d08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MIRRORED_TABLES = ['audit_logs', 'usage_logs']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Only the row id is sent: NOTIFY payloads are capped at 8000 bytes and
+    # audit rows carry request/response bodies.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_analytics_mirror() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify(
+                'analytics_mirror',
+                json_build_object('table', TG_TABLE_NAME, 'id', NEW.id::text)::text
+            );
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    for table in MIRRORED_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_notify_analytics_mirror AFTER INSERT ON {table}
+            FOR EACH ROW EXECUTE FUNCTION notify_analytics_mirror()
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in MIRRORED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_notify_analytics_mirror ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_analytics_mirror()")
@@ -0,0 +1,54 @@
+"""Replace native enum types with CHECK-constrained varchar
+
+Revision ID: 3f6d2b8e9a14
+Revises: e7a93b5d2c40
+Create Date: 2026-10-16 11:20:06.395281
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6d2b8e9a14'
+down_revision: Union[str, Sequence[str], None] = 'e7a93b5d2c40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, enum type / constraint name, values, server default)
+ENUM_COLUMNS = [
+    ('users', 'role', 'userrole', ('user', 'admin'), 'user'),
+    ('subscriptions', 'plan', 'subscriptionplan', ('free', 'developer', 'business', 'enterprise'), 'free'),
+    ('subscriptions', 'status', 'subscriptionstatus', ('active', 'cancelled', 'past_due', 'incomplete', 'trialing'), 'active'),
+    ('support_tickets', 'status', 'ticketstatus', ('open', 'in_progress', 'resolved', 'closed'), None),
+    ('support_tickets', 'priority', 'ticketpriority', ('low', 'medium', 'high', 'urgent'), None),
+    ('invoices', 'status', 'invoicestatus', ('draft', 'open', 'paid', 'void', 'uncollectible'), None),
+]
+
+
+def _in_list(values) -> str:
+    return ", ".join(f"'{value}'" for value in values)
+
+
+def upgrade() -> None:
+    """Convert enum columns to VARCHAR(20) + CHECK and drop the enum types."""
+    for table, column, name, values, default in ENUM_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR(20) USING {column}::text")
+        op.create_check_constraint(name, table, f"{column} IN ({_in_list(values)})")
+        if default is not None:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{default}'")
+        op.execute(f"DROP TYPE IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    """Restore native enum types."""
+    for table, column, name, values, default in ENUM_COLUMNS:
+        op.drop_constraint(name, table, type_='check')
+        op.execute(f"CREATE TYPE {name} AS ENUM ({_in_list(values)})")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {name} USING {column}::{name}")
+        if default is not None:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{default}'::{name}")
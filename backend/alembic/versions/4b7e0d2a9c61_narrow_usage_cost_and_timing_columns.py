@@ -0,0 +1,79 @@
+"""Store log response times as REAL and usage cost as NUMERIC(12,4)
+
+Revision ID: 4b7e0d2a9c61
+Revises: 9a4f2c7e1b53
+Create Date: 2026-10-16 17:58:03.527190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e0d2a9c61'
+down_revision: Union[str, Sequence[str], None] = '9a4f2c7e1b53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same definition as b14d62dccadd; the aggregate reads cost and response_time,
+# so it has to be dropped while their types change.
+USAGE_HOURLY_VIEW = """
+    CREATE MATERIALIZED VIEW usage_hourly
+    WITH (timescaledb.continuous) AS
+    SELECT time_bucket('1 hour', created_at) AS bucket,
+           user_id,
+           endpoint,
+           count(*) AS request_count,
+           count(*) FILTER (WHERE success = false) AS failed_count,
+           avg(response_time) AS avg_response_time,
+           sum(cost) AS total_cost
+    FROM usage_logs
+    GROUP BY bucket, user_id, endpoint
+    WITH NO DATA
+"""
+
+USAGE_HOURLY_POLICY = """
+    SELECT add_continuous_aggregate_policy('usage_hourly',
+        start_offset => interval '1 day',
+        end_offset => interval '1 hour',
+        schedule_interval => interval '10 minutes')
+"""
+
+
+def _has_usage_hourly() -> bool:
+    bind = op.get_bind()
+    return bind.execute(sa.text("SELECT to_regclass('usage_hourly')")).scalar() is not None
+
+
+def _alter_usage_logs(response_time_type: sa.types.TypeEngine, cost_type: sa.types.TypeEngine,
+                      existing_response_time: sa.types.TypeEngine, existing_cost: sa.types.TypeEngine) -> None:
+    has_rollup = _has_usage_hourly()
+    if has_rollup:
+        op.execute("DROP MATERIALIZED VIEW usage_hourly")
+
+    op.alter_column('usage_logs', 'response_time', type_=response_time_type,
+                    existing_type=existing_response_time, existing_nullable=True)
+    op.alter_column('usage_logs', 'cost', type_=cost_type,
+                    existing_type=existing_cost, existing_nullable=True)
+
+    if has_rollup:
+        op.execute(USAGE_HOURLY_VIEW)
+        op.execute(USAGE_HOURLY_POLICY)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _alter_usage_logs(sa.REAL(), sa.Numeric(12, 4),
+                      sa.Float(), sa.Float())
+    op.alter_column('weather_requests', 'response_time', type_=sa.REAL(),
+                    existing_type=sa.Float(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('weather_requests', 'response_time', type_=sa.Float(),
+                    existing_type=sa.REAL(), existing_nullable=False)
+    _alter_usage_logs(sa.Float(), sa.Float(),
+                      sa.REAL(), sa.Numeric(12, 4))
@@ -0,0 +1,82 @@
+"""Deduplicate audit log headers into header_sets
+
+Revision ID: 5c0e8a1f3d27
+Revises: b14d62dccadd
+Create Date: 2026-10-16 10:03:18.540912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '5c0e8a1f3d27'
+down_revision: Union[str, Sequence[str], None] = 'b14d62dccadd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('header_sets',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('sha256', sa.LargeBinary(length=32), nullable=False),
+    sa.Column('headers', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('first_seen', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sha256')
+    )
+    op.add_column('audit_logs', sa.Column('request_headers_id', sa.UUID(), nullable=True))
+    op.add_column('audit_logs', sa.Column('response_headers_id', sa.UUID(), nullable=True))
+    op.create_foreign_key('fk_audit_logs_request_headers_id', 'audit_logs', 'header_sets', ['request_headers_id'], ['id'])
+    op.create_foreign_key('fk_audit_logs_response_headers_id', 'audit_logs', 'header_sets', ['response_headers_id'], ['id'])
+
+    # Backfill existing rows. jsonb text output is already key-sorted, so
+    # historical sets dedupe among themselves; new sets hashed by
+    # AuditService may add one extra copy of each.
+    op.execute("""
+        INSERT INTO header_sets (id, sha256, headers)
+        SELECT gen_random_uuid(), sha256(convert_to(h::text, 'UTF8')), h
+        FROM (
+            SELECT request_headers::jsonb AS h FROM audit_logs WHERE request_headers IS NOT NULL
+            UNION
+            SELECT response_headers::jsonb AS h FROM audit_logs WHERE response_headers IS NOT NULL
+        ) AS distinct_headers
+        ON CONFLICT (sha256) DO NOTHING
+    """)
+    op.execute("""
+        UPDATE audit_logs a SET request_headers_id = hs.id
+        FROM header_sets hs
+        WHERE a.request_headers IS NOT NULL
+          AND hs.sha256 = sha256(convert_to(a.request_headers::jsonb::text, 'UTF8'))
+    """)
+    op.execute("""
+        UPDATE audit_logs a SET response_headers_id = hs.id
+        FROM header_sets hs
+        WHERE a.response_headers IS NOT NULL
+          AND hs.sha256 = sha256(convert_to(a.response_headers::jsonb::text, 'UTF8'))
+    """)
+
+    op.drop_column('audit_logs', 'request_headers')
+    op.drop_column('audit_logs', 'response_headers')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('audit_logs', sa.Column('request_headers', sa.JSON(), nullable=True))
+    op.add_column('audit_logs', sa.Column('response_headers', sa.JSON(), nullable=True))
+    op.execute("""
+        UPDATE audit_logs a SET request_headers = hs.headers::json
+        FROM header_sets hs WHERE hs.id = a.request_headers_id
+    """)
+    op.execute("""
+        UPDATE audit_logs a SET response_headers = hs.headers::json
+        FROM header_sets hs WHERE hs.id = a.response_headers_id
+    """)
+    op.drop_constraint('fk_audit_logs_response_headers_id', 'audit_logs', type_='foreignkey')
+    op.drop_constraint('fk_audit_logs_request_headers_id', 'audit_logs', type_='foreignkey')
+    op.drop_column('audit_logs', 'response_headers')
+    op.drop_column('audit_logs', 'request_headers')
+    op.drop_table('header_sets')
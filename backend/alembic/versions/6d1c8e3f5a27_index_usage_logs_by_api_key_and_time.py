@@ -0,0 +1,28 @@
+"""Index usage_logs by api_key_id and created_at
+
+Revision ID: 6d1c8e3f5a27
+Revises: 2e8d5a6b9c31
+Create Date: 2026-10-16 17:05:12.448019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d1c8e3f5a27'
+down_revision: Union[str, Sequence[str], None] = '2e8d5a6b9c31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_usage_logs_api_key_created_at', 'usage_logs', ['api_key_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_usage_logs_api_key_created_at', table_name='usage_logs')
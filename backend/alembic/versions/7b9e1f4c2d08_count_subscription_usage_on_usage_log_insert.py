@@ -0,0 +1,45 @@
+"""Count subscription usage with a trigger on usage_logs inserts
+
+Revision ID: 7b9e1f4c2d08
+Revises: f0a3c9d71b86
+Create Date: 2026-10-16 15:02:11.487390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b9e1f4c2d08'
+down_revision: Union[str, Sequence[str], None] = 'f0a3c9d71b86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Row-level rather than a statement trigger with a transition table:
+    # usage_logs may be a TimescaleDB hypertable, which does not support
+    # transition tables.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_subscription_usage() RETURNS trigger AS $$
+        BEGIN
+            UPDATE subscriptions
+            SET current_month_usage = COALESCE(current_month_usage, 0) + 1
+            WHERE user_id = NEW.user_id AND status = 'active';
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_usage_logs_bump_subscription_usage AFTER INSERT ON usage_logs
+        FOR EACH ROW EXECUTE FUNCTION bump_subscription_usage()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS trg_usage_logs_bump_subscription_usage ON usage_logs")
+    op.execute("DROP FUNCTION IF EXISTS bump_subscription_usage()")
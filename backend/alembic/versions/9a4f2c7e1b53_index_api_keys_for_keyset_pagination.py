@@ -0,0 +1,28 @@
+"""Index api_keys on (created_at, id) for keyset pagination
+
+Revision ID: 9a4f2c7e1b53
+Revises: 6d1c8e3f5a27
+Create Date: 2026-10-16 17:31:40.912664
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f2c7e1b53'
+down_revision: Union[str, Sequence[str], None] = '6d1c8e3f5a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_api_keys_created_at_id', 'api_keys', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_api_keys_created_at_id', table_name='api_keys')
@@ -0,0 +1,40 @@
+"""Add partial indexes for selective boolean/status filters
+
+Revision ID: a2c47e91b6f3
+Revises: 3f6d2b8e9a14
+Create Date: 2026-10-16 11:58:33.671420
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2c47e91b6f3'
+down_revision: Union[str, Sequence[str], None] = '3f6d2b8e9a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_audit_logs_auth_failed', 'audit_logs', ['timestamp'], unique=False,
+                    postgresql_where=sa.text('auth_success = false'))
+    op.create_index('ix_security_events_high_severity', 'security_events', ['timestamp'], unique=False,
+                    postgresql_where=sa.text("severity IN ('HIGH', 'CRITICAL')"))
+    op.create_index('ix_support_tickets_open', 'support_tickets', ['created_at'], unique=False,
+                    postgresql_where=sa.text("status IN ('open', 'in_progress')"))
+    op.create_index('ix_usage_logs_failed', 'usage_logs', ['created_at'], unique=False,
+                    postgresql_where=sa.text('success = false'))
+    op.drop_index(op.f('ix_security_events_severity'), table_name='security_events')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_security_events_severity'), 'security_events', ['severity'], unique=False)
+    op.drop_index('ix_usage_logs_failed', table_name='usage_logs')
+    op.drop_index('ix_support_tickets_open', table_name='support_tickets')
+    op.drop_index('ix_security_events_high_severity', table_name='security_events')
+    op.drop_index('ix_audit_logs_auth_failed', table_name='audit_logs')
@@ -0,0 +1,29 @@
+"""Unique index on subscriptions.stripe_subscription_id
+
+Revision ID: a7c1e9d3b582
+Revises: f3a6d8b2c417
+Create Date: 2026-10-16 20:58:33.142907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c1e9d3b582'
+down_revision: Union[str, Sequence[str], None] = 'f3a6d8b2c417'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_subscriptions_stripe_subscription_id', 'subscriptions',
+                    ['stripe_subscription_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_subscriptions_stripe_subscription_id', table_name='subscriptions')
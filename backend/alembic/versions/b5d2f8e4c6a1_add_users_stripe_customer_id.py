@@ -0,0 +1,40 @@
+"""Add users.stripe_customer_id
+
+Revision ID: b5d2f8e4c6a1
+Revises: a7c1e9d3b582
+Create Date: 2026-10-16 21:14:52.604318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d2f8e4c6a1'
+down_revision: Union[str, Sequence[str], None] = 'a7c1e9d3b582'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('stripe_customer_id', sa.String(length=255), nullable=True))
+    # Carry over the customer of each user's most recent Stripe subscription
+    op.execute("""
+        UPDATE users
+        SET stripe_customer_id = latest.stripe_customer_id
+        FROM (
+            SELECT DISTINCT ON (user_id) user_id, stripe_customer_id
+            FROM subscriptions
+            WHERE stripe_customer_id IS NOT NULL
+            ORDER BY user_id, created_at DESC
+        ) AS latest
+        WHERE users.id = latest.user_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'stripe_customer_id')
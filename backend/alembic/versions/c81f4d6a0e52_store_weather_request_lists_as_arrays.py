@@ -0,0 +1,61 @@
+"""Store weather request locations/variables/endpoints as arrays
+
+Revision ID: c81f4d6a0e52
+Revises: a2c47e91b6f3
+Create Date: 2026-10-16 12:37:49.820113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f4d6a0e52'
+down_revision: Union[str, Sequence[str], None] = 'a2c47e91b6f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # JSON arrays of numbers/strings become valid array literals once the
+    # brackets are swapped for braces, e.g. [[1.5, 2.0]] -> {{1.5, 2.0}}
+    op.alter_column('weather_requests', 'locations',
+               existing_type=sa.Text(),
+               type_=postgresql.ARRAY(sa.Float(), dimensions=2),
+               existing_nullable=False,
+               postgresql_using="translate(locations, '[]', '{}')::double precision[]")
+    op.alter_column('weather_requests', 'variables',
+               existing_type=sa.Text(),
+               type_=postgresql.ARRAY(sa.String(length=100)),
+               existing_nullable=False,
+               postgresql_using="translate(variables, '[]', '{}')::varchar(100)[]")
+    op.alter_column('weather_requests', 'endpoints_called',
+               existing_type=sa.Text(),
+               type_=postgresql.ARRAY(sa.String(length=20)),
+               existing_nullable=True,
+               postgresql_using="translate(endpoints_called, '[]', '{}')::varchar(20)[]")
+    op.create_index('ix_weather_requests_variables_gin', 'weather_requests', ['variables'],
+                    unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_weather_requests_variables_gin', table_name='weather_requests')
+    op.alter_column('weather_requests', 'endpoints_called',
+               existing_type=postgresql.ARRAY(sa.String(length=20)),
+               type_=sa.Text(),
+               existing_nullable=True,
+               postgresql_using="array_to_json(endpoints_called)::text")
+    op.alter_column('weather_requests', 'variables',
+               existing_type=postgresql.ARRAY(sa.String(length=100)),
+               type_=sa.Text(),
+               existing_nullable=False,
+               postgresql_using="array_to_json(variables)::text")
+    op.alter_column('weather_requests', 'locations',
+               existing_type=postgresql.ARRAY(sa.Float(), dimensions=2),
+               type_=sa.Text(),
+               existing_nullable=False,
+               postgresql_using="array_to_json(locations)::text")
@@ -0,0 +1,29 @@
+"""Add covering index on users email for password login
+
+Revision ID: c8e2f4a61d95
+Revises: 4b7e0d2a9c61
+Create Date: 2026-10-16 19:02:17.480136
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2f4a61d95'
+down_revision: Union[str, Sequence[str], None] = '4b7e0d2a9c61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_email_auth', 'users', ['email'], unique=False,
+                    postgresql_include=['id', 'hashed_password'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_email_auth', table_name='users')
@@ -0,0 +1,37 @@
+"""Number invoices from a sequence
+
+Revision ID: c9e4a1f7b230
+Revises: b5d2f8e4c6a1
+Create Date: 2026-10-16 21:37:19.845102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e4a1f7b230'
+down_revision: Union[str, Sequence[str], None] = 'b5d2f8e4c6a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('invoice_number_seq')))
+    # Existing numbers use the INV-YYYYMMDD-xxxxxxxx format, so new ones can't collide
+    op.alter_column('invoices', 'invoice_number',
+                    existing_type=sa.String(),
+                    existing_nullable=False,
+                    server_default=sa.text("'INV-' || lpad(nextval('invoice_number_seq')::text, 8, '0')"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('invoices', 'invoice_number',
+                    existing_type=sa.String(),
+                    existing_nullable=False,
+                    server_default=None)
+    op.execute(sa.schema.DropSequence(sa.Sequence('invoice_number_seq')))
@@ -0,0 +1,31 @@
+"""Index invoices by user and creation date
+
+Revision ID: d2a7f5c3e918
+Revises: c9e4a1f7b230
+Create Date: 2026-10-16 21:52:07.390616
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7f5c3e918'
+down_revision: Union[str, Sequence[str], None] = 'c9e4a1f7b230'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_invoices_user_created', 'invoices', ['user_id', sa.text('created_at DESC')], unique=False)
+    op.create_index('ix_invoices_user_open', 'invoices', ['user_id'], unique=False,
+                    postgresql_where=sa.text("status = 'open'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_invoices_user_open', table_name='invoices')
+    op.drop_index('ix_invoices_user_created', table_name='invoices')
@@ -0,0 +1,61 @@
+"""Maintain updated_at with a BEFORE UPDATE trigger
+
+Revision ID: d5b2e07c4a19
+Revises: c81f4d6a0e52
+Create Date: 2026-10-16 13:44:21.903557
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5b2e07c4a19'
+down_revision: Union[str, Sequence[str], None] = 'c81f4d6a0e52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# timestamptz columns
+TZ_TABLES = ['users', 'api_keys', 'subscriptions', 'invoices', 'support_tickets']
+# naive timestamp columns holding UTC
+UTC_TABLES = ['pricing_config', 'currency_config', 'variable_mapping']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at := now();
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION set_updated_at_utc() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at := timezone('utc', now());
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    for table in TZ_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_updated_at BEFORE UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION set_updated_at()
+        """)
+    for table in UTC_TABLES:
+        op.execute(f"""
+            CREATE TRIGGER trg_{table}_updated_at BEFORE UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION set_updated_at_utc()
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TZ_TABLES + UTC_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at_utc()")
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
@@ -0,0 +1,37 @@
+"""Store users.hashed_password as bytea
+
+Revision ID: e1b7c3d9f042
+Revises: c8e2f4a61d95
+Create Date: 2026-10-16 19:48:05.317922
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b7c3d9f042'
+down_revision: Union[str, Sequence[str], None] = 'c8e2f4a61d95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # bcrypt hashes are ASCII, so the UTF-8 bytes are exactly what bcrypt.checkpw expects
+    op.alter_column('users', 'hashed_password',
+                    existing_type=sa.String(),
+                    type_=sa.LargeBinary(60),
+                    existing_nullable=False,
+                    postgresql_using="convert_to(hashed_password, 'UTF8')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('users', 'hashed_password',
+                    existing_type=sa.LargeBinary(60),
+                    type_=sa.String(),
+                    existing_nullable=False,
+                    postgresql_using="convert_from(hashed_password, 'UTF8')")
@@ -0,0 +1,34 @@
+"""Default invoices.invoice_date to now()
+
+Revision ID: e6b3d9a2f174
+Revises: d2a7f5c3e918
+Create Date: 2026-10-16 22:06:41.528093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b3d9a2f174'
+down_revision: Union[str, Sequence[str], None] = 'd2a7f5c3e918'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('invoices', 'invoice_date',
+                    existing_type=sa.DateTime(timezone=True),
+                    existing_nullable=False,
+                    server_default=sa.text('now()'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('invoices', 'invoice_date',
+                    existing_type=sa.DateTime(timezone=True),
+                    existing_nullable=False,
+                    server_default=None)
@@ -0,0 +1,49 @@
+"""Use BRIN indexes on log table timestamps
+
+Revision ID: e7a93b5d2c40
+Revises: 5c0e8a1f3d27
+Create Date: 2026-10-16 10:41:52.107634
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a93b5d2c40'
+down_revision: Union[str, Sequence[str], None] = '5c0e8a1f3d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BRIN_INDEXES = [
+    ('ix_audit_logs_timestamp_brin', 'audit_logs', 'timestamp'),
+    ('ix_user_activities_timestamp_brin', 'user_activities', 'timestamp'),
+    ('ix_performance_metrics_timestamp_brin', 'performance_metrics', 'timestamp'),
+    ('ix_usage_logs_created_at_brin', 'usage_logs', 'created_at'),
+    ('ix_weather_requests_created_at_brin', 'weather_requests', 'created_at'),
+]
+
+REPLACED_BTREE_INDEXES = [
+    ('ix_audit_logs_timestamp', 'audit_logs', 'timestamp'),
+    ('ix_user_activities_timestamp', 'user_activities', 'timestamp'),
+    ('ix_performance_metrics_timestamp', 'performance_metrics', 'timestamp'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for index_name, table_name, column_name in REPLACED_BTREE_INDEXES:
+        op.drop_index(index_name, table_name=table_name)
+    for index_name, table_name, column_name in BRIN_INDEXES:
+        op.create_index(index_name, table_name, [column_name], unique=False,
+                        postgresql_using='brin', postgresql_with={'pages_per_range': 32})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for index_name, table_name, column_name in BRIN_INDEXES:
+        op.drop_index(index_name, table_name=table_name)
+    for index_name, table_name, column_name in REPLACED_BTREE_INDEXES:
+        op.create_index(index_name, table_name, [column_name], unique=False)
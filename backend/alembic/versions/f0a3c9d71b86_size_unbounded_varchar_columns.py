@@ -0,0 +1,52 @@
+"""Size previously unbounded varchar columns
+
+Revision ID: f0a3c9d71b86
+Revises: d5b2e07c4a19
+Create Date: 2026-10-16 14:25:37.118264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f0a3c9d71b86'
+down_revision: Union[str, Sequence[str], None] = 'd5b2e07c4a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, length, truncate existing values)
+SIZED_COLUMNS = [
+    ('usage_logs', 'endpoint', 500, False),
+    ('usage_logs', 'method', 10, False),
+    ('usage_logs', 'ip_address', 45, False),
+    ('usage_logs', 'user_agent', 512, True),
+    ('usage_logs', 'location', 255, True),
+    ('users', 'email', 255, False),
+    ('users', 'first_name', 100, False),
+    ('users', 'last_name', 100, False),
+    ('users', 'company', 255, False),
+    ('users', 'email_verification_token', 64, False),
+    ('users', 'password_reset_token', 64, False),
+    ('support_tickets', 'title', 255, False),
+    ('support_tickets', 'assigned_to', 36, False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column, length, truncate in SIZED_COLUMNS:
+        op.alter_column(table, column,
+                   existing_type=sa.String(),
+                   type_=sa.String(length=length),
+                   postgresql_using=f"left({column}, {length})" if truncate else None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column, length, truncate in SIZED_COLUMNS:
+        op.alter_column(table, column,
+                   existing_type=sa.String(length=length),
+                   type_=sa.String())
@@ -0,0 +1,33 @@
+"""Add processed_webhook_events for Stripe webhook deduplication
+
+Revision ID: f3a6d8b2c417
+Revises: e1b7c3d9f042
+Create Date: 2026-10-16 20:26:51.604318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a6d8b2c417'
+down_revision: Union[str, Sequence[str], None] = 'e1b7c3d9f042'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('processed_webhook_events',
+    sa.Column('event_id', sa.String(length=255), nullable=False),
+    sa.Column('event_type', sa.String(length=255), nullable=False),
+    sa.Column('processed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('event_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('processed_webhook_events')
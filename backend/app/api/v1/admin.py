@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 import json
 import io
 
-from app.core.database import get_db
+from app.core.database import SessionLocal, get_db
 from app.core.dependencies import get_current_admin_user
 from app.models.user import User, UserRole
 from app.models.subscription import Subscription
@@ -283,29 +283,22 @@ async def get_subscription_by_id(
 async def get_all_api_keys(
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user),
-    skip: int = Query(0, ge=0),
+    after_created_at: Optional[datetime] = Query(None, description="created_at of the last key on the previous page"),
+    after_id: Optional[str] = Query(None, description="id of the last key on the previous page"),
     limit: int = Query(100, ge=1, le=1000),
     is_active: Optional[bool] = Query(None),
     user_id: Optional[str] = Query(None)
 ):
-    """Get all API keys with filtering and pagination"""
-    
-    query = db.query(ApiKey)
-    
-    # Apply filters
-    if is_active is not None:
-        query = query.filter(ApiKey.is_active == is_active)
-    
-    if user_id:
-        query = query.filter(ApiKey.user_id == user_id)
-    
-    # Order by creation date (newest first)
-    query = query.order_by(ApiKey.created_at.desc())
-    
-    # Apply pagination
-    api_keys = query.offset(skip).limit(limit).all()
+    """Get all API keys with filtering and keyset pagination (newest first)"""
     
-    return api_keys
+    return list(ApiKeyService.get_all_api_keys(
+        db,
+        last_created_at=after_created_at,
+        last_id=after_id,
+        limit=limit,
+        is_active=is_active,
+        user_id=user_id
+    ))
 
 @router.post("/api-keys/{api_key_id}/activate")
 async def activate_api_key(
@@ -420,7 +413,7 @@ async def update_support_ticket(
         )
     
     # Update ticket fields
-    update_data = ticket_update.dict(exclude_unset=True)
+    update_data = ticket_update.model_dump(exclude_unset=True)
     
     # If resolving ticket, set resolved_at timestamp
     if update_data.get("status") == TicketStatus.RESOLVED and ticket.status != TicketStatus.RESOLVED:
@@ -429,8 +422,6 @@ async def update_support_ticket(
     for field, value in update_data.items():
         setattr(ticket, field, value)
     
-    ticket.updated_at = datetime.utcnow()
-    
     db.commit()
     db.refresh(ticket)
     
@@ -461,7 +452,6 @@ async def assign_support_ticket(
     
     ticket.assigned_to = assigned_to
     ticket.status = TicketStatus.IN_PROGRESS
-    ticket.updated_at = datetime.utcnow()
     
     db.commit()
     
@@ -844,8 +834,6 @@ async def export_pricing_data(
 ):
     """Export pricing data in specified format"""
     try:
-        export_data = PricingService.export_pricing_data(db, export_request)
-        
         # Determine content type and filename
         if export_request.format == "json":
             content_type = "application/json"
@@ -857,8 +845,17 @@ async def export_pricing_data(
             content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             filename = f"pricing_configs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         
+        if export_request.format == "xlsx":
+            content = io.BytesIO(PricingService.export_pricing_data(db, export_request))
+        else:
+            # Streamed after this handler returns, so the export reads through its own session
+            def stream_export():
+                with SessionLocal() as export_db:
+                    yield from PricingService.iter_pricing_export(export_db, export_request)
+            content = stream_export()
+        
         return StreamingResponse(
-            io.BytesIO(export_data),
+            content,
             media_type=content_type,
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
@@ -891,7 +888,7 @@ async def import_pricing_data(
 @router.post("/pricing/import/file", response_model=PricingImportResult)
 async def import_pricing_file(
     file: UploadFile = File(...),
-    import_mode: str = Query("update", regex="^(create|update|replace)$"),
+    import_mode: str = Query("update", pattern="^(create|update|replace)$"),
     validate_only: bool = Query(False),
     db: Session = Depends(get_db),
     current_admin: User = Depends(get_current_admin_user)
@@ -29,7 +29,24 @@ async def get_audit_logs(
 ):
     """Get comprehensive audit logs (Admin only)"""
     try:
-        query = db.query(AuditLog)
+        # Column-only rows: skips the request/response bodies and ORM instance state
+        query = db.query(
+            AuditLog.id,
+            AuditLog.request_id,
+            AuditLog.timestamp,
+            AuditLog.method,
+            AuditLog.endpoint,
+            AuditLog.user_id,
+            AuditLog.user_email,
+            AuditLog.response_status_code,
+            AuditLog.processing_time_ms,
+            AuditLog.client_ip,
+            AuditLog.auth_method,
+            AuditLog.activity_type,
+            AuditLog.log_level,
+            AuditLog.extra_metadata,
+            AuditLog.tags
+        )
         
         # Apply filters
         if user_id:
@@ -140,7 +157,17 @@ async def get_performance_metrics(
 ):
     """Get system performance metrics (Admin only)"""
     try:
-        query = db.query(PerformanceMetric)
+        query = db.query(
+            PerformanceMetric.id,
+            PerformanceMetric.metric_type,
+            PerformanceMetric.metric_name,
+            PerformanceMetric.value,
+            PerformanceMetric.unit,
+            PerformanceMetric.endpoint,
+            PerformanceMetric.timestamp,
+            PerformanceMetric.extra_metadata,
+            PerformanceMetric.tags
+        )
         
         if metric_type:
             query = query.filter(PerformanceMetric.metric_type == metric_type)
@@ -179,6 +206,26 @@ async def get_performance_metrics(
         )
 
 
+@router.get("/performance-metrics/hourly", tags=["Audit Analytics"])
+async def get_hourly_performance_metrics(
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+    hours: int = Query(24, le=24 * 90, description="Hours of history to include"),
+    endpoint: Optional[str] = Query(None, description="Filter by endpoint"),
+    metric_name: Optional[str] = Query(None, description="Filter by metric name")
+):
+    """Get hourly rolled-up performance metrics (Admin only)"""
+    try:
+        buckets = AuditService.get_hourly_performance_rollup(db, hours, endpoint, metric_name)
+        return {"buckets": buckets, "count": len(buckets)}
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving hourly performance metrics: {str(e)}"
+        )
+
+
 @router.get("/analytics-dashboard", tags=["Audit Analytics"])
 async def get_analytics_dashboard(
     current_user: User = Depends(get_current_admin_user),
@@ -280,12 +327,27 @@ async def get_real_time_activity(
         cutoff_time = datetime.utcnow() - timedelta(minutes=minutes)
         
         # Recent audit logs
-        recent_logs = db.query(AuditLog).filter(
+        recent_logs = db.query(
+            AuditLog.id,
+            AuditLog.timestamp,
+            AuditLog.method,
+            AuditLog.endpoint,
+            AuditLog.user_email,
+            AuditLog.response_status_code,
+            AuditLog.client_ip
+        ).filter(
             AuditLog.timestamp >= cutoff_time
         ).order_by(AuditLog.timestamp.desc()).limit(20).all()
         
         # Recent security events
-        recent_security = db.query(SecurityEvent).filter(
+        recent_security = db.query(
+            SecurityEvent.id,
+            SecurityEvent.timestamp,
+            SecurityEvent.event_type,
+            SecurityEvent.severity,
+            SecurityEvent.description,
+            SecurityEvent.client_ip
+        ).filter(
             SecurityEvent.timestamp >= cutoff_time
         ).order_by(SecurityEvent.timestamp.desc()).limit(10).all()
         
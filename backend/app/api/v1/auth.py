@@ -42,7 +42,7 @@ async def register(
     
     try:
         # Register user
-        user = AuthService.register_user(db, user_data)
+        user = await AuthService.register_user(db, user_data)
         
         # Create default API key
         api_key = ApiKeyService.create_api_key(
@@ -89,14 +89,14 @@ async def register(
         
         # Send welcome email
         user_name = f"{user.first_name} {user.last_name}".strip() or user.email
-        EmailService.send_welcome_email(user.email, user_name)
+        await EmailService.send_welcome_email(user.email, user_name)
         
         return {
             "message": "User registered successfully",
             "access_token": access_token,
             "token_type": "bearer",
-            "user": UserResponse.from_orm(user),
-            "api_key": ApiKeyResponse.from_orm(api_key)
+            "user": UserResponse.model_validate(user),
+            "api_key": ApiKeyResponse.model_validate(api_key)
         }
         
     except ValueError as e:
@@ -130,7 +130,7 @@ async def login(
     user_agent = request.headers.get("user-agent", "")
     request_id = getattr(request.state, 'request_id', None)
     
-    user = AuthService.authenticate_user(db, user_data.email, user_data.password)
+    user = await AuthService.authenticate_user(db, user_data.email, user_data.password)
     
     if not user:
         # Log failed login
@@ -173,10 +173,6 @@ async def login(
         }
     )
     
-    # Update last login time
-    user.last_login = db.func.now()
-    db.commit()
-    
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/token", response_model=Token)
@@ -190,7 +186,7 @@ async def login_for_access_token(
     user_agent = request.headers.get("user-agent", "") if request else ""
     request_id = getattr(request.state, 'request_id', None) if request else None
     
-    user = AuthService.authenticate_user(db, form_data.username, form_data.password)
+    user = await AuthService.authenticate_user(db, form_data.username, form_data.password)
     
     if not user:
         # Log failed OAuth login
@@ -298,7 +294,7 @@ async def forgot_password(
     )
     
     # Send reset email
-    EmailService.send_password_reset_email(user.email, reset_token)
+    await EmailService.send_password_reset_email(user.email, reset_token)
     
     return {"message": "If the email exists, a reset link has been sent"}
 
@@ -343,7 +339,7 @@ async def reset_password(
         )
     
     # Update password
-    user.hashed_password = AuthService.hash_password(request_data.new_password)
+    user.hashed_password = await AuthService.hash_password_async(request_data.new_password)
     db.commit()
     
     # Log successful password reset
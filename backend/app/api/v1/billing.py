@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -6,6 +7,8 @@ from app.core.database import get_db
 from app.core.dependencies import get_current_active_user
 from app.services.billing import BillingService
 from app.schemas.invoice import InvoiceResponse
+from app.schemas.billing import BillingSummaryResponse
+from app.worker import process_stripe_event
 
 router = APIRouter()
 
@@ -33,14 +36,15 @@ async def get_invoice(
         )
     return invoice
 
-@router.get("/summary", response_model=dict)
+@router.get("/summary", response_model=BillingSummaryResponse)
 async def get_billing_summary(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_active_user)
 ):
     """Get billing summary for current user"""
-    summary = BillingService.get_billing_summary(db, current_user.id)
-    return summary
+    # Already rendered (or cached) JSON; skips re-validating as response_model
+    summary = BillingService.get_billing_summary_json(db, current_user.id)
+    return Response(content=summary, media_type="application/json")
 
 @router.post("/webhook")
 async def stripe_webhook(
@@ -65,25 +69,14 @@ async def stripe_webhook(
                 detail="Invalid webhook payload"
             )
         
-        # Process different event types
-        event_type = event["event_type"]
-        event_data = event["data"]
-        
-        if event_type == "customer.subscription.created":
-            # Handle subscription creation
-            pass
-        elif event_type == "customer.subscription.updated":
-            # Handle subscription updates
-            pass
-        elif event_type == "customer.subscription.deleted":
-            # Handle subscription cancellation
-            pass
-        elif event_type == "invoice.payment_succeeded":
-            # Handle successful payment
-            pass
-        elif event_type == "invoice.payment_failed":
-            # Handle failed payment
-            pass
+        # Acknowledge right away; side effects run on the Celery worker so
+        # slow processing never makes Stripe time out and redeliver
+        await asyncio.to_thread(
+            process_stripe_event.delay,
+            event["event_id"],
+            event["event_type"],
+            event["data"]
+        )
         
         return {"status": "success"}
         
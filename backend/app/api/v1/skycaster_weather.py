@@ -1,17 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
 from typing import Optional, List
 import time
-import json
 from datetime import datetime
 
 from app.core.database import get_db
 from app.core.dependencies import get_api_key_user, get_current_active_user
 from app.core.config import settings
+from app.core.responses import MsgspecJSONResponse, ORJSONResponse
 from app.services.skycaster_weather import SkycasterWeatherService
+from app.services.pricing_cache import PricingCache
 from app.schemas.skycaster_weather import (
     WeatherForecastRequest,
     WeatherForecastResponse,
+    WeatherForecastResponseV2,
     SupportedVariablesResponse,
     PricingResponse,
     WeatherUsageStatsResponse,
@@ -20,7 +22,7 @@ from app.schemas.skycaster_weather import (
     PricingInfo,
     WeatherRequestLog
 )
-from app.models.pricing_config import PricingConfig, WeatherRequest
+from app.models.pricing_config import WeatherRequest
 
 router = APIRouter()
 
@@ -29,7 +31,30 @@ router = APIRouter()
 use_mock = settings.__dict__.get("USE_MOCK_WEATHER", False)
 skycaster_service = SkycasterWeatherService(use_mock=use_mock)
 
-@router.post("/forecast", response_model=WeatherForecastResponse)
+def _build_calculation_example() -> dict:
+    example_variables = ["ambient_temp(K)", "ghi(W/m2)"]
+    example_locations = 2
+    cost_per_variable_per_location = 1.0
+    total_cost = len(example_variables) * example_locations * cost_per_variable_per_location
+    tax_rate = 18.0
+    tax_amount = total_cost * tax_rate / 100
+    final_amount = total_cost + tax_amount
+    
+    return {
+        "variables": example_variables,
+        "locations": example_locations,
+        "cost_per_variable_per_location": cost_per_variable_per_location,
+        "total_cost": total_cost,
+        "tax_rate": tax_rate,
+        "tax_amount": tax_amount,
+        "final_amount": final_amount,
+        "currency": "INR"
+    }
+
+# Static illustration included in every /pricing response
+PRICING_CALCULATION_EXAMPLE = _build_calculation_example()
+
+@router.post("/forecast", response_class=MsgspecJSONResponse)
 async def get_weather_forecast(
     request_data: WeatherForecastRequest,
     request: Request,
@@ -74,7 +99,57 @@ async def get_weather_forecast(
             user_agent=user_agent
         )
         
-        return WeatherForecastResponse(**response)
+        return MsgspecJSONResponse(WeatherForecastResponse(**response))
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Weather forecast request failed: {str(e)}"
+        )
+
+@router.post("/forecast/columnar", response_class=ORJSONResponse)
+async def get_weather_forecast_columnar(
+    request_data: WeatherForecastRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    auth_data: tuple = Depends(get_api_key_user)
+):
+    """
+    Get weather forecast in columnar form
+    
+    Same routing, pricing and logging as `/forecast`, but the data is returned
+    as `coords`, `variables` and a `values` matrix (one row per coordinate,
+    one column per variable, `null` where no value was returned) instead of a
+    dict per location. Better suited to large batches.
+    """
+    user, api_key, subscription = auth_data
+    
+    try:
+        response = await skycaster_service.get_forecast(
+            locations=request_data.list_lat_lon,
+            variables=request_data.variables,
+            timestamp=request_data.timestamp,
+            timezone=request_data.timezone,
+            user=user,
+            api_key=api_key,
+            ip_address=request.client.host,
+            user_agent=request.headers.get("user-agent", "")
+        )
+        
+        coords, values = SkycasterWeatherService.to_columnar(
+            response, request_data.list_lat_lon, request_data.variables
+        )
+        return ORJSONResponse(WeatherForecastResponseV2(
+            coords=coords,
+            variables=request_data.variables,
+            values=values,
+            metadata=response["metadata"]
+        ))
         
     except ValueError as e:
         raise HTTPException(
@@ -98,7 +173,7 @@ async def get_supported_variables(
     Returns detailed information about all available weather variables,
     grouped by their respective endpoints (omega, nova, arc).
     """
-    try:
+    def render() -> bytes:
         # Get variable information from database
         variable_info = skycaster_service.get_variable_info(db)
         
@@ -120,7 +195,10 @@ async def get_supported_variables(
         return SupportedVariablesResponse(
             variables=variables,
             endpoints=endpoints
-        )
+        ).model_dump_json().encode()
+    
+    try:
+        return Response(content=PricingCache.get_rendered("variables", render), media_type="application/json")
         
     except Exception as e:
         raise HTTPException(
@@ -142,11 +220,9 @@ async def get_pricing_information(
     - Plan-specific pricing (if applicable)
     - Currency information
     """
-    try:
+    def render() -> bytes:
         # Get pricing configurations
-        pricing_configs = db.query(PricingConfig).filter(
-            PricingConfig.is_active == True
-        ).all()
+        pricing_configs = PricingCache.get_active_pricing(db).values()
         
         # Convert to response format
         pricing_info = [
@@ -161,30 +237,13 @@ async def get_pricing_information(
             for config in pricing_configs
         ]
         
-        # Create calculation example
-        example_variables = ["ambient_temp(K)", "ghi(W/m2)"]
-        example_locations = 2
-        cost_per_variable_per_location = 1.0
-        total_cost = len(example_variables) * example_locations * cost_per_variable_per_location
-        tax_rate = 18.0
-        tax_amount = total_cost * tax_rate / 100
-        final_amount = total_cost + tax_amount
-        
-        calculation_example = {
-            "variables": example_variables,
-            "locations": example_locations,
-            "cost_per_variable_per_location": cost_per_variable_per_location,
-            "total_cost": total_cost,
-            "tax_rate": tax_rate,
-            "tax_amount": tax_amount,
-            "final_amount": final_amount,
-            "currency": "INR"
-        }
-        
         return PricingResponse(
             pricing=pricing_info,
-            calculation_example=calculation_example
-        )
+            calculation_example=PRICING_CALCULATION_EXAMPLE
+        ).model_dump_json().encode()
+    
+    try:
+        return Response(content=PricingCache.get_rendered("pricing", render), media_type="application/json")
         
     except Exception as e:
         raise HTTPException(
@@ -192,7 +251,7 @@ async def get_pricing_information(
             detail=f"Failed to fetch pricing information: {str(e)}"
         )
 
-@router.get("/usage/stats", response_model=WeatherUsageStatsResponse)
+@router.get("/usage/stats", response_class=MsgspecJSONResponse)
 async def get_weather_usage_stats(
     limit: int = 10,
     db: Session = Depends(get_db),
@@ -218,7 +277,7 @@ async def get_weather_usage_stats(
         ).all()
         
         if not weather_requests:
-            return WeatherUsageStatsResponse(
+            return MsgspecJSONResponse(WeatherUsageStatsResponse(
                 total_requests=0,
                 total_cost=0.0,
                 currency="INR",
@@ -228,7 +287,7 @@ async def get_weather_usage_stats(
                 average_response_time=0.0,
                 success_rate=0.0,
                 recent_requests=[]
-            )
+            ))
         
         # Calculate statistics
         total_requests = len(weather_requests)
@@ -238,23 +297,19 @@ async def get_weather_usage_stats(
         # Variables usage
         variables_used = {}
         for req in weather_requests:
-            variables = json.loads(req.variables)
-            for var in variables:
+            for var in req.variables:
                 variables_used[var] = variables_used.get(var, 0) + 1
         
         # Endpoints usage
         endpoints_used = {}
         for req in weather_requests:
-            if req.endpoints_called:
-                endpoints = json.loads(req.endpoints_called)
-                for endpoint in endpoints:
-                    endpoints_used[endpoint] = endpoints_used.get(endpoint, 0) + 1
+            for endpoint in req.endpoints_called or []:
+                endpoints_used[endpoint] = endpoints_used.get(endpoint, 0) + 1
         
         # Locations queried
         locations_queried = 0
         for req in weather_requests:
-            locations = json.loads(req.locations)
-            locations_queried += len(locations)
+            locations_queried += len(req.locations)
         
         # Average response time
         avg_response_time = sum(req.response_time for req in weather_requests) / total_requests
@@ -272,11 +327,11 @@ async def get_weather_usage_stats(
                 id=req.id,
                 user_id=req.user_id,
                 api_key_id=req.api_key_id,
-                locations=json.loads(req.locations),
-                variables=json.loads(req.variables),
+                locations=req.locations,
+                variables=req.variables,
                 timestamp=req.timestamp,
                 timezone=req.timezone,
-                endpoints_called=json.loads(req.endpoints_called) if req.endpoints_called else [],
+                endpoints_called=req.endpoints_called or [],
                 response_status=req.response_status,
                 response_time=req.response_time,
                 success=req.success,
@@ -291,7 +346,7 @@ async def get_weather_usage_stats(
             )
             recent_logs.append(log)
         
-        return WeatherUsageStatsResponse(
+        return MsgspecJSONResponse(WeatherUsageStatsResponse(
             total_requests=total_requests,
             total_cost=total_cost,
             currency=currency,
@@ -301,7 +356,7 @@ async def get_weather_usage_stats(
             average_response_time=avg_response_time,
             success_rate=success_rate,
             recent_requests=recent_logs
-        )
+        ))
         
     except Exception as e:
         raise HTTPException(
@@ -56,7 +56,7 @@ async def subscribe_to_plan(
         }
     else:
         # Create Stripe checkout session for paid plans
-        checkout_url = BillingService.create_checkout_session(db, current_user.id, subscription_plan)
+        checkout_url = await BillingService.create_checkout_session(db, current_user.id, subscription_plan)
         if not checkout_url:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -82,7 +82,7 @@ async def cancel_subscription(
             detail="No active subscription found"
         )
     
-    cancelled_subscription = BillingService.cancel_subscription(db, subscription.id)
+    cancelled_subscription = await BillingService.cancel_subscription(db, subscription.id)
     if not cancelled_subscription:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -143,7 +143,7 @@ async def upgrade_subscription(
         )
     
     # Create checkout session for upgrade
-    checkout_url = BillingService.create_checkout_session(db, current_user.id, new_plan)
+    checkout_url = await BillingService.create_checkout_session(db, current_user.id, new_plan)
     if not checkout_url:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -188,7 +188,7 @@ async def downgrade_subscription(
         }
     else:
         # Create checkout session for paid downgrade
-        checkout_url = BillingService.create_checkout_session(db, current_user.id, new_plan)
+        checkout_url = await BillingService.create_checkout_session(db, current_user.id, new_plan)
         if not checkout_url:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -13,7 +13,6 @@ from app.schemas.support_ticket import (
     SupportTicketUpdate,
     SupportTicketWithUser
 )
-from datetime import datetime
 
 router = APIRouter()
 
@@ -41,7 +40,7 @@ async def create_support_ticket(
     # Send notification email to support team
     try:
         user_name = f"{current_user.first_name} {current_user.last_name}".strip() or current_user.email
-        EmailService.send_support_ticket_notification(
+        await EmailService.send_support_ticket_notification(
             user_email=current_user.email,
             user_name=user_name,
             ticket_id=ticket.id,
@@ -126,14 +125,12 @@ async def update_support_ticket(
     
     # Users can only update certain fields
     allowed_fields = ['title', 'description', 'priority']
-    update_data = ticket_update.dict(exclude_unset=True, include=set(allowed_fields))
+    update_data = ticket_update.model_dump(exclude_unset=True, include=set(allowed_fields))
     
     # Update ticket fields
     for field, value in update_data.items():
         setattr(ticket, field, value)
     
-    ticket.updated_at = datetime.utcnow()
-    
     db.commit()
     db.refresh(ticket)
     
@@ -166,7 +163,6 @@ async def close_support_ticket(
         )
     
     ticket.status = TicketStatus.CLOSED
-    ticket.updated_at = datetime.utcnow()
     
     db.commit()
     
@@ -199,7 +195,6 @@ async def reopen_support_ticket(
         )
     
     ticket.status = TicketStatus.OPEN
-    ticket.updated_at = datetime.utcnow()
     ticket.resolved_at = None
     
     db.commit()
@@ -100,7 +100,7 @@ async def export_usage_data(
     
     if format == "json":
         return {
-            "data": [log.dict() for log in usage_logs],
+            "data": [UsageLogResponse.model_validate(log).model_dump(mode="json") for log in usage_logs],
             "total_records": len(usage_logs),
             "period_days": days
         }
@@ -1,5 +1,5 @@
 import os
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional, Dict, Any, ClassVar
 
 class Settings(BaseSettings):
@@ -25,6 +25,9 @@ class Settings(BaseSettings):
     # Skycaster Weather API
     USE_MOCK_WEATHER: bool = os.getenv("USE_MOCK_WEATHER", "false").lower() == "true"
     
+    # ClickHouse analytics mirror (disabled when unset)
+    CLICKHOUSE_URL: Optional[str] = os.getenv("CLICKHOUSE_URL")
+    
     # Sentry
     SENTRY_DSN: Optional[str] = os.getenv("SENTRY_DSN")
     
@@ -59,7 +62,6 @@ class Settings(BaseSettings):
         "enterprise": {"name": "Enterprise", "price": 9999, "stripe_price_id": "price_enterprise"}
     }
     
-    class Config:
-        env_file = ".env"
+    model_config = SettingsConfigDict(env_file=".env")
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""
+Coordinate range check for forecast requests
+
+Kept out of app/schemas so scripts/compile_extensions.py never Cythonizes it:
+numba needs the kernel's Python bytecode, which a cyfunction doesn't have.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def _first_bad_coordinate_numpy(coords: np.ndarray) -> int:
+    # Negated inclusive bounds so NaN is rejected as well
+    lats, lons = coords[:, 0], coords[:, 1]
+    bad = ~((lats >= -90) & (lats <= 90) & (lons >= -180) & (lons <= 180))
+    return int(np.argmax(bad)) if bad.any() else -1
+
+if njit is not None:
+    # Eagerly compiled for C-contiguous float64 (n, 2) arrays so the first
+    # request doesn't pay the JIT; one fused pass with no temporary masks
+    @njit("int64(float64[:, ::1])", cache=True)
+    def first_bad_coordinate(coords):
+        for i in range(coords.shape[0]):
+            lat = coords[i, 0]
+            lon = coords[i, 1]
+            if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+                return i
+        return -1
+else:
+    first_bad_coordinate = _first_bad_coordinate_numpy
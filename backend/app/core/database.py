@@ -1,9 +1,14 @@
-from sqlalchemy import create_engine
+import orjson
+from sqlalchemy import create_engine, Enum
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
 
+def _json_serializer(value) -> str:
+    """Serialize JSON/JSONB bind values with orjson instead of json.dumps"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
 # Create PostgreSQL engine
 engine = create_engine(
     settings.DATABASE_URL.replace("+asyncpg", "").replace("?ssl=require", "?sslmode=require"),
@@ -12,6 +17,13 @@ engine = create_engine(
     pool_size=20,
     max_overflow=30,
     pool_recycle=3600,
+    # psycopg2: INSERT executemany as multi-row VALUES, UPDATE/DELETE via execute_batch
+    executemany_mode="values_plus_batch",
+    # Compiled SQL is reused per statement shape; sized above the default 500
+    # so select()-style service queries stay cached across all endpoints
+    query_cache_size=1200,
+    # Audit and usage rows carry JSON columns on every insert
+    json_serializer=_json_serializer,
 )
 
 # Create session
@@ -20,6 +32,20 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create base class
 Base = declarative_base()
 
+def StringEnum(enum_class, length: int = 20) -> Enum:
+    """Enum column type stored as VARCHAR with a CHECK constraint on the member values.
+
+    Unlike a native PostgreSQL ENUM, adding a value only needs the CHECK
+    constraint to be replaced, not an ALTER TYPE.
+    """
+    return Enum(
+        enum_class,
+        values_callable=lambda x: [e.value for e in x],
+        native_enum=False,
+        create_constraint=True,
+        length=length,
+    )
+
 # Dependency to get database session
 def get_db():
     db = SessionLocal()
@@ -25,12 +25,17 @@ def setup_logging():
     # Remove default handler
     logger.remove()
     
+    # Sinks are enqueued: request threads only push the record onto a queue
+    # and a single writer thread per sink does the formatting I/O, so
+    # concurrent log calls don't serialize on stdout or the log file.
+    
     # Add console handler
     logger.add(
         sys.stdout,
         colorize=True,
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        level="INFO"
+        level="INFO",
+        enqueue=True
     )
     
     # Add file handler
@@ -39,7 +44,8 @@ def setup_logging():
         rotation="10 MB",
         retention="1 week",
         compression="gz",
-        level="INFO"
+        level="INFO",
+        enqueue=True
     )
     
     # Setup Sentry if configured
@@ -0,0 +1,38 @@
+from typing import Any
+
+import msgspec
+import orjson
+from fastapi.responses import Response
+
+_msgspec_encoder = msgspec.json.Encoder()
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, msgspec.Struct):
+        return msgspec.structs.asdict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+class MsgspecJSONResponse(Response):
+    """JSON response encoded by msgspec in a single C pass.
+
+    Used for msgspec.Struct payloads; routes returning it bypass FastAPI's
+    response_model validation and serialization.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return _msgspec_encoder.encode(content)
+
+class ORJSONResponse(Response):
+    """JSON response encoded by orjson; the application's default response class.
+
+    Emits NumPy arrays natively and treats naive datetimes as UTC, matching the
+    datetime.utcnow() values used throughout the services.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_orjson_default,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+        )
@@ -7,14 +7,20 @@ from fastapi.openapi.docs import (
     get_swagger_ui_oauth2_redirect_html,
 )
 from fastapi.staticfiles import StaticFiles
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from app.core.config import settings
 from app.core.database import engine
 from app.core.logging import setup_logging
+from app.core.responses import ORJSONResponse
 from app.middleware.audit_middleware import AuditLoggingMiddleware
 from app.api.v1.router import api_router
+from app.services.usage_log import usage_log_buffer
+from app.services.audit_queue import audit_writer
+from app.services.email import smtp_connection
 from app.models import Base
 
 # Setup logging
@@ -24,6 +30,15 @@ logger = logging.getLogger(__name__)
 # Note: Database tables are created via Alembic migrations
 # Base.metadata.create_all(bind=engine)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    usage_log_buffer.start()
+    yield
+    # Flush usage logs and audit rows still buffered before the worker exits
+    await usage_log_buffer.stop()
+    await asyncio.to_thread(audit_writer.stop)
+    await asyncio.to_thread(smtp_connection.close)
+
 # Create FastAPI app
 app = FastAPI(
     title="SKYCASTER Weather API",
@@ -32,6 +47,8 @@ app = FastAPI(
     docs_url=None,
     redoc_url=None,
     openapi_url="/api/v1/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Add comprehensive audit logging middleware
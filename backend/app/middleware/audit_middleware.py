@@ -17,6 +17,7 @@ from app.core.database import get_db
 from app.models.audit_log import AuditLog, SecurityEvent, UserActivity, PerformanceMetric
 from app.core.dependencies import get_current_user_optional, get_api_key_optional
 from app.core.config import settings
+from app.services.audit_service import AuditService
 
 
 logger = logging.getLogger(__name__)
@@ -168,6 +169,10 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
             # Extract user context
             user_context = await self._get_user_context(request, db)
             
+            # The rest of this transaction only writes audit rows, which may be
+            # lost in a crash window rather than wait for the WAL flush
+            db.execute(text("SET LOCAL synchronous_commit = OFF"))
+            
             # Determine activity type
             activity_type = self._determine_activity_type(request.url.path, request.method)
             
@@ -185,14 +190,14 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
                 session_id=user_context.get("session_id"),
                 
                 # Request details
-                request_headers=request_data["headers"],
+                request_headers_id=AuditService.get_header_set_id(db, request_data["headers"]),
                 request_body=self._sanitize_request_body(request_data.get("body")),
                 request_params=request_data.get("params"),
                 request_size=request_data.get("request_size", 0),
                 
                 # Response details
                 response_status_code=response_data["status_code"],
-                response_headers=response_data.get("headers"),
+                response_headers_id=AuditService.get_header_set_id(db, response_data.get("headers")),
                 response_body=self._sanitize_response_body(response_data.get("body")),
                 response_size=response_data.get("size", 0),
                 
@@ -245,6 +250,7 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
             
         except Exception as e:
             logger.error(f"Error logging audit entry: {e}")
+            AuditService.clear_header_set_cache()
             if db:
                 db.rollback()
                 db.close()
@@ -254,6 +260,7 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
         """Log error entries"""
         try:
             db = next(get_db())
+            db.execute(text("SET LOCAL synchronous_commit = OFF"))
             
             # Create error audit log
             audit_log = AuditLog(
@@ -261,7 +268,7 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
                 method=request_data["method"],
                 endpoint=request_data["path"],
                 full_url=request_data["url"],
-                request_headers=request_data["headers"],
+                request_headers_id=AuditService.get_header_set_id(db, request_data["headers"]),
                 request_body=self._sanitize_request_body(request_data.get("body")),
                 request_params=request_data.get("params"),
                 response_status_code=500,
@@ -282,6 +289,7 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
             
         except Exception as e:
             logger.error(f"Error logging error entry: {e}")
+            AuditService.clear_header_set_cache()
     
     async def _get_user_context(self, request: Request, db: Session) -> Dict[str, Any]:
         """Extract user context from request"""
@@ -327,23 +335,21 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
                                activity_type: str):
         """Log user-specific activity"""
         try:
-            activity = UserActivity(
-                user_id=user_id,
-                request_id=request_id,
-                activity_type=activity_type,
-                activity_name=f"{request_data['method']} {request_data['path']}",
-                activity_description=f"API call to {request_data['path']}",
-                endpoint=request_data["path"],
-                duration_ms=processing_time,
-                success=response_data["status_code"] < 400,
-                activity_data={
+            db.bulk_insert_mappings(UserActivity, [{
+                "user_id": user_id,
+                "request_id": request_id,
+                "activity_type": activity_type,
+                "activity_name": f"{request_data['method']} {request_data['path']}",
+                "activity_description": f"API call to {request_data['path']}",
+                "endpoint": request_data["path"],
+                "duration_ms": processing_time,
+                "success": response_data["status_code"] < 400,
+                "activity_data": {
                     "method": request_data["method"],
                     "status_code": response_data["status_code"],
                     "processing_time_ms": processing_time
                 }
-            )
-            
-            db.add(activity)
+            }])
             
         except Exception as e:
             logger.error(f"Error logging user activity: {e}")
@@ -353,25 +359,23 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
         """Log performance metrics"""
         try:
             # API response time metric
-            metric = PerformanceMetric(
-                metric_type="api_response_time",
-                metric_name=f"{request_data['method']} {request_data['path']}",
-                value=processing_time,
-                unit="ms",
-                endpoint=request_data["path"],
-                request_id=request_id,
-                extra_metadata={
+            db.bulk_insert_mappings(PerformanceMetric, [{
+                "metric_type": "api_response_time",
+                "metric_name": f"{request_data['method']} {request_data['path']}",
+                "value": processing_time,
+                "unit": "ms",
+                "endpoint": request_data["path"],
+                "request_id": request_id,
+                "extra_metadata": {
                     "method": request_data["method"],
                     "status_code": response_data["status_code"]
                 },
-                tags=[
+                "tags": [
                     request_data["method"].lower(),
                     f"status_{response_data['status_code']}",
                     "api_response_time"
                 ]
-            )
-            
-            db.add(metric)
+            }])
             
         except Exception as e:
             logger.error(f"Error logging performance metrics: {e}")
@@ -381,41 +385,42 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
                                            response_data: Dict, user_context: Dict):
         """Check for and log security events"""
         try:
+            events = []
+            
             # Failed authentication
             if response_data["status_code"] in [401, 403]:
-                security_event = SecurityEvent(
-                    event_type="authentication_failure",
-                    severity="MEDIUM",
-                    user_id=user_context.get("user_id"),
-                    user_email=user_context.get("user_email"),
-                    request_id=user_context.get("request_id"),
-                    client_ip=request_data["client_ip"],
-                    user_agent=request_data["user_agent"],
-                    endpoint=request_data["path"],
-                    description=f"Authentication failed for {request_data['path']}",
-                    details={
+                events.append({
+                    "event_type": "authentication_failure",
+                    "severity": "MEDIUM",
+                    "user_id": user_context.get("user_id"),
+                    "user_email": user_context.get("user_email"),
+                    "request_id": user_context.get("request_id"),
+                    "client_ip": request_data["client_ip"],
+                    "user_agent": request_data["user_agent"],
+                    "endpoint": request_data["path"],
+                    "description": f"Authentication failed for {request_data['path']}",
+                    "details": {
                         "status_code": response_data["status_code"],
                         "method": request_data["method"],
                         "auth_method": user_context.get("auth_method")
                     }
-                )
-                
-                db.add(security_event)
+                })
             
             # Rate limiting
             if response_data["status_code"] == 429:
-                security_event = SecurityEvent(
-                    event_type="rate_limit_exceeded",
-                    severity="LOW",
-                    user_id=user_context.get("user_id"),
-                    client_ip=request_data["client_ip"],
-                    endpoint=request_data["path"],
-                    description="Rate limit exceeded",
-                    action_taken="request_blocked",
-                    automatic_response=True
-                )
-                
-                db.add(security_event)
+                events.append({
+                    "event_type": "rate_limit_exceeded",
+                    "severity": "LOW",
+                    "user_id": user_context.get("user_id"),
+                    "client_ip": request_data["client_ip"],
+                    "endpoint": request_data["path"],
+                    "description": "Rate limit exceeded",
+                    "action_taken": "request_blocked",
+                    "automatic_response": True
+                })
+            
+            if events:
+                db.bulk_insert_mappings(SecurityEvent, events)
                 
         except Exception as e:
             logger.error(f"Error logging security events: {e}")
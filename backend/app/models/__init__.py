@@ -6,7 +6,8 @@ from app.models.usage_log import UsageLog
 from app.models.invoice import Invoice
 from app.models.support_ticket import SupportTicket
 from app.models.pricing_config import PricingConfig, CurrencyConfig, VariableMapping, WeatherRequest
-from app.models.audit_log import AuditLog, SecurityEvent, UserActivity, PerformanceMetric
+from app.models.audit_log import AuditLog, HeaderSet, SecurityEvent, UserActivity, PerformanceMetric
+from app.models.webhook_event import ProcessedWebhookEvent
 
 __all__ = [
     "Base",
@@ -21,7 +22,9 @@ __all__ = [
     "VariableMapping",
     "WeatherRequest",
     "AuditLog",
+    "HeaderSet",
     "SecurityEvent", 
     "UserActivity",
-    "PerformanceMetric"
+    "PerformanceMetric",
+    "ProcessedWebhookEvent"
 ]
\ No newline at end of file
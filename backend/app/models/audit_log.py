@@ -1,18 +1,39 @@
 """
 Advanced Audit Logging Models for comprehensive activity tracking
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, JSON, Float
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, JSON, Float, ForeignKey, LargeBinary, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func, text
 import uuid
 from app.models import Base
 
 
+class HeaderSet(Base):
+    """
+    Deduplicated HTTP header sets referenced by audit logs
+    """
+    __tablename__ = "header_sets"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    sha256 = Column(LargeBinary(32), nullable=False, unique=True)  # Digest of the canonical JSON
+    headers = Column(JSONB, nullable=False)
+    first_seen = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<HeaderSet(id={self.id}, first_seen={self.first_seen})>"
+
+
 class AuditLog(Base):
     """
     Comprehensive audit log for all system activities
     """
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Rows arrive in timestamp order, so min/max per page range is enough
+        Index("ix_audit_logs_timestamp_brin", "timestamp", postgresql_using="brin",
+              postgresql_with={"pages_per_range": 32}),
+        Index("ix_audit_logs_auth_failed", "timestamp", postgresql_where=text("auth_success = false")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
@@ -29,14 +50,14 @@ class AuditLog(Base):
     session_id = Column(String(255), nullable=True, index=True)
     
     # Request Details
-    request_headers = Column(JSON, nullable=True)
+    request_headers_id = Column(UUID(as_uuid=True), ForeignKey("header_sets.id"), nullable=True)
     request_body = Column(Text, nullable=True)
     request_params = Column(JSON, nullable=True)
     request_size = Column(Integer, default=0)
     
     # Response Details
     response_status_code = Column(Integer, nullable=True)
-    response_headers = Column(JSON, nullable=True)
+    response_headers_id = Column(UUID(as_uuid=True), ForeignKey("header_sets.id"), nullable=True)
     response_body = Column(Text, nullable=True)
     response_size = Column(Integer, default=0)
     
@@ -62,7 +83,7 @@ class AuditLog(Base):
     rate_limit_remaining = Column(Integer, nullable=True)
     
     # Timestamps
-    timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now())
     
     # Classification
     log_level = Column(String(20), default="INFO", index=True)  # DEBUG, INFO, WARNING, ERROR, CRITICAL
@@ -81,12 +102,16 @@ class SecurityEvent(Base):
     Security-specific events and incidents
     """
     __tablename__ = "security_events"
+    __table_args__ = (
+        Index("ix_security_events_high_severity", "timestamp",
+              postgresql_where=text("severity IN ('HIGH', 'CRITICAL')")),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Event Classification
     event_type = Column(String(100), nullable=False, index=True)  # login_failure, rate_limit_exceeded, etc.
-    severity = Column(String(20), default="LOW", index=True)  # LOW, MEDIUM, HIGH, CRITICAL
+    severity = Column(String(20), default="LOW")  # LOW, MEDIUM, HIGH, CRITICAL
     
     # User Context
     user_id = Column(UUID(as_uuid=True), nullable=True, index=True)
@@ -119,6 +144,11 @@ class UserActivity(Base):
     User activity tracking for analytics and behavior analysis
     """
     __tablename__ = "user_activities"
+    __table_args__ = (
+        # Rows arrive in timestamp order, so min/max per page range is enough
+        Index("ix_user_activities_timestamp_brin", "timestamp", postgresql_using="brin",
+              postgresql_with={"pages_per_range": 32}),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
@@ -142,7 +172,7 @@ class UserActivity(Base):
     duration_ms = Column(Float, nullable=True)
     
     # Timestamps
-    timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now())
     
     # Success/Failure
     success = Column(Boolean, default=True)
@@ -157,6 +187,11 @@ class PerformanceMetric(Base):
     System performance tracking
     """
     __tablename__ = "performance_metrics"
+    __table_args__ = (
+        # Rows arrive in timestamp order, so min/max per page range is enough
+        Index("ix_performance_metrics_timestamp_brin", "timestamp", postgresql_using="brin",
+              postgresql_with={"pages_per_range": 32}),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
@@ -178,7 +213,7 @@ class PerformanceMetric(Base):
     tags = Column(JSON, nullable=True)
     
     # Timestamps
-    timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now())
     
     def __repr__(self):
         return f"<PerformanceMetric(id={self.id}, metric_type={self.metric_type}, value={self.value}, unit={self.unit}, timestamp={self.timestamp})>"
\ No newline at end of file
@@ -1,10 +1,10 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Float, Enum, Boolean, JSON
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Float, Boolean, JSON, FetchedValue, Index, Sequence, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 import uuid
 
-from app.core.database import Base
+from app.core.database import Base, StringEnum
 
 class InvoiceStatus(enum.Enum):
     DRAFT = "draft"
@@ -13,16 +13,28 @@ class InvoiceStatus(enum.Enum):
     VOID = "void"
     UNCOLLECTIBLE = "uncollectible"
 
+# Numbers invoices; drawn by the invoice_number server default
+invoice_number_seq = Sequence("invoice_number_seq", metadata=Base.metadata)
+
 class Invoice(Base):
     __tablename__ = "invoices"
+    __table_args__ = (
+        # Recent invoices per user (billing summary) without a sort
+        Index("ix_invoices_user_created", "user_id", text("created_at DESC")),
+        # Outstanding balance only looks at open invoices
+        Index("ix_invoices_user_open", "user_id", postgresql_where=text("status = 'open'")),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
     subscription_id = Column(String, ForeignKey("subscriptions.id"))
     
     # Invoice details
-    invoice_number = Column(String, unique=True, nullable=False)
-    status = Column(Enum(InvoiceStatus, values_callable=lambda x: [e.value for e in x]), nullable=False, default=InvoiceStatus.DRAFT)
+    invoice_number = Column(
+        String, unique=True, nullable=False,
+        server_default=text("'INV-' || lpad(nextval('invoice_number_seq')::text, 8, '0')")
+    )
+    status = Column(StringEnum(InvoiceStatus), nullable=False, default=InvoiceStatus.DRAFT)
     
     # Stripe details
     stripe_invoice_id = Column(String)
@@ -36,7 +48,7 @@ class Invoice(Base):
     amount_due = Column(Integer, nullable=False)
     
     # Dates
-    invoice_date = Column(DateTime(timezone=True), nullable=False)
+    invoice_date = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     due_date = Column(DateTime(timezone=True), nullable=False)
     paid_at = Column(DateTime(timezone=True))
     
@@ -49,7 +61,7 @@ class Invoice(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # set_updated_at trigger
     
     # Relationships
     user = relationship("User", back_populates="invoices")
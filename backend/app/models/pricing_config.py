@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Float, Boolean, DateTime, Text, Integer, ForeignKey
+from sqlalchemy import Column, String, Float, Boolean, DateTime, Text, Integer, ForeignKey, Index, FetchedValue
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
 import uuid
 from datetime import datetime
 
@@ -31,7 +31,7 @@ class PricingConfig(Base):
     
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_onupdate=FetchedValue())  # set_updated_at_utc trigger
     created_by = Column(String, ForeignKey("users.id"))
     is_active = Column(Boolean, default=True)
     
@@ -58,7 +58,7 @@ class CurrencyConfig(Base):
     # Status
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_onupdate=FetchedValue())  # set_updated_at_utc trigger
 
 class VariableMapping(Base):
     """Model for storing variable to endpoint mapping"""
@@ -79,11 +79,17 @@ class VariableMapping(Base):
     # Status
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, server_onupdate=FetchedValue())  # set_updated_at_utc trigger
 
 class WeatherRequest(Base):
     """Model for storing weather request logs with new Skycaster system"""
     __tablename__ = "weather_requests"
+    __table_args__ = (
+        # Append-only, so created_at tracks physical order
+        Index("ix_weather_requests_created_at_brin", "created_at", postgresql_using="brin",
+              postgresql_with={"pages_per_range": 32}),
+        Index("ix_weather_requests_variables_gin", "variables", postgresql_using="gin"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     
@@ -92,15 +98,15 @@ class WeatherRequest(Base):
     api_key_id = Column(String, ForeignKey("api_keys.id"), nullable=False)
     
     # Request parameters
-    locations = Column(Text, nullable=False)  # JSON array of [lat, lon] pairs
-    variables = Column(Text, nullable=False)  # JSON array of variable names
+    locations = Column(ARRAY(Float, dimensions=2), nullable=False)  # [lat, lon] pairs
+    variables = Column(ARRAY(String(100)), nullable=False)
     timestamp = Column(String(50), nullable=False)
     timezone = Column(String(50), nullable=False, default="Asia/Kolkata")
     
     # Response details
-    endpoints_called = Column(Text, nullable=True)  # JSON array of endpoints called
+    endpoints_called = Column(ARRAY(String(20)), nullable=True)
     response_status = Column(Integer, nullable=False)
-    response_time = Column(Float, nullable=False)
+    response_time = Column(Float(precision=24), nullable=False)  # REAL is ample for timings
     success = Column(Boolean, nullable=False)
     
     # Pricing details
@@ -1,10 +1,10 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Integer, Enum, Float
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Integer, Float, FetchedValue
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 import uuid
 
-from app.core.database import Base
+from app.core.database import Base, StringEnum
 
 class SubscriptionStatus(enum.Enum):
     ACTIVE = "active"
@@ -26,11 +26,11 @@ class Subscription(Base):
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
     
     # Subscription details
-    plan = Column(Enum(SubscriptionPlan, values_callable=lambda x: [e.value for e in x]), nullable=False, default=SubscriptionPlan.FREE)
-    status = Column(Enum(SubscriptionStatus, values_callable=lambda x: [e.value for e in x]), nullable=False, default=SubscriptionStatus.ACTIVE)
+    plan = Column(StringEnum(SubscriptionPlan), nullable=False, default=SubscriptionPlan.FREE)
+    status = Column(StringEnum(SubscriptionStatus), nullable=False, default=SubscriptionStatus.ACTIVE)
     
     # Stripe details
-    stripe_subscription_id = Column(String)
+    stripe_subscription_id = Column(String, unique=True, index=True)  # Webhook events look subscriptions up by this
     stripe_customer_id = Column(String)
     stripe_price_id = Column(String)
     
@@ -44,7 +44,7 @@ class Subscription(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # set_updated_at trigger
     
     # Relationships
     user = relationship("User", back_populates="subscriptions")
@@ -1,10 +1,10 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Text, Boolean
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Boolean, Index, FetchedValue
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import enum
 import uuid
 
-from app.core.database import Base
+from app.core.database import Base, StringEnum
 
 class TicketStatus(enum.Enum):
     OPEN = "open"
@@ -20,18 +20,22 @@ class TicketPriority(enum.Enum):
 
 class SupportTicket(Base):
     __tablename__ = "support_tickets"
+    __table_args__ = (
+        Index("ix_support_tickets_open", "created_at",
+              postgresql_where=text("status IN ('open', 'in_progress')")),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
     
     # Ticket details
-    title = Column(String, nullable=False)
+    title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
-    status = Column(Enum(TicketStatus, values_callable=lambda x: [e.value for e in x]), nullable=False, default=TicketStatus.OPEN)
-    priority = Column(Enum(TicketPriority, values_callable=lambda x: [e.value for e in x]), nullable=False, default=TicketPriority.MEDIUM)
+    status = Column(StringEnum(TicketStatus), nullable=False, default=TicketStatus.OPEN)
+    priority = Column(StringEnum(TicketPriority), nullable=False, default=TicketPriority.MEDIUM)
     
     # Assignment
-    assigned_to = Column(String)  # Admin user ID
+    assigned_to = Column(String(36))  # Admin user ID
     
     # Resolution
     resolution = Column(Text)
@@ -39,7 +43,7 @@ class SupportTicket(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # set_updated_at trigger
     
     # Relationships
     user = relationship("User", back_populates="support_tickets")
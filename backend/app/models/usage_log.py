@@ -1,36 +1,43 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Float, Text, Boolean, JSON
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Float, Numeric, Text, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import uuid
 
 from app.core.database import Base
 
 class UsageLog(Base):
     __tablename__ = "usage_logs"
+    __table_args__ = (
+        # Append-only, so created_at tracks physical order
+        Index("ix_usage_logs_created_at_brin", "created_at", postgresql_using="brin",
+              postgresql_with={"pages_per_range": 32}),
+        Index("ix_usage_logs_failed", "created_at", postgresql_where=text("success = false")),
+        Index("ix_usage_logs_api_key_created_at", "api_key_id", "created_at"),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
     api_key_id = Column(String, ForeignKey("api_keys.id"), nullable=False)
     
     # Request details
-    endpoint = Column(String, nullable=False)
-    method = Column(String, nullable=False)
+    endpoint = Column(String(500), nullable=False)
+    method = Column(String(10), nullable=False)
     request_params = Column(JSON)
     request_headers = Column(JSON)
     
     # Response details
     response_status = Column(Integer, nullable=False)
     response_size = Column(Integer)  # in bytes
-    response_time = Column(Float)  # in seconds
+    response_time = Column(Float(precision=24))  # in seconds; REAL is ample for timings
     success = Column(Boolean, nullable=False)
     
     # Location and context
-    ip_address = Column(String)
-    user_agent = Column(String)
-    location = Column(String)  # Weather location requested
+    ip_address = Column(String(45))  # IPv6 support
+    user_agent = Column(String(512))
+    location = Column(String(255))  # Weather location requested
     
     # Billing
-    cost = Column(Float, default=0.0)  # Cost in credits
+    cost = Column(Numeric(12, 4, asdecimal=False), default=0.0)  # Cost in credits
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
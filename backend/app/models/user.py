@@ -1,10 +1,10 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Enum, Integer
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, FetchedValue, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 import uuid
 
-from app.core.database import Base
+from app.core.database import Base, StringEnum
 
 class UserRole(enum.Enum):
     USER = "user"
@@ -12,30 +12,37 @@ class UserRole(enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Password login in AuthService.authenticate_user reads only these columns by email
+        Index("ix_users_email_auth", "email", postgresql_include=["id", "hashed_password"]),
+    )
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    email = Column(String, unique=True, index=True, nullable=False)
-    hashed_password = Column(String, nullable=False)
+    email = Column(String(255), unique=True, index=True, nullable=False)
+    hashed_password = Column(LargeBinary(60), nullable=False)  # bcrypt hash as returned by bcrypt.hashpw
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
-    role = Column(Enum(UserRole, values_callable=lambda x: [e.value for e in x]), default=UserRole.USER)
+    role = Column(StringEnum(UserRole), default=UserRole.USER)
     
     # Profile fields
-    first_name = Column(String)
-    last_name = Column(String)
-    company = Column(String)
+    first_name = Column(String(100))
+    last_name = Column(String(100))
+    company = Column(String(255))
+    
+    # Billing
+    stripe_customer_id = Column(String(255))  # Created once by BillingService.create_subscription
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_onupdate=FetchedValue())  # set_updated_at trigger
     last_login = Column(DateTime(timezone=True))
     
     # Email verification
-    email_verification_token = Column(String)
+    email_verification_token = Column(String(64))
     email_verification_sent_at = Column(DateTime(timezone=True))
     
     # Password reset
-    password_reset_token = Column(String)
+    password_reset_token = Column(String(64))
     password_reset_sent_at = Column(DateTime(timezone=True))
     
     # Relationships
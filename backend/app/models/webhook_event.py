@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+class ProcessedWebhookEvent(Base):
+    """Stripe event ids already applied; Stripe delivers webhooks at least once"""
+    __tablename__ = "processed_webhook_events"
+    
+    event_id = Column(String(255), primary_key=True)
+    event_type = Column(String(255), nullable=False)
+    processed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<ProcessedWebhookEvent(event_id={self.event_id}, event_type={self.event_type})>"
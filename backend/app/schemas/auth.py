@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
 class Token(BaseModel):
@@ -13,11 +13,11 @@ class LoginRequest(BaseModel):
     password: str
 
 class RegisterRequest(BaseModel):
-    email: str
+    email: str = Field(..., max_length=255)
     password: str
-    first_name: Optional[str] = None
-    last_name: Optional[str] = None
-    company: Optional[str] = None
+    first_name: Optional[str] = Field(None, max_length=100)
+    last_name: Optional[str] = Field(None, max_length=100)
+    company: Optional[str] = Field(None, max_length=255)
 
 class PasswordResetRequest(BaseModel):
     email: str
@@ -0,0 +1,42 @@
+from pydantic import BaseModel, BeforeValidator, ConfigDict
+from typing import Annotated, Optional, List
+from datetime import datetime
+from app.models.subscription import SubscriptionPlan, SubscriptionStatus
+from app.models.invoice import InvoiceStatus
+
+# Invoice amounts are nullable integer columns; the summary reports missing ones as 0.0
+Amount = Annotated[float, BeforeValidator(lambda value: value or 0)]
+
+class BillingSubscriptionSummary(BaseModel):
+    id: str
+    user_id: str
+    plan: Optional[SubscriptionPlan] = None
+    status: Optional[SubscriptionStatus] = None
+    current_period_start: Optional[datetime] = None
+    current_period_end: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class BillingInvoiceSummary(BaseModel):
+    id: str
+    user_id: str
+    invoice_number: str
+    status: Optional[InvoiceStatus] = None
+    subtotal: Amount
+    total: Amount
+    amount_due: Amount
+    amount_paid: Amount
+    invoice_date: Optional[datetime] = None
+    due_date: Optional[datetime] = None
+    paid_at: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class BillingSummaryResponse(BaseModel):
+    current_subscription: Optional[BillingSubscriptionSummary] = None
+    recent_invoices: List[BillingInvoiceSummary]
+    total_paid: float
+    outstanding_balance: float
+    next_billing_date: Optional[datetime] = None
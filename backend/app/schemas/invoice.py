@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from app.models.invoice import InvoiceStatus
@@ -29,8 +29,7 @@ class InvoiceResponse(InvoiceBase):
     line_items: Optional[List[Dict[str, Any]]] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class InvoiceWithUser(InvoiceResponse):
     user_email: str
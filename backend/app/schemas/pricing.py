@@ -1,13 +1,18 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 from enum import Enum
 
+EndpointType = Literal['omega', 'nova', 'arc']
+Currency = Literal['INR', 'USD', 'EUR', 'GBP', 'JPY', 'AUD', 'CAD']
+UpdateMode = Literal['partial', 'complete']
+ImportMode = Literal['create', 'update', 'replace']
+
 class PricingConfigCreate(BaseModel):
     variable_name: str = Field(..., description="Name of the weather variable")
-    endpoint_type: str = Field(..., description="Endpoint type: omega, nova, or arc")
+    endpoint_type: EndpointType = Field(..., description="Endpoint type: omega, nova, or arc")
     base_price: float = Field(..., ge=0, description="Base price per variable per location")
-    currency: str = Field("INR", description="Currency code")
+    currency: Currency = Field("INR", description="Currency code")
     tax_rate: float = Field(0.0, ge=0, le=100, description="Tax rate percentage")
     tax_enabled: bool = Field(True, description="Whether tax is enabled")
     hsn_sac_code: Optional[str] = Field(None, description="HSN/SAC code for tax purposes")
@@ -16,23 +21,10 @@ class PricingConfigCreate(BaseModel):
     business_plan_price: Optional[float] = Field(None, ge=0)
     enterprise_plan_price: Optional[float] = Field(None, ge=0)
     is_active: bool = Field(True, description="Whether this pricing config is active")
-    
-    @validator('endpoint_type')
-    def validate_endpoint_type(cls, v):
-        if v not in ['omega', 'nova', 'arc']:
-            raise ValueError('endpoint_type must be one of: omega, nova, arc')
-        return v
-    
-    @validator('currency')
-    def validate_currency(cls, v):
-        valid_currencies = ['INR', 'USD', 'EUR', 'GBP', 'JPY', 'AUD', 'CAD']
-        if v not in valid_currencies:
-            raise ValueError(f'currency must be one of: {", ".join(valid_currencies)}')
-        return v
 
 class PricingConfigUpdate(BaseModel):
     variable_name: Optional[str] = None
-    endpoint_type: Optional[str] = None
+    endpoint_type: Optional[EndpointType] = None
     base_price: Optional[float] = Field(None, ge=0)
     currency: Optional[str] = None
     tax_rate: Optional[float] = Field(None, ge=0, le=100)
@@ -43,12 +35,6 @@ class PricingConfigUpdate(BaseModel):
     business_plan_price: Optional[float] = Field(None, ge=0)
     enterprise_plan_price: Optional[float] = Field(None, ge=0)
     is_active: Optional[bool] = None
-    
-    @validator('endpoint_type')
-    def validate_endpoint_type(cls, v):
-        if v is not None and v not in ['omega', 'nova', 'arc']:
-            raise ValueError('endpoint_type must be one of: omega, nova, arc')
-        return v
 
 class PricingConfigResponse(BaseModel):
     id: str
@@ -68,8 +54,7 @@ class PricingConfigResponse(BaseModel):
     updated_at: datetime
     created_by: str
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class CurrencyConfigCreate(BaseModel):
     currency_code: str = Field(..., min_length=3, max_length=3, description="3-letter currency code")
@@ -97,23 +82,16 @@ class CurrencyConfigResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class VariableMappingCreate(BaseModel):
     variable_name: str = Field(..., description="Name of the weather variable")
-    endpoint_type: str = Field(..., description="Endpoint type: omega, nova, or arc")
+    endpoint_type: EndpointType = Field(..., description="Endpoint type: omega, nova, or arc")
     endpoint_url: str = Field(..., description="API endpoint URL")
     description: Optional[str] = Field(None, description="Variable description")
     unit: Optional[str] = Field(None, description="Unit of measurement")
     data_type: str = Field("float", description="Data type")
     is_active: bool = Field(True, description="Whether this mapping is active")
-    
-    @validator('endpoint_type')
-    def validate_endpoint_type(cls, v):
-        if v not in ['omega', 'nova', 'arc']:
-            raise ValueError('endpoint_type must be one of: omega, nova, arc')
-        return v
 
 class VariableMappingUpdate(BaseModel):
     variable_name: Optional[str] = None
@@ -136,18 +114,11 @@ class VariableMappingResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class BulkPricingUpdate(BaseModel):
     pricing_updates: List[Dict[str, Any]] = Field(..., description="List of pricing updates")
-    update_mode: str = Field("partial", description="Update mode: partial or complete")
-    
-    @validator('update_mode')
-    def validate_update_mode(cls, v):
-        if v not in ['partial', 'complete']:
-            raise ValueError('update_mode must be either "partial" or "complete"')
-        return v
+    update_mode: UpdateMode = Field("partial", description="Update mode: partial or complete")
 
 class PricingAnalytics(BaseModel):
     total_configs: int
@@ -182,14 +153,8 @@ class PricingExportRequest(BaseModel):
 
 class PricingImportRequest(BaseModel):
     data: List[Dict[str, Any]] = Field(..., description="Pricing data to import")
-    import_mode: str = Field("update", description="Import mode: create, update, or replace")
+    import_mode: ImportMode = Field("update", description="Import mode: create, update, or replace")
     validate_only: bool = Field(False, description="Only validate, don't import")
-    
-    @validator('import_mode')
-    def validate_import_mode(cls, v):
-        if v not in ['create', 'update', 'replace']:
-            raise ValueError('import_mode must be one of: create, update, replace')
-        return v
 
 class PricingImportResult(BaseModel):
     success: bool
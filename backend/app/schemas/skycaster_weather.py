@@ -1,6 +1,30 @@
-from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
+from pydantic_core import PydanticCustomError
+import msgspec
+import numpy as np
+
+from app.core.coordinates import first_bad_coordinate
+
+_SUPPORTED_VARIABLES: frozenset[str] = frozenset({
+    # Omega endpoint
+    "ambient_temp(K)", "wind_10m", "wind_100m", "relative_humidity(%)",
+    # Nova endpoint
+    "temperature(K)", "surface_pressure(Pa)", "cumulus_precipitation(mm)",
+    "ghi(W/m2)", "ghi_farms(W/m2)", "clear_sky_ghi_farms(W/m2)", "albedo",
+    # Arc endpoint
+    "ct", "pc", "pcph"
+})
+
+# Validation messages are fixed templates: pydantic-core fills in the context
+# only when an error is actually rendered.
+_COORDINATE_PAIR_MSG = 'Each coordinate must be a [latitude, longitude] pair'
+_LATITUDE_RANGE_MSG = 'Latitude {lat} must be between -90 and 90'
+_LONGITUDE_RANGE_MSG = 'Longitude {lon} must be between -180 and 180'
+_TIMESTAMP_FORMAT_MSG = 'Timestamp must be in YYYY-MM-DD HH:MM:SS format'
+_VARIABLES_EMPTY_MSG = 'At least one variable must be specified'
+_UNSUPPORTED_VARIABLES_MSG = f'Unsupported variables: {{invalid}}. Supported variables: {sorted(_SUPPORTED_VARIABLES)}'
 
 class WeatherForecastRequest(BaseModel):
     """Request model for Skycaster weather forecast"""
@@ -8,101 +32,100 @@ class WeatherForecastRequest(BaseModel):
     list_lat_lon: List[List[float]] = Field(
         ...,
         description="List of latitude and longitude pairs",
-        example=[[28.6139, 77.2090], [19.0760, 72.8777]]
+        examples=[[[28.6139, 77.2090], [19.0760, 72.8777]]]
     )
     
     timestamp: str = Field(
         ...,
         description="Timestamp in YYYY-MM-DD HH:MM:SS format",
-        example="2025-07-18 14:00:00"
+        examples=["2025-07-18 14:00:00"]
     )
     
     variables: List[str] = Field(
         ...,
         description="List of weather variables to fetch",
-        example=["ambient_temp(K)", "relative_humidity(%)", "ghi(W/m2)"]
+        examples=[["ambient_temp(K)", "relative_humidity(%)", "ghi(W/m2)"]]
     )
     
     timezone: str = Field(
         default="Asia/Kolkata",
         description="Timezone for timestamp formatting",
-        example="Asia/Kolkata"
+        examples=["Asia/Kolkata"]
     )
     
-    @validator('list_lat_lon')
+    @field_validator('list_lat_lon')
+    @classmethod
     def validate_coordinates(cls, v):
-        for coord in v:
-            if len(coord) != 2:
-                raise ValueError('Each coordinate must be a [latitude, longitude] pair')
-            lat, lon = coord
+        if not v:
+            return v
+        
+        try:
+            coords = np.ascontiguousarray(v, dtype=np.float64)
+        except ValueError:
+            coords = None
+        if coords is None or coords.ndim != 2 or coords.shape[1] != 2:
+            raise PydanticCustomError('coordinate_pair', _COORDINATE_PAIR_MSG)
+        
+        i = first_bad_coordinate(coords)
+        if i >= 0:
+            lat, lon = v[i]
             if not -90 <= lat <= 90:
-                raise ValueError(f'Latitude {lat} must be between -90 and 90')
-            if not -180 <= lon <= 180:
-                raise ValueError(f'Longitude {lon} must be between -180 and 180')
+                raise PydanticCustomError('latitude_range', _LATITUDE_RANGE_MSG, {'lat': lat})
+            raise PydanticCustomError('longitude_range', _LONGITUDE_RANGE_MSG, {'lon': lon})
         return v
     
-    @validator('timestamp')
+    @field_validator('timestamp')
+    @classmethod
     def validate_timestamp(cls, v):
+        # fromisoformat is C-implemented but also accepts other ISO shapes,
+        # so pin the exact layout before parsing
         try:
-            datetime.strptime(v, "%Y-%m-%d %H:%M:%S")
+            if len(v) != 19 or v[10] != ' ':
+                raise ValueError
+            datetime.fromisoformat(v)
         except ValueError:
-            raise ValueError('Timestamp must be in YYYY-MM-DD HH:MM:SS format')
+            raise PydanticCustomError('timestamp_format', _TIMESTAMP_FORMAT_MSG)
         return v
     
-    @validator('variables')
+    @field_validator('variables')
+    @classmethod
     def validate_variables(cls, v):
         if not v:
-            raise ValueError('At least one variable must be specified')
-        
-        # List of all supported variables
-        supported_variables = [
-            # Omega endpoint
-            "ambient_temp(K)", "wind_10m", "wind_100m", "relative_humidity(%)",
-            # Nova endpoint
-            "temperature(K)", "surface_pressure(Pa)", "cumulus_precipitation(mm)",
-            "ghi(W/m2)", "ghi_farms(W/m2)", "clear_sky_ghi_farms(W/m2)", "albedo",
-            # Arc endpoint
-            "ct", "pc", "pcph"
-        ]
+            raise PydanticCustomError('variables_empty', _VARIABLES_EMPTY_MSG)
         
-        invalid_vars = [var for var in v if var not in supported_variables]
-        if invalid_vars:
-            raise ValueError(f'Unsupported variables: {invalid_vars}. Supported variables: {supported_variables}')
+        if not _SUPPORTED_VARIABLES.issuperset(v):
+            invalid_vars = [var for var in v if var not in _SUPPORTED_VARIABLES]
+            raise PydanticCustomError(
+                'unsupported_variables', _UNSUPPORTED_VARIABLES_MSG, {'invalid': str(invalid_vars)}
+            )
         
         return v
 
-class WeatherForecastResponse(BaseModel):
-    """Response model for Skycaster weather forecast"""
-    
-    location_data: Dict[str, Dict[str, Any]] = Field(
-        ...,
-        description="Weather data for each location",
-        example={
-            "28.6139,77.2090": {
-                "ambient_temp(K)": 303.5,
-                "relative_humidity(%)": 65.0,
-                "ghi(W/m2)": 789.2
-            }
-        }
-    )
-    
-    metadata: Dict[str, Any] = Field(
-        ...,
-        description="Request metadata and pricing information",
-        example={
-            "timestamp": "2025-07-18 14:00:00",
-            "timezone": "Asia/Kolkata",
-            "endpoints_called": ["omega", "nova"],
-            "variables_requested": ["ambient_temp(K)", "relative_humidity(%)", "ghi(W/m2)"],
-            "locations_count": 2,
-            "total_cost": "6.00",
-            "currency": "INR",
-            "tax_applied": "Yes",
-            "tax_rate": "18%",
-            "tax_amount": "1.08",
-            "final_amount": "7.08"
-        }
-    )
+class WeatherForecastResponse(msgspec.Struct, frozen=True, gc=False):
+    """Response model for Skycaster weather forecast
+
+    A msgspec Struct: the forecast route returns it through
+    MsgspecJSONResponse instead of re-validating the service output.
+    """
+    
+    # {"28.6139,77.2090": {"ambient_temp(K)": 303.5, "ghi(W/m2)": 789.2}}
+    location_data: Dict[str, Dict[str, Any]]
+    # Request metadata and pricing information (timestamp, timezone,
+    # endpoints_called, total_cost, currency, tax_*, final_amount, ...)
+    metadata: Dict[str, Any]
+
+class WeatherForecastResponseV2(msgspec.Struct, frozen=True, gc=False):
+    """Columnar (structure-of-arrays) Skycaster weather forecast
+
+    values[i][j] is variables[j] at coords[i]; null where the upstream
+    endpoint returned nothing numeric. Encoded with ORJSONResponse.
+    """
+    
+    coords: List[Tuple[float, float]]
+    variables: List[str]
+    # float32 ndarray of shape (len(coords), len(variables))
+    values: Any
+    metadata: Dict[str, Any]
 
 class VariableInfo(BaseModel):
     """Information about a weather variable"""
@@ -124,11 +147,11 @@ class SupportedVariablesResponse(BaseModel):
     endpoints: Dict[str, List[str]] = Field(
         ...,
         description="Variables grouped by endpoint",
-        example={
+        examples=[{
             "omega": ["ambient_temp(K)", "wind_10m", "wind_100m", "relative_humidity(%)"],
             "nova": ["temperature(K)", "surface_pressure(Pa)", "cumulus_precipitation(mm)", "ghi(W/m2)", "ghi_farms(W/m2)", "clear_sky_ghi_farms(W/m2)", "albedo"],
             "arc": ["ct", "pc", "pcph"]
-        }
+        }]
     )
 
 class PricingInfo(BaseModel):
@@ -152,7 +175,7 @@ class PricingResponse(BaseModel):
     calculation_example: Dict[str, Any] = Field(
         ...,
         description="Example pricing calculation",
-        example={
+        examples=[{
             "variables": ["ambient_temp(K)", "ghi(W/m2)"],
             "locations": 2,
             "cost_per_variable_per_location": 1.0,
@@ -161,44 +184,44 @@ class PricingResponse(BaseModel):
             "tax_amount": 0.72,
             "final_amount": 4.72,
             "currency": "INR"
-        }
+        }]
     )
 
-class WeatherRequestLog(BaseModel):
+class WeatherRequestLog(msgspec.Struct, kw_only=True, frozen=True, gc=False):
     """Model for weather request log"""
     
-    id: str = Field(..., description="Request ID")
-    user_id: Optional[str] = Field(None, description="User ID")
-    api_key_id: Optional[str] = Field(None, description="API key ID")
-    locations: List[List[float]] = Field(..., description="Requested locations")
-    variables: List[str] = Field(..., description="Requested variables")
-    timestamp: str = Field(..., description="Request timestamp")
-    timezone: str = Field(..., description="Request timezone")
-    endpoints_called: List[str] = Field(..., description="Endpoints called")
-    response_status: int = Field(..., description="Response status code")
-    response_time: float = Field(..., description="Response time in seconds")
-    success: bool = Field(..., description="Whether request was successful")
-    total_cost: float = Field(..., description="Total cost")
-    currency: str = Field(..., description="Currency")
-    tax_applied: float = Field(..., description="Tax amount applied")
-    final_amount: float = Field(..., description="Final amount")
-    ip_address: Optional[str] = Field(None, description="Client IP address")
-    user_agent: Optional[str] = Field(None, description="Client user agent")
-    country_code: Optional[str] = Field(None, description="Country code")
-    created_at: datetime = Field(..., description="Request creation time")
+    id: str  # Request ID
+    user_id: Optional[str] = None  # User ID
+    api_key_id: Optional[str] = None  # API key ID
+    locations: List[List[float]]  # Requested locations
+    variables: List[str]  # Requested variables
+    timestamp: str  # Request timestamp
+    timezone: str  # Request timezone
+    endpoints_called: List[str]  # Endpoints called
+    response_status: int  # Response status code
+    response_time: float  # Response time in seconds
+    success: bool  # Whether request was successful
+    total_cost: float  # Total cost
+    currency: str  # Currency
+    tax_applied: float  # Tax amount applied
+    final_amount: float  # Final amount
+    ip_address: Optional[str] = None  # Client IP address
+    user_agent: Optional[str] = None  # Client user agent
+    country_code: Optional[str] = None  # Country code
+    created_at: datetime  # Request creation time
 
-class WeatherUsageStatsResponse(BaseModel):
+class WeatherUsageStatsResponse(msgspec.Struct, frozen=True, gc=False):
     """Response model for weather usage statistics"""
     
-    total_requests: int = Field(..., description="Total number of requests")
-    total_cost: float = Field(..., description="Total cost")
-    currency: str = Field(..., description="Currency")
-    variables_used: Dict[str, int] = Field(..., description="Usage count per variable")
-    endpoints_used: Dict[str, int] = Field(..., description="Usage count per endpoint")
-    locations_queried: int = Field(..., description="Total locations queried")
-    average_response_time: float = Field(..., description="Average response time in seconds")
-    success_rate: float = Field(..., description="Success rate percentage")
-    recent_requests: List[WeatherRequestLog] = Field(..., description="Recent requests")
+    total_requests: int  # Total number of requests
+    total_cost: float  # Total cost
+    currency: str  # Currency
+    variables_used: Dict[str, int]  # Usage count per variable
+    endpoints_used: Dict[str, int]  # Usage count per endpoint
+    locations_queried: int  # Total locations queried
+    average_response_time: float  # Average response time in seconds
+    success_rate: float  # Success rate percentage
+    recent_requests: List[WeatherRequestLog]  # Recent requests
 
 class ErrorResponse(BaseModel):
     """Standard error response"""
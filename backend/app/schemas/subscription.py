@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 from app.models.subscription import SubscriptionPlan, SubscriptionStatus
@@ -22,8 +22,7 @@ class SubscriptionResponse(SubscriptionBase):
     cancel_at_period_end: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class SubscriptionPlanInfo(BaseModel):
     name: str
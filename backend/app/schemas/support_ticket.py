@@ -1,10 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 from app.models.support_ticket import TicketStatus, TicketPriority
 
 class SupportTicketBase(BaseModel):
-    title: str
+    title: str = Field(..., max_length=255)
     description: str
     priority: TicketPriority = TicketPriority.MEDIUM
 
@@ -12,12 +12,12 @@ class SupportTicketCreate(SupportTicketBase):
     pass
 
 class SupportTicketUpdate(BaseModel):
-    title: Optional[str] = None
+    title: Optional[str] = Field(None, max_length=255)
     description: Optional[str] = None
     status: Optional[TicketStatus] = None
     priority: Optional[TicketPriority] = None
     resolution: Optional[str] = None
-    assigned_to: Optional[str] = None
+    assigned_to: Optional[str] = Field(None, max_length=36)
 
 class SupportTicketResponse(SupportTicketBase):
     id: str
@@ -28,8 +28,7 @@ class SupportTicketResponse(SupportTicketBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class SupportTicketWithUser(SupportTicketResponse):
     user_email: str
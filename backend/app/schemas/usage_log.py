@@ -1,11 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, Dict, Any
 from datetime import datetime
 
 class UsageLogBase(BaseModel):
-    endpoint: str
-    method: str
-    location: Optional[str] = None
+    endpoint: str = Field(..., max_length=500)
+    method: str = Field(..., max_length=10)
+    location: Optional[str] = Field(None, max_length=255)
 
 class UsageLogCreate(UsageLogBase):
     request_params: Optional[Dict[str, Any]] = None
@@ -17,6 +17,12 @@ class UsageLogCreate(UsageLogBase):
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
     cost: Optional[float] = 0.0
+    
+    @field_validator('user_agent')
+    @classmethod
+    def truncate_user_agent(cls, v):
+        # Client-controlled, so clip to the column size rather than reject
+        return v[:512] if v else v
 
 class UsageLogResponse(UsageLogBase):
     id: str
@@ -31,8 +37,7 @@ class UsageLogResponse(UsageLogBase):
     cost: float
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class UsageStats(BaseModel):
     total_requests: int
@@ -1,21 +1,23 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from typing import Optional
 from datetime import datetime
 from app.models.user import UserRole
 
 class UserBase(BaseModel):
-    email: EmailStr
-    first_name: Optional[str] = None
-    last_name: Optional[str] = None
-    company: Optional[str] = None
+    # Plain str: responses carry addresses that were validated when written
+    email: str
+    first_name: Optional[str] = Field(None, max_length=100)
+    last_name: Optional[str] = Field(None, max_length=100)
+    company: Optional[str] = Field(None, max_length=255)
 
 class UserCreate(UserBase):
+    email: EmailStr
     password: str
 
 class UserUpdate(BaseModel):
-    first_name: Optional[str] = None
-    last_name: Optional[str] = None
-    company: Optional[str] = None
+    first_name: Optional[str] = Field(None, max_length=100)
+    last_name: Optional[str] = Field(None, max_length=100)
+    company: Optional[str] = Field(None, max_length=255)
 
 class UserLogin(BaseModel):
     email: EmailStr
@@ -29,8 +31,7 @@ class UserResponse(UserBase):
     created_at: datetime
     last_login: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 class UserWithSubscription(UserResponse):
     current_subscription: Optional[str] = None
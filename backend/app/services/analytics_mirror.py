@@ -0,0 +1,108 @@
+"""
+Mirror of audit/usage log inserts into ClickHouse for analytics
+
+PostgreSQL triggers send NOTIFY analytics_mirror with {"table", "id"} for
+every new audit_logs/usage_logs row. This consumer batches the ids, reads
+the rows back and bulk-inserts them into identically named ClickHouse
+tables. Run it as its own process:
+
+    python -m app.services.analytics_mirror
+
+LISTEN needs a session-level connection, so DATABASE_URL must not point at
+a transaction-mode pooler.
+"""
+import asyncio
+import json
+import logging
+from typing import Dict, List
+
+import asyncpg
+import clickhouse_connect
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "analytics_mirror"
+# Mirrored table -> primary key type, cast on the id array so the pkey index is used
+MIRRORED_TABLES = {"audit_logs": "uuid", "usage_logs": "text"}
+BATCH_SIZE = 10000
+FLUSH_INTERVAL_SECONDS = 5.0
+# Ids kept per table for retry while ClickHouse is unreachable; older ones are dropped
+MAX_PENDING_IDS = 10 * BATCH_SIZE
+
+
+class AnalyticsMirrorConsumer:
+    """Batches NOTIFY events and bulk-inserts the referenced rows into ClickHouse"""
+    
+    def __init__(self, clickhouse_url: str):
+        self.clickhouse = clickhouse_connect.get_client(dsn=clickhouse_url)
+        self.pending: Dict[str, List[str]] = {table: [] for table in MIRRORED_TABLES}
+        self.batch_ready = asyncio.Event()
+    
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            event = json.loads(payload)
+            self.pending[event["table"]].append(event["id"])
+        except (ValueError, KeyError) as e:
+            logger.error(f"Ignoring malformed analytics notification {payload!r}: {e}")
+            return
+        
+        if len(self.pending[event["table"]]) >= BATCH_SIZE:
+            self.batch_ready.set()
+    
+    async def _flush(self, connection: asyncpg.Connection):
+        for table, id_type in MIRRORED_TABLES.items():
+            ids, self.pending[table] = self.pending[table], []
+            if not ids:
+                continue
+            
+            try:
+                rows = await connection.fetch(
+                    f"SELECT * FROM {table} WHERE id = ANY($1::{id_type}[])", ids
+                )
+                if rows:
+                    column_names = list(rows[0].keys())
+                    # Blocking HTTP call; off the loop so LISTEN delivery continues
+                    await asyncio.to_thread(
+                        self.clickhouse.insert,
+                        table,
+                        [list(row.values()) for row in rows],
+                        column_names=column_names
+                    )
+                logger.info(f"Mirrored {len(rows)} {table} rows to ClickHouse")
+                
+            except Exception as e:
+                # Requeue so the next flush retries the batch, bounded so a
+                # long outage cannot grow the backlog without limit
+                logger.error(f"Error mirroring {table} to ClickHouse: {e}")
+                pending = ids + self.pending[table]
+                if len(pending) > MAX_PENDING_IDS:
+                    dropped = len(pending) - MAX_PENDING_IDS
+                    logger.warning(f"Dropping {dropped} oldest {table} ids from the analytics mirror backlog")
+                    pending = pending[dropped:]
+                self.pending[table] = pending
+    
+    async def run(self):
+        connection = await asyncpg.connect(settings.DATABASE_URL.replace("+asyncpg", ""))
+        await connection.add_listener(NOTIFY_CHANNEL, self._on_notify)
+        logger.info(f"Listening on {NOTIFY_CHANNEL} for analytics mirroring")
+        
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self.batch_ready.wait(), timeout=FLUSH_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                self.batch_ready.clear()
+                await self._flush(connection)
+        finally:
+            await connection.remove_listener(NOTIFY_CHANNEL, self._on_notify)
+            await connection.close()
+
+
+if __name__ == "__main__":
+    if not settings.CLICKHOUSE_URL:
+        raise SystemExit("CLICKHOUSE_URL is not configured; analytics mirroring is disabled")
+    
+    asyncio.run(AnalyticsMirrorConsumer(settings.CLICKHOUSE_URL).run())
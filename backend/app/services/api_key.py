@@ -1,20 +1,30 @@
-from typing import Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from typing import Optional, List, Dict, Any, Tuple, Iterator
+from datetime import datetime
+from collections import OrderedDict
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy import select, func, and_, tuple_
 import secrets
-import string
+import threading
+import time
 
 from app.models.api_key import ApiKey
 from app.models.usage_log import UsageLog
 from app.schemas.api_key import ApiKeyCreate, ApiKeyUpdate
 
+# Column values of recently authenticated active keys, most recently used last.
+# Mutations here evict immediately; other workers see them once the TTL lapses.
+API_KEY_CACHE_SIZE = 10_000
+API_KEY_CACHE_TTL_SECONDS = 60
+_api_key_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_api_key_cache_lock = threading.Lock()
+_API_KEY_COLUMNS = tuple(column.key for column in ApiKey.__table__.columns)
+
 class ApiKeyService:
     @staticmethod
     def generate_api_key() -> str:
         """Generate a new API key"""
-        alphabet = string.ascii_letters + string.digits
-        key = ''.join(secrets.choice(alphabet) for _ in range(32))
-        return f"sk_{key}"
+        # 24 random bytes -> 32 URL-safe base64 characters in one os.urandom call
+        return f"sk_{secrets.token_urlsafe(24)}"
     
     @staticmethod
     def create_api_key(db: Session, user_id: str, api_key_data: ApiKeyCreate) -> ApiKey:
@@ -34,132 +44,188 @@ class ApiKeyService:
     @staticmethod
     def get_api_key(db: Session, api_key_id: str) -> Optional[ApiKey]:
         """Get API key by ID"""
-        return db.query(ApiKey).filter(ApiKey.id == api_key_id).first()
+        return db.get(ApiKey, api_key_id)
     
     @staticmethod
     def get_api_key_by_key(db: Session, key: str) -> Optional[ApiKey]:
         """Get API key by key string"""
-        return db.query(ApiKey).filter(ApiKey.key == key, ApiKey.is_active == True).first()
+        now = time.monotonic()
+        with _api_key_cache_lock:
+            entry = _api_key_cache.get(key)
+            if entry is not None and entry[0] > now:
+                _api_key_cache.move_to_end(key)
+                values = entry[1]
+            else:
+                values = None
+        
+        if values is not None:
+            # Rebuild a clean instance and attach it to this session without a SELECT
+            api_key = ApiKey(**values)
+            make_transient_to_detached(api_key)
+            return db.merge(api_key, load=False)
+        
+        api_key = db.execute(
+            select(ApiKey).where(ApiKey.key == key, ApiKey.is_active == True)
+        ).scalar_one_or_none()
+        if api_key:
+            values = {column: getattr(api_key, column) for column in _API_KEY_COLUMNS}
+            with _api_key_cache_lock:
+                _api_key_cache[key] = (now + API_KEY_CACHE_TTL_SECONDS, values)
+                _api_key_cache.move_to_end(key)
+                if len(_api_key_cache) > API_KEY_CACHE_SIZE:
+                    _api_key_cache.popitem(last=False)
+        return api_key
+    
+    @staticmethod
+    def invalidate_cached_key(key: str):
+        """Evict a key string from the authentication cache"""
+        with _api_key_cache_lock:
+            _api_key_cache.pop(key, None)
     
     @staticmethod
     def get_user_api_keys(db: Session, user_id: str) -> List[ApiKey]:
         """Get all API keys for a user"""
-        return db.query(ApiKey).filter(ApiKey.user_id == user_id).all()
+        return list(db.scalars(select(ApiKey).where(ApiKey.user_id == user_id)))
     
     @staticmethod
     def update_api_key(db: Session, api_key_id: str, api_key_update: ApiKeyUpdate) -> Optional[ApiKey]:
         """Update API key"""
-        api_key = db.query(ApiKey).filter(ApiKey.id == api_key_id).first()
+        api_key = db.get(ApiKey, api_key_id)
         if not api_key:
             return None
         
-        update_data = api_key_update.dict(exclude_unset=True)
+        update_data = api_key_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(api_key, field, value)
         
         db.commit()
+        ApiKeyService.invalidate_cached_key(api_key.key)
         db.refresh(api_key)
         return api_key
     
     @staticmethod
     def deactivate_api_key(db: Session, api_key_id: str) -> Optional[ApiKey]:
         """Deactivate API key"""
-        api_key = db.query(ApiKey).filter(ApiKey.id == api_key_id).first()
+        api_key = db.get(ApiKey, api_key_id)
         if not api_key:
             return None
         
         api_key.is_active = False
         db.commit()
+        ApiKeyService.invalidate_cached_key(api_key.key)
         db.refresh(api_key)
         return api_key
     
     @staticmethod
     def activate_api_key(db: Session, api_key_id: str) -> Optional[ApiKey]:
         """Activate API key"""
-        api_key = db.query(ApiKey).filter(ApiKey.id == api_key_id).first()
+        api_key = db.get(ApiKey, api_key_id)
         if not api_key:
             return None
         
         api_key.is_active = True
         db.commit()
+        ApiKeyService.invalidate_cached_key(api_key.key)
         db.refresh(api_key)
         return api_key
     
     @staticmethod
     def delete_api_key(db: Session, api_key_id: str) -> bool:
         """Delete API key"""
-        api_key = db.query(ApiKey).filter(ApiKey.id == api_key_id).first()
+        api_key = db.get(ApiKey, api_key_id)
         if not api_key:
             return False
         
+        key = api_key.key
         db.delete(api_key)
         db.commit()
+        ApiKeyService.invalidate_cached_key(key)
         return True
     
     @staticmethod
     def get_api_key_usage_stats(db: Session, api_key_id: str) -> dict:
         """Get usage statistics for an API key"""
-        # Get current month usage
-        current_month = func.date_trunc('month', func.now())
+        # One scan over this month's rows; today's figures are FILTERed subsets
+        month_start = func.date_trunc('month', func.now())
+        today_start = func.date_trunc('day', func.now())
+        is_today = UsageLog.created_at >= today_start
         
-        month_stats = db.query(
+        stats = db.execute(select(
             func.count(UsageLog.id).label('total_requests'),
             func.count(UsageLog.id).filter(UsageLog.success == True).label('successful_requests'),
             func.count(UsageLog.id).filter(UsageLog.success == False).label('failed_requests'),
             func.sum(UsageLog.cost).label('total_cost'),
-            func.avg(UsageLog.response_time).label('avg_response_time')
-        ).filter(
-            and_(
-                UsageLog.api_key_id == api_key_id,
-                func.date_trunc('month', UsageLog.created_at) == current_month
-            )
-        ).first()
-        
-        # Get today's usage
-        today = func.date_trunc('day', func.now())
-        
-        today_stats = db.query(
-            func.count(UsageLog.id).label('total_requests'),
-            func.count(UsageLog.id).filter(UsageLog.success == True).label('successful_requests'),
-            func.count(UsageLog.id).filter(UsageLog.success == False).label('failed_requests')
-        ).filter(
-            and_(
-                UsageLog.api_key_id == api_key_id,
-                func.date_trunc('day', UsageLog.created_at) == today
-            )
-        ).first()
+            func.avg(UsageLog.response_time).label('avg_response_time'),
+            func.count(UsageLog.id).filter(is_today).label('today_requests'),
+            func.count(UsageLog.id).filter(and_(is_today, UsageLog.success == True)).label('today_successful'),
+            func.count(UsageLog.id).filter(and_(is_today, UsageLog.success == False)).label('today_failed')
+        ).where(
+            UsageLog.api_key_id == api_key_id,
+            UsageLog.created_at >= month_start
+        )).one()
         
         return {
             "current_month": {
-                "total_requests": month_stats.total_requests or 0,
-                "successful_requests": month_stats.successful_requests or 0,
-                "failed_requests": month_stats.failed_requests or 0,
-                "total_cost": float(month_stats.total_cost or 0),
-                "avg_response_time": float(month_stats.avg_response_time or 0)
+                "total_requests": stats.total_requests or 0,
+                "successful_requests": stats.successful_requests or 0,
+                "failed_requests": stats.failed_requests or 0,
+                "total_cost": float(stats.total_cost or 0),
+                "avg_response_time": float(stats.avg_response_time or 0)
             },
             "today": {
-                "total_requests": today_stats.total_requests or 0,
-                "successful_requests": today_stats.successful_requests or 0,
-                "failed_requests": today_stats.failed_requests or 0
+                "total_requests": stats.today_requests or 0,
+                "successful_requests": stats.today_successful or 0,
+                "failed_requests": stats.today_failed or 0
             }
         }
     
     @staticmethod
-    def get_all_api_keys(db: Session, skip: int = 0, limit: int = 100) -> List[ApiKey]:
-        """Get all API keys (admin only)"""
-        return db.query(ApiKey).offset(skip).limit(limit).all()
+    def get_all_api_keys(
+        db: Session,
+        last_created_at: Optional[datetime] = None,
+        last_id: Optional[str] = None,
+        limit: int = 100,
+        is_active: Optional[bool] = None,
+        user_id: Optional[str] = None
+    ) -> Iterator[ApiKey]:
+        """Stream API keys newest first (admin only)
+        
+        Keyset-paginated: pass the created_at and id of the last key from the
+        previous page to continue after it.
+        """
+        stmt = select(ApiKey)
+        
+        if is_active is not None:
+            stmt = stmt.where(ApiKey.is_active == is_active)
+        
+        if user_id:
+            stmt = stmt.where(ApiKey.user_id == user_id)
+        
+        if last_created_at is not None and last_id is not None:
+            stmt = stmt.where(
+                tuple_(ApiKey.created_at, ApiKey.id) < tuple_(last_created_at, last_id)
+            )
+        
+        stmt = (
+            stmt.order_by(ApiKey.created_at.desc(), ApiKey.id.desc())
+            .limit(limit)
+            .execution_options(yield_per=500)
+        )
+        return iter(db.scalars(stmt))
     
     @staticmethod
     def regenerate_api_key(db: Session, api_key_id: str) -> Optional[ApiKey]:
         """Regenerate API key"""
-        api_key = db.query(ApiKey).filter(ApiKey.id == api_key_id).first()
+        api_key = db.get(ApiKey, api_key_id)
         if not api_key:
             return None
         
+        old_key = api_key.key
         api_key.key = ApiKeyService.generate_api_key()
         api_key.total_requests = 0
         api_key.last_used = None
         
         db.commit()
+        ApiKeyService.invalidate_cached_key(old_key)
         db.refresh(api_key)
         return api_key
\ No newline at end of file
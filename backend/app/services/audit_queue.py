@@ -0,0 +1,186 @@
+"""
+Background writer for audit rows
+
+AuditService.log_* methods hand their rows to `audit_writer` instead of
+inserting them on the request thread. A single daemon thread drains the queue
+in batches and writes each batch with one bulk insert per table and one commit.
+Audit rows are best-effort: when the queue is full new rows are dropped with a
+warning rather than blocking the request.
+
+When a backlog builds up (e.g. after a database outage) the writer drains
+larger batches and loads big per-table groups with COPY FROM STDIN instead of
+multi-row INSERTs.
+"""
+import io
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import orjson
+from sqlalchemy import JSON, text
+from sqlalchemy.orm import Session
+
+from app.core.database import Base, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+AUDIT_QUEUE_MAXSIZE = 10_000
+AUDIT_BATCH_SIZE = 200
+AUDIT_FLUSH_INTERVAL_SECONDS = 0.05
+# Backlog size at which batches grow and per-table groups switch to COPY
+AUDIT_COPY_THRESHOLD = 1000
+AUDIT_CATCHUP_BATCH_SIZE = 5000
+
+
+class AuditWriter:
+    """Single-consumer queue of (model, row mapping) pairs"""
+
+    def __init__(self):
+        self.queue: "queue.Queue[Tuple[Type[Base], Dict[str, Any]]]" = queue.Queue(maxsize=AUDIT_QUEUE_MAXSIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def submit(self, model: Type[Base], row: Dict[str, Any]):
+        """Queue one row for insertion into model's table"""
+        self._ensure_started()
+        # Stamp when the event happened, not when the batch is flushed
+        row.setdefault("timestamp", datetime.now(timezone.utc))
+        try:
+            self.queue.put_nowait((model, row))
+        except queue.Full:
+            logger.warning(f"Audit queue full, dropping {model.__tablename__} row")
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the writer thread after it has flushed everything queued so far"""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while not (self._stopping.is_set() and self.queue.empty()):
+            try:
+                batch = [self.queue.get(timeout=AUDIT_FLUSH_INTERVAL_SECONDS)]
+            except queue.Empty:
+                continue
+
+            batch_size = AUDIT_BATCH_SIZE
+            if self.queue.qsize() >= AUDIT_COPY_THRESHOLD:
+                batch_size = AUDIT_CATCHUP_BATCH_SIZE
+            
+            deadline = time.monotonic() + AUDIT_FLUSH_INTERVAL_SECONDS
+            while len(batch) < batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._write(batch)
+
+    @staticmethod
+    def _write(batch: List[Tuple[Type[Base], Dict[str, Any]]]):
+        rows_by_model: Dict[Type[Base], List[Dict[str, Any]]] = defaultdict(list)
+        for model, row in batch:
+            rows_by_model[model].append(row)
+
+        db = SessionLocal()
+        try:
+            # Audit rows are best-effort: acknowledge the commit without waiting
+            # for the WAL flush. SET LOCAL keeps this to the audit transaction.
+            db.execute(text("SET LOCAL synchronous_commit = OFF"))
+            for model, rows in rows_by_model.items():
+                if len(rows) > AUDIT_COPY_THRESHOLD:
+                    AuditWriter._copy_rows(db, model, rows)
+                else:
+                    db.bulk_insert_mappings(model, rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to write {len(batch)} audit rows: {e}")
+        finally:
+            db.close()
+
+    @staticmethod
+    def _copy_rows(db: Session, model: Type[Base], rows: List[Dict[str, Any]]):
+        """Load rows into model's table with COPY FROM STDIN in the session's transaction
+        
+        Column-level Python defaults (the uuid4 ids) are applied here since
+        COPY bypasses the ORM; columns no row sets and without a Python
+        default are left out so their server defaults still apply.
+        """
+        table = model.__table__
+        defaults = {
+            column.key: column.default
+            for column in table.columns
+            if column.default is not None and (column.default.is_callable or column.default.is_scalar)
+        }
+        columns = [
+            column for column in table.columns
+            if column.key in defaults or any(column.key in row for row in rows)
+        ]
+        
+        buffer = io.StringIO()
+        for row in rows:
+            fields = []
+            for column in columns:
+                default = defaults.get(column.key)
+                if column.key in row:
+                    value = row[column.key]
+                elif default is None:
+                    value = None
+                elif default.is_callable:
+                    value = default.arg(None)
+                else:
+                    value = default.arg
+                fields.append(_copy_text(value, isinstance(column.type, JSON)))
+            buffer.write("\t".join(fields))
+            buffer.write("\n")
+        buffer.seek(0)
+        
+        column_list = ", ".join(f'"{column.name}"' for column in columns)
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f'COPY "{table.name}" ({column_list}) FROM STDIN', buffer)
+        finally:
+            cursor.close()
+
+
+def _copy_text(value: Any, is_json: bool) -> str:
+    """Render one value as a field of COPY's default text format"""
+    if value is None:
+        return "\\N"
+    if is_json:
+        text = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    elif isinstance(value, bool):
+        text = "t" if value else "f"
+    elif isinstance(value, datetime):
+        text = value.isoformat()
+    else:
+        text = str(value)
+    return (
+        text.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+audit_writer = AuditWriter()
@@ -2,21 +2,113 @@
 Advanced Audit Service for detailed activity logging
 """
 import uuid
-from typing import Optional, Dict, Any, List
+import json
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, NamedTuple
 from sqlalchemy.orm import Session
-from datetime import datetime
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from sqlalchemy.exc import ProgrammingError
+from datetime import datetime, timedelta
 import logging
 
-from app.models.audit_log import AuditLog, SecurityEvent, UserActivity, PerformanceMetric
+from app.models.audit_log import AuditLog, HeaderSet, SecurityEvent, UserActivity, PerformanceMetric
 from app.models.user import User
 from app.models.api_key import ApiKey
+from app.services.audit_queue import audit_writer
 
 logger = logging.getLogger(__name__)
 
+# Digests of header sets already known to exist, most recently used last
+HEADER_SET_CACHE_SIZE = 4096
+_header_set_cache: "OrderedDict[bytes, uuid.UUID]" = OrderedDict()
+
+# Stored for events logged without additional_data; shared, so never mutate it.
+# A plain dict rather than a MappingProxyType so the JSON serializer accepts it.
+_EMPTY_DETAILS: Dict[str, Any] = {}
+
+
+class _AuthEvent(NamedTuple):
+    """How an authentication event type is classified and described"""
+    severity: str
+    action_taken: str
+    success: bool
+    template: Optional[str]  # Formatted with the user's email
+
+
+# Every authentication event type the API emits, resolved with one lookup
+_EVENT_DISPATCH: Dict[str, _AuthEvent] = {
+    "login_success": _AuthEvent("LOW", "logged", True, "Successful login for {}"),
+    "login_failure": _AuthEvent("MEDIUM", "flagged", False, "Failed login attempt for {}"),
+    "oauth_login_success": _AuthEvent("LOW", "logged", True, None),
+    "oauth_login_failure": _AuthEvent("MEDIUM", "flagged", False, None),
+    "register_success": _AuthEvent("LOW", "logged", True, "New user registration for {}"),
+    "register_failure": _AuthEvent("MEDIUM", "flagged", False, "Failed registration attempt for {}"),
+    "password_reset_request": _AuthEvent("LOW", "flagged", False, "Password reset requested for {}"),
+    "password_reset_success": _AuthEvent("LOW", "logged", True, "Password successfully reset for {}"),
+    "password_reset_failure": _AuthEvent("MEDIUM", "flagged", False, None),
+    "email_verification_success": _AuthEvent("LOW", "logged", True, None),
+    "email_verification_failure": _AuthEvent("MEDIUM", "flagged", False, None),
+    "profile_access": _AuthEvent("LOW", "flagged", False, None),
+    "token_refresh": _AuthEvent("LOW", "flagged", False, "Token refresh for {}"),
+    "logout": _AuthEvent("LOW", "flagged", False, "User logout for {}"),
+    "api_key_created": _AuthEvent("LOW", "flagged", False, "New API key created for {}"),
+    "api_key_deleted": _AuthEvent("LOW", "flagged", False, "API key deleted for {}"),
+    "subscription_created": _AuthEvent("LOW", "flagged", False, "New subscription created for {}"),
+    "subscription_upgraded": _AuthEvent("LOW", "flagged", False, "Subscription upgraded for {}"),
+    "subscription_cancelled": _AuthEvent("LOW", "flagged", False, "Subscription cancelled for {}"),
+}
+
+
+def _classify_event(event_type: str) -> _AuthEvent:
+    """Classify an event type missing from _EVENT_DISPATCH by its name"""
+    severity = "LOW"
+    if "failure" in event_type or "invalid" in event_type:
+        severity = "MEDIUM"
+    elif "suspicious" in event_type or "blocked" in event_type:
+        severity = "HIGH"
+    success = "success" in event_type
+    return _AuthEvent(severity, "logged" if success else "flagged", success, None)
+
 
 class AuditService:
     """Service for comprehensive audit logging"""
     
+    @staticmethod
+    def get_header_set_id(db: Session, headers: Optional[Dict[str, Any]]) -> Optional[uuid.UUID]:
+        """Resolve a header dict to its deduplicated HeaderSet id, inserting it if new"""
+        if not headers:
+            return None
+        
+        canonical = {str(name).lower(): value for name, value in headers.items()}
+        digest = hashlib.sha256(
+            json.dumps(canonical, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        ).digest()
+        
+        header_set_id = _header_set_cache.get(digest)
+        if header_set_id is not None:
+            _header_set_cache.move_to_end(digest)
+            return header_set_id
+        
+        # The id is derived from the digest so a conflicting insert needs no lookup
+        header_set_id = uuid.UUID(bytes=digest[:16])
+        db.execute(
+            pg_insert(HeaderSet.__table__)
+            .values(id=header_set_id, sha256=digest, headers=canonical)
+            .on_conflict_do_nothing(index_elements=["sha256"])
+        )
+        
+        _header_set_cache[digest] = header_set_id
+        if len(_header_set_cache) > HEADER_SET_CACHE_SIZE:
+            _header_set_cache.popitem(last=False)
+        return header_set_id
+    
+    @staticmethod
+    def clear_header_set_cache():
+        """Forget cached header sets, e.g. after a rollback discarded new inserts"""
+        _header_set_cache.clear()
+    
     @staticmethod
     def log_authentication_event(
         db: Session,
@@ -29,51 +121,53 @@ class AuditService:
         request_id: Optional[str] = None,
         additional_data: Optional[Dict[str, Any]] = None
     ):
-        """Log authentication-specific events with detailed context"""
+        """Log authentication-specific events with detailed context
+        
+        Like the other log_* methods this only queues the rows for the
+        background audit writer; db is unused and kept for callers.
+        """
         try:
-            # Determine severity based on event type
-            severity = "LOW"
-            if "failure" in event_type or "invalid" in event_type:
-                severity = "MEDIUM"
-            elif "suspicious" in event_type or "blocked" in event_type:
-                severity = "HIGH"
+            event = _EVENT_DISPATCH.get(event_type)
+            if event is None:
+                event = _classify_event(event_type)
             
-            # Create security event
-            security_event = SecurityEvent(
-                event_type=event_type,
-                severity=severity,
-                user_id=user_id,
-                user_email=user_email,
-                attempted_email=attempted_email,
-                request_id=request_id,
-                client_ip=client_ip,
-                user_agent=user_agent,
-                description=AuditService._get_event_description(event_type, user_email or attempted_email),
-                details=additional_data or {},
-                action_taken="logged" if "success" in event_type else "flagged"
-            )
+            email = user_email or attempted_email
+            description = AuditService._describe_event(event, event_type, email)
+            # One dict shared by both rows; neither row is mutated after queueing
+            details = additional_data if additional_data is not None else _EMPTY_DETAILS
             
-            db.add(security_event)
+            # Create security event
+            audit_writer.submit(SecurityEvent, {
+                "event_type": event_type,
+                "severity": event.severity,
+                "user_id": user_id,
+                "user_email": user_email,
+                "attempted_email": attempted_email,
+                "request_id": request_id,
+                "client_ip": client_ip,
+                "user_agent": user_agent,
+                "description": description,
+                "details": details,
+                "action_taken": event.action_taken
+            })
             
-            # Also log as user activity if user is identified
+            # Also log as user activity if user is identified; anonymous
+            # failures stop at the security event
             if user_id:
-                user_activity = UserActivity(
-                    user_id=user_id,
-                    request_id=request_id,
-                    activity_type="authentication",
-                    activity_name=event_type,
-                    activity_description=AuditService._get_event_description(event_type, user_email),
-                    success="success" in event_type,
-                    activity_data=additional_data or {}
-                )
-                db.add(user_activity)
+                audit_writer.submit(UserActivity, {
+                    "user_id": user_id,
+                    "request_id": request_id,
+                    "activity_type": "authentication",
+                    "activity_name": event_type,
+                    "activity_description": description,
+                    "success": event.success,
+                    "activity_data": details
+                })
             
-            db.commit()
-            logger.info(f"Authentication event logged: {event_type} for {user_email or attempted_email}")
+            logger.info(f"Authentication event logged: {event_type} for {email}")
             
         except Exception as e:
             logger.error(f"Error logging authentication event: {e}")
-            db.rollback()
     
     @staticmethod
     def log_api_key_event(
@@ -89,28 +183,27 @@ class AuditService:
     ):
         """Log API key management events"""
         try:
-            user_activity = UserActivity(
-                user_id=user_id,
-                request_id=request_id,
-                activity_type="api_key_management",
-                activity_name=event_type,
-                activity_description=f"API key {event_type.replace('_', ' ')} - {api_key_name or 'Unknown'}",
-                success=True,
-                activity_data={
-                    "api_key_id": api_key_id,
-                    "api_key_name": api_key_name,
-                    "client_ip": client_ip,
-                    **(additional_data or {})
-                }
-            )
+            activity_data = {
+                "api_key_id": api_key_id,
+                "api_key_name": api_key_name,
+                "client_ip": client_ip
+            }
+            if additional_data:
+                activity_data.update(additional_data)
             
-            db.add(user_activity)
-            db.commit()
+            audit_writer.submit(UserActivity, {
+                "user_id": user_id,
+                "request_id": request_id,
+                "activity_type": "api_key_management",
+                "activity_name": event_type,
+                "activity_description": f"API key {event_type.replace('_', ' ')} - {api_key_name or 'Unknown'}",
+                "success": True,
+                "activity_data": activity_data
+            })
             logger.info(f"API key event logged: {event_type} for user {user_id}")
             
         except Exception as e:
             logger.error(f"Error logging API key event: {e}")
-            db.rollback()
     
     @staticmethod
     def log_subscription_event(
@@ -125,28 +218,27 @@ class AuditService:
     ):
         """Log subscription-related events"""
         try:
-            user_activity = UserActivity(
-                user_id=user_id,
-                request_id=request_id,
-                activity_type="subscription_management",
-                activity_name=event_type,
-                activity_description=f"Subscription {event_type.replace('_', ' ')} - {subscription_plan}",
-                success=True,
-                activity_data={
-                    "subscription_plan": subscription_plan,
-                    "previous_plan": previous_plan,
-                    "client_ip": client_ip,
-                    **(additional_data or {})
-                }
-            )
+            activity_data = {
+                "subscription_plan": subscription_plan,
+                "previous_plan": previous_plan,
+                "client_ip": client_ip
+            }
+            if additional_data:
+                activity_data.update(additional_data)
             
-            db.add(user_activity)
-            db.commit()
+            audit_writer.submit(UserActivity, {
+                "user_id": user_id,
+                "request_id": request_id,
+                "activity_type": "subscription_management",
+                "activity_name": event_type,
+                "activity_description": f"Subscription {event_type.replace('_', ' ')} - {subscription_plan}",
+                "success": True,
+                "activity_data": activity_data
+            })
             logger.info(f"Subscription event logged: {event_type} for user {user_id}")
             
         except Exception as e:
             logger.error(f"Error logging subscription event: {e}")
-            db.rollback()
     
     @staticmethod
     def log_weather_api_usage(
@@ -165,54 +257,51 @@ class AuditService:
     ):
         """Log weather API usage with detailed metrics"""
         try:
-            # Log user activity
-            user_activity = UserActivity(
-                user_id=user_id,
-                request_id=request_id,
-                activity_type="weather_api_usage",
-                activity_name=f"Weather API - {endpoint}",
-                activity_description=f"Weather data request for {location}",
-                success=success,
-                duration_ms=processing_time_ms,
-                activity_data={
-                    "api_key_id": api_key_id,
-                    "endpoint": endpoint,
-                    "variables": variables,
-                    "location": location,
-                    "subscription_plan": subscription_plan,
-                    "client_ip": client_ip,
-                    **(additional_data or {})
-                }
-            )
+            activity_data = {
+                "api_key_id": api_key_id,
+                "endpoint": endpoint,
+                "variables": variables,
+                "location": location,
+                "subscription_plan": subscription_plan,
+                "client_ip": client_ip
+            }
+            if additional_data:
+                activity_data.update(additional_data)
             
-            db.add(user_activity)
+            # Log user activity
+            audit_writer.submit(UserActivity, {
+                "user_id": user_id,
+                "request_id": request_id,
+                "activity_type": "weather_api_usage",
+                "activity_name": f"Weather API - {endpoint}",
+                "activity_description": f"Weather data request for {location}",
+                "success": success,
+                "duration_ms": processing_time_ms,
+                "activity_data": activity_data
+            })
             
             # Log performance metric
-            performance_metric = PerformanceMetric(
-                metric_type="weather_api_response_time",
-                metric_name=f"Weather API - {endpoint}",
-                value=processing_time_ms,
-                unit="ms",
-                endpoint=endpoint,
-                user_id=user_id,
-                request_id=request_id,
-                extra_metadata={
+            audit_writer.submit(PerformanceMetric, {
+                "metric_type": "weather_api_response_time",
+                "metric_name": f"Weather API - {endpoint}",
+                "value": processing_time_ms,
+                "unit": "ms",
+                "endpoint": endpoint,
+                "user_id": user_id,
+                "request_id": request_id,
+                "extra_metadata": {
                     "variables": variables,
                     "location": location,
                     "subscription_plan": subscription_plan,
                     "success": success
                 },
-                tags=["weather_api", endpoint.replace("/", "_"), subscription_plan]
-            )
-            
-            db.add(performance_metric)
-            db.commit()
+                "tags": ["weather_api", endpoint.replace("/", "_"), subscription_plan]
+            })
             
             logger.info(f"Weather API usage logged: {endpoint} for user {user_id}")
             
         except Exception as e:
             logger.error(f"Error logging weather API usage: {e}")
-            db.rollback()
     
     @staticmethod
     def log_security_incident(
@@ -230,28 +319,24 @@ class AuditService:
     ):
         """Log security incidents and suspicious activities"""
         try:
-            security_event = SecurityEvent(
-                event_type=incident_type,
-                severity=severity,
-                user_id=user_id,
-                request_id=request_id,
-                client_ip=client_ip,
-                user_agent=user_agent,
-                endpoint=endpoint,
-                description=description,
-                details=additional_data or {},
-                action_taken=action_taken,
-                automatic_response=action_taken is not None
-            )
-            
-            db.add(security_event)
-            db.commit()
+            audit_writer.submit(SecurityEvent, {
+                "event_type": incident_type,
+                "severity": severity,
+                "user_id": user_id,
+                "request_id": request_id,
+                "client_ip": client_ip,
+                "user_agent": user_agent,
+                "endpoint": endpoint,
+                "description": description,
+                "details": additional_data if additional_data is not None else _EMPTY_DETAILS,
+                "action_taken": action_taken,
+                "automatic_response": action_taken is not None
+            })
             
             logger.warning(f"Security incident logged: {incident_type} - {severity}")
             
         except Exception as e:
             logger.error(f"Error logging security incident: {e}")
-            db.rollback()
     
     @staticmethod
     def get_user_activity_summary(
@@ -262,26 +347,36 @@ class AuditService:
     ) -> List[Dict[str, Any]]:
         """Get user activity summary for analytics"""
         try:
-            query = db.query(UserActivity).filter(UserActivity.user_id == user_id)
+            stmt = select(
+                UserActivity.id,
+                UserActivity.activity_type,
+                UserActivity.activity_name,
+                UserActivity.activity_description,
+                UserActivity.timestamp,
+                UserActivity.success,
+                UserActivity.duration_ms,
+                UserActivity.activity_data
+            ).where(UserActivity.user_id == user_id)
             
             if activity_type:
-                query = query.filter(UserActivity.activity_type == activity_type)
+                stmt = stmt.where(UserActivity.activity_type == activity_type)
             
-            activities = query.order_by(UserActivity.timestamp.desc()).limit(limit).all()
+            recent = stmt.order_by(UserActivity.timestamp.desc()).limit(limit).subquery()
             
-            return [
-                {
-                    "id": str(activity.id),
-                    "activity_type": activity.activity_type,
-                    "activity_name": activity.activity_name,
-                    "description": activity.activity_description,
-                    "timestamp": activity.timestamp.isoformat(),
-                    "success": activity.success,
-                    "duration_ms": activity.duration_ms,
-                    "data": activity.activity_data
-                }
-                for activity in activities
-            ]
+            # Postgres renders the JSON array; ids and ISO timestamps come back as strings
+            row = func.json_build_object(
+                "id", recent.c.id,
+                "activity_type", recent.c.activity_type,
+                "activity_name", recent.c.activity_name,
+                "description", recent.c.activity_description,
+                "timestamp", recent.c.timestamp,
+                "success", recent.c.success,
+                "duration_ms", recent.c.duration_ms,
+                "data", recent.c.activity_data
+            )
+            return db.execute(
+                select(func.json_agg(aggregate_order_by(row, recent.c.timestamp.desc())))
+            ).scalar() or []
             
         except Exception as e:
             logger.error(f"Error getting user activity summary: {e}")
@@ -296,52 +391,115 @@ class AuditService:
     ) -> List[Dict[str, Any]]:
         """Get security events summary for monitoring"""
         try:
-            query = db.query(SecurityEvent)
+            stmt = select(
+                SecurityEvent.id,
+                SecurityEvent.event_type,
+                SecurityEvent.severity,
+                SecurityEvent.description,
+                SecurityEvent.timestamp,
+                SecurityEvent.user_id,
+                SecurityEvent.client_ip,
+                SecurityEvent.action_taken,
+                SecurityEvent.details
+            )
             
             if severity:
-                query = query.filter(SecurityEvent.severity == severity)
+                stmt = stmt.where(SecurityEvent.severity == severity)
             
             if event_type:
-                query = query.filter(SecurityEvent.event_type == event_type)
+                stmt = stmt.where(SecurityEvent.event_type == event_type)
             
-            events = query.order_by(SecurityEvent.timestamp.desc()).limit(limit).all()
+            recent = stmt.order_by(SecurityEvent.timestamp.desc()).limit(limit).subquery()
             
-            return [
-                {
-                    "id": str(event.id),
-                    "event_type": event.event_type,
-                    "severity": event.severity,
-                    "description": event.description,
-                    "timestamp": event.timestamp.isoformat(),
-                    "user_id": str(event.user_id) if event.user_id else None,
-                    "client_ip": event.client_ip,
-                    "action_taken": event.action_taken,
-                    "details": event.details
-                }
-                for event in events
-            ]
+            row = func.json_build_object(
+                "id", recent.c.id,
+                "event_type", recent.c.event_type,
+                "severity", recent.c.severity,
+                "description", recent.c.description,
+                "timestamp", recent.c.timestamp,
+                "user_id", recent.c.user_id,
+                "client_ip", recent.c.client_ip,
+                "action_taken", recent.c.action_taken,
+                "details", recent.c.details
+            )
+            return db.execute(
+                select(func.json_agg(aggregate_order_by(row, recent.c.timestamp.desc())))
+            ).scalar() or []
             
         except Exception as e:
             logger.error(f"Error getting security events summary: {e}")
             return []
     
+    @staticmethod
+    def get_hourly_performance_rollup(
+        db: Session,
+        hours: int = 24,
+        endpoint: Optional[str] = None,
+        metric_name: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get hourly performance buckets, preferring the perf_hourly continuous aggregate"""
+        start_time = datetime.utcnow() - timedelta(hours=hours)
+        
+        try:
+            sql = """
+                SELECT bucket, metric_name, endpoint, sample_count, avg_value, max_value, p95_value
+                FROM perf_hourly
+                WHERE bucket >= :start_time
+            """
+            params: Dict[str, Any] = {"start_time": start_time}
+            if endpoint:
+                sql += " AND endpoint = :endpoint"
+                params["endpoint"] = endpoint
+            if metric_name:
+                sql += " AND metric_name = :metric_name"
+                params["metric_name"] = metric_name
+            rows = db.execute(text(sql + " ORDER BY bucket DESC"), params).all()
+            
+        except ProgrammingError:
+            # No TimescaleDB: aggregate the raw rows instead
+            db.rollback()
+            bucket = func.date_trunc('hour', PerformanceMetric.timestamp).label('bucket')
+            query = db.query(
+                bucket,
+                PerformanceMetric.metric_name,
+                PerformanceMetric.endpoint,
+                func.count(PerformanceMetric.id).label('sample_count'),
+                func.avg(PerformanceMetric.value).label('avg_value'),
+                func.max(PerformanceMetric.value).label('max_value'),
+                func.percentile_disc(0.95).within_group(PerformanceMetric.value).label('p95_value')
+            ).filter(PerformanceMetric.timestamp >= start_time)
+            
+            if endpoint:
+                query = query.filter(PerformanceMetric.endpoint == endpoint)
+            if metric_name:
+                query = query.filter(PerformanceMetric.metric_name == metric_name)
+            
+            rows = query.group_by(
+                bucket, PerformanceMetric.metric_name, PerformanceMetric.endpoint
+            ).order_by(bucket.desc()).all()
+        
+        return [
+            {
+                "bucket": row.bucket.isoformat(),
+                "metric_name": row.metric_name,
+                "endpoint": row.endpoint,
+                "sample_count": row.sample_count,
+                "avg_value": round(row.avg_value, 2) if row.avg_value is not None else None,
+                "max_value": row.max_value,
+                "p95_value": row.p95_value
+            }
+            for row in rows
+        ]
+    
+    @staticmethod
+    def _describe_event(event: _AuthEvent, event_type: str, email: Optional[str]) -> str:
+        """Format the description of an already classified event"""
+        if event.template is None:
+            return f"Authentication event: {event_type} for {email}"
+        return event.template.format(email)
+    
     @staticmethod
     def _get_event_description(event_type: str, email: Optional[str]) -> str:
         """Get human-readable description for event types"""
-        descriptions = {
-            "login_success": f"Successful login for {email}",
-            "login_failure": f"Failed login attempt for {email}",
-            "register_success": f"New user registration for {email}",
-            "register_failure": f"Failed registration attempt for {email}",
-            "password_reset_request": f"Password reset requested for {email}",
-            "password_reset_success": f"Password successfully reset for {email}",
-            "token_refresh": f"Token refresh for {email}",
-            "logout": f"User logout for {email}",
-            "api_key_created": f"New API key created for {email}",
-            "api_key_deleted": f"API key deleted for {email}",
-            "subscription_created": f"New subscription created for {email}",
-            "subscription_upgraded": f"Subscription upgraded for {email}",
-            "subscription_cancelled": f"Subscription cancelled for {email}"
-        }
-        
-        return descriptions.get(event_type, f"Authentication event: {event_type} for {email}")
\ No newline at end of file
+        event = _EVENT_DISPATCH.get(event_type) or _classify_event(event_type)
+        return AuditService._describe_event(event, event_type, email)
\ No newline at end of file
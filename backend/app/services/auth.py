@@ -1,68 +1,155 @@
+import asyncio
 import bcrypt
+import hashlib
+import hmac
 import jwt
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, select, update, func
 
 from app.models.user import User, UserRole
 from app.models.subscription import Subscription, SubscriptionPlan
 from app.schemas.auth import LoginRequest, RegisterRequest
 from app.core.config import settings
 
+# Recently verified (password digest, bcrypt hash) pairs, most recently used last.
+# Keys are HMACs under a per-process secret, so no password or plain digest of
+# one is kept; a password change produces a new hash and misses the cache.
+PASSWORD_CACHE_SIZE = 1024
+PASSWORD_CACHE_TTL_SECONDS = 300
+_password_cache_secret = secrets.token_bytes(32)
+_password_cache: "OrderedDict[Tuple[bytes, bytes], float]" = OrderedDict()
+_password_cache_lock = threading.Lock()
+
+# Payloads of recently verified JWTs keyed by the full token, most recently
+# used last; entries are dropped once the token's exp claim passes
+TOKEN_CACHE_SIZE = 10_000
+_token_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+# bcrypt releases the GIL while hashing, so a thread pool sized to the cores
+# runs hashes in parallel without blocking the event loop
+_BCRYPT_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
+
 class AuthService:
     @staticmethod
-    def hash_password(password: str) -> str:
+    def hash_password(password: str) -> bytes:
         """Hash a password using bcrypt"""
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
     
     @staticmethod
-    def verify_password(password: str, hashed_password: str) -> bool:
+    def verify_password(password: str, hashed_password: bytes) -> bool:
         """Verify a password against its hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+        password_bytes = password.encode('utf-8')
+        cache_key = (
+            hmac.new(_password_cache_secret, password_bytes, hashlib.sha256).digest(),
+            hashed_password
+        )
+        now = time.monotonic()
+        with _password_cache_lock:
+            expires_at = _password_cache.get(cache_key)
+            if expires_at is not None and expires_at > now:
+                _password_cache.move_to_end(cache_key)
+                return True
+        
+        if not bcrypt.checkpw(password_bytes, hashed_password):
+            return False
+        
+        # Only successful checks are cached; a wrong password always pays for bcrypt
+        with _password_cache_lock:
+            _password_cache[cache_key] = now + PASSWORD_CACHE_TTL_SECONDS
+            _password_cache.move_to_end(cache_key)
+            if len(_password_cache) > PASSWORD_CACHE_SIZE:
+                _password_cache.popitem(last=False)
+        return True
+    
+    @staticmethod
+    async def hash_password_async(password: str) -> bytes:
+        """Hash a password on the bcrypt pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_BCRYPT_POOL, AuthService.hash_password, password)
+    
+    @staticmethod
+    async def verify_password_async(password: str, hashed_password: bytes) -> bool:
+        """Verify a password on the bcrypt pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_BCRYPT_POOL, AuthService.verify_password, password, hashed_password)
     
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """Create a JWT access token"""
         to_encode = data.copy()
+        # exp is a unix timestamp claim, so skip building a datetime for it
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            lifetime_seconds = expires_delta.total_seconds()
         else:
-            expire = datetime.utcnow() + timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
+            lifetime_seconds = settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60
         
-        to_encode.update({"exp": expire})
+        to_encode["exp"] = int(time.time() + lifetime_seconds)
         encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
         return encoded_jwt
     
     @staticmethod
     def verify_token(token: str) -> Optional[dict]:
         """Verify a JWT token and return its payload"""
+        now = time.time()
+        with _token_cache_lock:
+            entry = _token_cache.get(token)
+            if entry is not None:
+                if entry[0] > now:
+                    _token_cache.move_to_end(token)
+                    return entry[1]
+                del _token_cache[token]
+        
         try:
             payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-            return payload
         except jwt.ExpiredSignatureError:
             return None
         except jwt.InvalidTokenError:
             return None
+        
+        # Only tokens that expire are cached, and never past their expiry
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            with _token_cache_lock:
+                _token_cache[token] = (float(exp), payload)
+                _token_cache.move_to_end(token)
+                if len(_token_cache) > TOKEN_CACHE_SIZE:
+                    _token_cache.popitem(last=False)
+        return payload
     
     @staticmethod
-    def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+    async def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
         """Authenticate a user by email and password"""
-        user = db.query(User).filter(User.email == email).first()
-        if not user:
+        credentials = db.execute(
+            select(User.id, User.hashed_password).where(User.email == email)
+        ).first()
+        if not credentials:
             return None
         
-        if not AuthService.verify_password(password, user.hashed_password):
+        if not await AuthService.verify_password_async(password, credentials.hashed_password):
             return None
         
-        # Update last login
-        user.last_login = datetime.utcnow()
+        # Update last login and load the user in the same statement
+        user = db.scalars(
+            update(User)
+            .where(User.id == credentials.id)
+            .values(last_login=func.now())
+            .returning(User)
+        ).one()
         db.commit()
         
         return user
     
     @staticmethod
-    def register_user(db: Session, user_data: RegisterRequest) -> User:
+    async def register_user(db: Session, user_data: RegisterRequest) -> User:
         """Register a new user"""
         # Check if user already exists
         existing_user = db.query(User).filter(User.email == user_data.email).first()
@@ -72,7 +159,7 @@ class AuthService:
         # Create new user
         user = User(
             email=user_data.email,
-            hashed_password=AuthService.hash_password(user_data.password),
+            hashed_password=await AuthService.hash_password_async(user_data.password),
             first_name=user_data.first_name,
             last_name=user_data.last_name,
             company=user_data.company,
@@ -81,16 +168,18 @@ class AuthService:
             role=UserRole.USER
         )
         
+        # Flush so the user row exists for the subscription's foreign key; both
+        # rows commit together, so a failed subscription leaves no orphan user
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        db.flush()
         
         # Create default subscription (free tier)
+        period_start = datetime.utcnow()
         subscription = Subscription(
             user_id=user.id,
             plan=SubscriptionPlan.FREE,
-            current_period_start=datetime.utcnow(),
-            current_period_end=datetime.utcnow() + timedelta(days=30)
+            current_period_start=period_start,
+            current_period_end=period_start + timedelta(days=30)
         )
         
         db.add(subscription)
@@ -1,6 +1,15 @@
+import asyncio
+import threading
+import time
+import orjson
+import redis
 import stripe
-from typing import Optional, Dict, Any, List
-from sqlalchemy.orm import Session
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Callable, Final, List, Mapping, Tuple
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, case, select, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from datetime import datetime, timedelta
 from loguru import logger
 
@@ -8,17 +17,112 @@ from app.core.config import settings
 from app.models.subscription import Subscription, SubscriptionPlan, SubscriptionStatus
 from app.models.invoice import Invoice, InvoiceStatus
 from app.models.user import User
+from app.models.webhook_event import ProcessedWebhookEvent
+from app.schemas.billing import BillingSummaryResponse
 from app.services.subscription import SubscriptionService
 
 # Configure Stripe
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
+# Plan catalogue bound once at import; read-only so no caller can mutate the shared settings
+_PLANS: Final[Mapping[str, Mapping[str, Any]]] = MappingProxyType({
+    key: MappingProxyType(dict(plan)) for key, plan in settings.SUBSCRIPTION_PLANS.items()
+})
+
+
+@lru_cache(maxsize=64)
+def _plan_info(plan_value: str) -> Optional[Mapping[str, Any]]:
+    """Plan details (name, price, stripe_price_id) for a plan value; the one place plans are looked up"""
+    return _PLANS.get(plan_value)
+
+# Stripe SDK calls are blocking HTTP round-trips; the methods that make them
+# are async and run each call in a worker thread so the event loop keeps
+# serving other requests meanwhile.
+
+# Stripe's documented per-account limits are 25 req/s in test mode and 100
+# req/s live; stay under them client-side and back off on any 429 that still
+# gets through.
+STRIPE_REQUESTS_PER_SECOND = 25 if settings.STRIPE_SECRET_KEY.startswith("sk_test") else 100
+STRIPE_MAX_ATTEMPTS = 6
+STRIPE_MAX_BACKOFF_SECONDS = 30
+# Maximum age of a webhook's signed timestamp; each redelivery is signed afresh
+STRIPE_WEBHOOK_TOLERANCE_SECONDS = 300
+
+
+class _StripeRateLimiter:
+    """Token bucket shared by all Stripe calls made from this process"""
+    
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take a token, returning how long to wait before it is available"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+    
+    async def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+_stripe_limiter = _StripeRateLimiter(STRIPE_REQUESTS_PER_SECOND)
+
+# Billing summaries are cached per user as rendered JSON. Writes made through
+# this service invalidate them; changes made elsewhere age out with the TTL.
+BILLING_SUMMARY_CACHE_TTL_SECONDS = 60
+_summary_cache = redis.from_url(settings.REDIS_URL)
+
+
+def _billing_summary_key(user_id: str) -> str:
+    return f"billing_summary:{user_id}"
+
+
+def _invalidate_billing_summary(*user_ids: str):
+    """Drop cached billing summaries; Redis being unavailable only delays the refresh"""
+    if not user_ids:
+        return
+    try:
+        _summary_cache.delete(*(_billing_summary_key(user_id) for user_id in user_ids))
+    except redis.RedisError as e:
+        logger.warning(f"Failed to invalidate billing summary cache: {e}")
+
+
+async def _call_stripe(method: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a Stripe SDK call in a worker thread, rate limited and retried on 429
+    
+    Retries honour Stripe's Retry-After header when present and otherwise
+    back off exponentially; the final RateLimitError is re-raised.
+    """
+    for attempt in range(1, STRIPE_MAX_ATTEMPTS + 1):
+        await _stripe_limiter.acquire()
+        try:
+            return await asyncio.to_thread(method, *args, **kwargs)
+        except stripe.error.RateLimitError as e:
+            if attempt == STRIPE_MAX_ATTEMPTS:
+                raise
+            retry_after = (e.headers or {}).get("Retry-After")
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = min(2 ** (attempt - 1), STRIPE_MAX_BACKOFF_SECONDS)
+            logger.warning(f"Stripe rate limit hit, retrying in {delay:.1f}s (attempt {attempt})")
+            await asyncio.sleep(delay)
+
 class BillingService:
     @staticmethod
-    def create_stripe_customer(user: User) -> Optional[stripe.Customer]:
+    async def create_stripe_customer(user: User) -> Optional[stripe.Customer]:
         """Create a Stripe customer for a user"""
         try:
-            customer = stripe.Customer.create(
+            customer = await _call_stripe(
+                stripe.Customer.create,
                 email=user.email,
                 name=f"{user.first_name} {user.last_name}".strip(),
                 metadata={
@@ -32,23 +136,30 @@ class BillingService:
             return None
     
     @staticmethod
-    def create_subscription(db: Session, user_id: str, plan: SubscriptionPlan) -> Optional[Dict[str, Any]]:
+    async def create_subscription(db: Session, user_id: str, plan: SubscriptionPlan) -> Optional[Dict[str, Any]]:
         """Create a new subscription with Stripe"""
         try:
             user = db.query(User).filter(User.id == user_id).first()
             if not user:
                 return None
             
-            # Create or get Stripe customer
-            customer = BillingService.create_stripe_customer(user)
-            if not customer:
-                return None
+            # Reuse the user's Stripe customer; only the first subscription creates one
+            customer_id = user.stripe_customer_id
+            if not customer_id:
+                customer = await BillingService.create_stripe_customer(user)
+                if not customer:
+                    return None
+                customer_id = customer.id
+                # Persist now so a failure below doesn't orphan the new customer
+                user.stripe_customer_id = customer_id
+                db.commit()
             
             # Get plan info
-            plan_info = settings.SUBSCRIPTION_PLANS.get(plan.value)
+            plan_info = _plan_info(plan.value)
             if not plan_info or plan.value == "free":
                 # Handle free plan
                 subscription = SubscriptionService.create_subscription(db, user_id, plan)
+                _invalidate_billing_summary(user_id)
                 return {
                     "subscription": subscription,
                     "checkout_url": None,
@@ -56,8 +167,9 @@ class BillingService:
                 }
             
             # Create Stripe subscription
-            stripe_subscription = stripe.Subscription.create(
-                customer=customer.id,
+            stripe_subscription = await _call_stripe(
+                stripe.Subscription.create,
+                customer=customer_id,
                 items=[{
                     'price': plan_info["stripe_price_id"],
                 }],
@@ -73,7 +185,7 @@ class BillingService:
                 plan=plan,
                 status=SubscriptionStatus.ACTIVE,
                 stripe_subscription_id=stripe_subscription.id,
-                stripe_customer_id=customer.id,
+                stripe_customer_id=customer_id,
                 stripe_price_id=plan_info["stripe_price_id"],
                 current_period_start=datetime.fromtimestamp(stripe_subscription.current_period_start),
                 current_period_end=datetime.fromtimestamp(stripe_subscription.current_period_end)
@@ -82,6 +194,7 @@ class BillingService:
             db.add(subscription)
             db.commit()
             db.refresh(subscription)
+            _invalidate_billing_summary(user_id)
             
             return {
                 "subscription": subscription,
@@ -94,19 +207,20 @@ class BillingService:
             return None
     
     @staticmethod
-    def create_checkout_session(db: Session, user_id: str, plan: SubscriptionPlan) -> Optional[str]:
+    async def create_checkout_session(db: Session, user_id: str, plan: SubscriptionPlan) -> Optional[str]:
         """Create a Stripe checkout session for subscription"""
         try:
             user = db.query(User).filter(User.id == user_id).first()
             if not user:
                 return None
             
-            plan_info = settings.SUBSCRIPTION_PLANS.get(plan.value)
+            plan_info = _plan_info(plan.value)
             if not plan_info or plan.value == "free":
                 return None
             
             # Create checkout session
-            session = stripe.checkout.Session.create(
+            session = await _call_stripe(
+                stripe.checkout.Session.create,
                 customer_email=user.email,
                 payment_method_types=['card'],
                 line_items=[{
@@ -129,7 +243,7 @@ class BillingService:
             return None
     
     @staticmethod
-    def cancel_subscription(db: Session, subscription_id: str) -> Optional[Subscription]:
+    async def cancel_subscription(db: Session, subscription_id: str) -> Optional[Subscription]:
         """Cancel a subscription"""
         try:
             subscription = db.query(Subscription).filter(Subscription.id == subscription_id).first()
@@ -138,7 +252,8 @@ class BillingService:
             
             # Cancel in Stripe if it exists
             if subscription.stripe_subscription_id:
-                stripe.Subscription.modify(
+                await _call_stripe(
+                    stripe.Subscription.modify,
                     subscription.stripe_subscription_id,
                     cancel_at_period_end=True
                 )
@@ -149,6 +264,7 @@ class BillingService:
             
             db.commit()
             db.refresh(subscription)
+            _invalidate_billing_summary(subscription.user_id)
             
             return subscription
             
@@ -158,26 +274,126 @@ class BillingService:
     
     @staticmethod
     def handle_webhook(payload: bytes, signature: str) -> Optional[Dict[str, Any]]:
-        """Handle Stripe webhook events"""
+        """Verify a Stripe webhook and return its id, type and data for processing
+        
+        The signature (constant-time HMAC compare, signed timestamp within
+        STRIPE_WEBHOOK_TOLERANCE_SECONDS) is checked by the SDK; the payload is
+        then parsed once into plain dicts instead of StripeObjects, which is
+        also what the Celery task serializes.
+        """
         try:
-            event = stripe.Webhook.construct_event(
-                payload, signature, settings.STRIPE_WEBHOOK_SECRET
+            stripe.WebhookSignature.verify_header(
+                payload.decode("utf-8"), signature, settings.STRIPE_WEBHOOK_SECRET,
+                tolerance=STRIPE_WEBHOOK_TOLERANCE_SECONDS
             )
+            event = orjson.loads(payload)
             
             logger.info(f"Received Stripe webhook: {event['type']}")
             
             return {
+                "event_id": event['id'],
                 "event_type": event['type'],
                 "data": event['data']
             }
             
-        except ValueError as e:
+        except (ValueError, KeyError, TypeError) as e:
             logger.error(f"Invalid payload: {e}")
             return None
         except stripe.error.SignatureVerificationError as e:
             logger.error(f"Invalid signature: {e}")
             return None
     
+    @staticmethod
+    def process_webhook_event(db: Session, event_id: str, event_type: str, data: Dict[str, Any]):
+        """Apply a verified Stripe event; runs on the worker via process_stripe_event"""
+        BillingService.process_events_batch(db, [(event_id, event_type, data)])
+    
+    @staticmethod
+    def process_events_batch(db: Session, events: List[Tuple[str, str, Dict[str, Any]]]):
+        """Apply verified Stripe events as (event_id, event_type, data) in one transaction
+        
+        Event ids are recorded in the same transaction as the events' side
+        effects, so redelivered events are skipped while a failed attempt
+        rolls back its markers and can be retried. Subscriptions referenced by
+        the batch are loaded with a single IN query.
+        """
+        claimed_events = []
+        for event_id, event_type, data in events:
+            claimed = db.execute(
+                pg_insert(ProcessedWebhookEvent)
+                .values(event_id=event_id, event_type=event_type)
+                .on_conflict_do_nothing(index_elements=["event_id"])
+            )
+            if claimed.rowcount == 0:
+                logger.info(f"Skipping already processed Stripe webhook {event_id}: {event_type}")
+                continue
+            claimed_events.append((event_id, event_type, data))
+        
+        if not claimed_events:
+            db.rollback()
+            return
+        
+        stripe_ids = {
+            stripe_id
+            for _, event_type, data in claimed_events
+            if (stripe_id := BillingService._stripe_subscription_id(event_type, data))
+        }
+        subscriptions: Dict[str, Subscription] = {}
+        if stripe_ids:
+            subscriptions = {
+                subscription.stripe_subscription_id: subscription
+                for subscription in db.query(Subscription).filter(
+                    Subscription.stripe_subscription_id.in_(stripe_ids)
+                )
+            }
+        
+        for event_id, event_type, data in claimed_events:
+            subscription = subscriptions.get(BillingService._stripe_subscription_id(event_type, data))
+            BillingService._apply_webhook_event(db, event_type, data, subscription)
+        
+        db.commit()
+        _invalidate_billing_summary(*{subscription.user_id for subscription in subscriptions.values()})
+        for event_id, event_type, _ in claimed_events:
+            logger.info(f"Processed Stripe webhook {event_id}: {event_type}")
+    
+    @staticmethod
+    def _stripe_subscription_id(event_type: str, data: Dict[str, Any]) -> Optional[str]:
+        """Stripe subscription id an event refers to, if any"""
+        obj = data.get("object") or {}
+        if event_type.startswith("customer.subscription."):
+            return obj.get("id")
+        if event_type.startswith("invoice."):
+            return obj.get("subscription")
+        return None
+    
+    @staticmethod
+    def _apply_webhook_event(
+        db: Session,
+        event_type: str,
+        data: Dict[str, Any],
+        subscription: Optional[Subscription]
+    ):
+        """Apply one event's side effects; subscription is the local row it refers to, if any"""
+        if event_type == "customer.subscription.created":
+            if subscription is not None:
+                # create_subscription already wrote this row when it called Stripe
+                logger.info(f"Subscription {subscription.stripe_subscription_id} already exists, ignoring created event")
+                return
+            # Handle subscription creation
+            pass
+        elif event_type == "customer.subscription.updated":
+            # Handle subscription updates
+            pass
+        elif event_type == "customer.subscription.deleted":
+            # Handle subscription cancellation
+            pass
+        elif event_type == "invoice.payment_succeeded":
+            # Handle successful payment
+            pass
+        elif event_type == "invoice.payment_failed":
+            # Handle failed payment
+            pass
+    
     @staticmethod
     def generate_invoice(db: Session, subscription_id: str, period_start: datetime, period_end: datetime) -> Optional[Invoice]:
         """Generate an invoice for a subscription period"""
@@ -187,24 +403,20 @@ class BillingService:
                 return None
             
             # Calculate usage and costs
-            plan_info = settings.SUBSCRIPTION_PLANS.get(subscription.plan.value)
+            plan_info = _plan_info(subscription.plan.value)
             if not plan_info:
                 return None
             
-            # Generate invoice number
-            invoice_number = f"INV-{datetime.now().strftime('%Y%m%d')}-{subscription.user_id[:8]}"
-            
-            # Create invoice
+            # Create invoice; invoice_number is assigned from invoice_number_seq on insert
             invoice = Invoice(
                 user_id=subscription.user_id,
                 subscription_id=subscription_id,
-                invoice_number=invoice_number,
                 status=InvoiceStatus.OPEN,
                 subtotal=plan_info["price"],
                 total=plan_info["price"],
                 amount_due=plan_info["price"],
-                invoice_date=datetime.utcnow(),
-                due_date=datetime.utcnow() + timedelta(days=30),
+                # invoice_date defaults to the database's now(); due 30 days after it
+                due_date=func.now() + timedelta(days=30),
                 period_start=period_start,
                 period_end=period_end,
                 line_items=[
@@ -220,6 +432,7 @@ class BillingService:
             db.add(invoice)
             db.commit()
             db.refresh(invoice)
+            _invalidate_billing_summary(invoice.user_id)
             
             return invoice
             
@@ -227,6 +440,64 @@ class BillingService:
             logger.error(f"Failed to generate invoice: {e}")
             return None
     
+    @staticmethod
+    def generate_invoices_bulk(db: Session, specs: List[Tuple[str, datetime, datetime]]) -> int:
+        """Generate invoices for many (subscription_id, period_start, period_end) at once
+        
+        Same invoices as generate_invoice, written with one bulk INSERT and one
+        commit; subscriptions without a known plan are skipped. Returns the
+        number of invoices created.
+        """
+        if not specs:
+            return 0
+        try:
+            subscriptions = {
+                row.id: row
+                for row in db.query(Subscription.id, Subscription.user_id, Subscription.plan).filter(
+                    Subscription.id.in_({subscription_id for subscription_id, _, _ in specs})
+                )
+            }
+            
+            # invoice_date defaults to the database's now(); bulk rows need a literal due date
+            due_date = datetime.utcnow() + timedelta(days=30)
+            rows = []
+            for subscription_id, period_start, period_end in specs:
+                subscription = subscriptions.get(subscription_id)
+                plan_info = _plan_info(subscription.plan.value) if subscription else None
+                if not plan_info:
+                    continue
+                # invoice_number comes from invoice_number_seq as each row is inserted
+                rows.append({
+                    "user_id": subscription.user_id,
+                    "subscription_id": subscription_id,
+                    "status": InvoiceStatus.OPEN,
+                    "subtotal": plan_info["price"],
+                    "total": plan_info["price"],
+                    "amount_due": plan_info["price"],
+                    "due_date": due_date,
+                    "period_start": period_start,
+                    "period_end": period_end,
+                    "line_items": [
+                        {
+                            "description": f"{plan_info['name']} Plan",
+                            "quantity": 1,
+                            "unit_price": plan_info["price"],
+                            "total": plan_info["price"]
+                        }
+                    ]
+                })
+            
+            if rows:
+                db.bulk_insert_mappings(Invoice, rows)
+                db.commit()
+                _invalidate_billing_summary(*{row["user_id"] for row in rows})
+            return len(rows)
+            
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to generate {len(specs)} invoices: {e}")
+            return 0
+    
     @staticmethod
     def get_user_invoices(db: Session, user_id: str) -> List[Invoice]:
         """Get all invoices for a user"""
@@ -245,73 +516,80 @@ class BillingService:
             return None
         
         invoice.status = InvoiceStatus.PAID
-        invoice.paid_at = datetime.utcnow()
+        invoice.paid_at = func.now()
         invoice.amount_paid = invoice.total
         invoice.amount_due = 0
         
         db.commit()
         db.refresh(invoice)
+        _invalidate_billing_summary(invoice.user_id)
         
         return invoice
     
     @staticmethod
-    def get_billing_summary(db: Session, user_id: str) -> Dict[str, Any]:
+    def get_billing_summary(db: Session, user_id: str) -> BillingSummaryResponse:
         """Get billing summary for a user"""
-        # Get current subscription
-        subscription = db.query(Subscription).filter(
-            Subscription.user_id == user_id,
+        # Current subscription, recent invoices and account-wide invoice totals
+        # in one round trip: all are LATERAL subqueries off the user's row,
+        # outer-joined so the subscription and invoices may be empty
+        active_subscription = select(Subscription).where(
+            Subscription.user_id == User.id,
             Subscription.status == SubscriptionStatus.ACTIVE
-        ).first()
-        
-        # Get recent invoices
-        invoices = db.query(Invoice).filter(
-            Invoice.user_id == user_id
-        ).order_by(Invoice.created_at.desc()).limit(5).all()
-        
-        # Calculate total paid
-        total_paid = sum(inv.amount_paid or 0 for inv in invoices)
+        ).limit(1).lateral()
+        recent_invoices = select(Invoice).where(
+            Invoice.user_id == User.id
+        ).order_by(Invoice.created_at.desc()).limit(5).lateral()
+        invoice_totals = select(
+            func.coalesce(func.sum(Invoice.amount_paid), 0).label("total_paid"),
+            func.coalesce(func.sum(
+                case((Invoice.status == InvoiceStatus.OPEN, Invoice.amount_due), else_=0)
+            ), 0).label("outstanding_balance")
+        ).where(Invoice.user_id == User.id).lateral()
+        subscription_row = aliased(Subscription, active_subscription)
+        invoice_row = aliased(Invoice, recent_invoices)
         
-        # Get outstanding balance
-        outstanding_balance = sum(inv.amount_due or 0 for inv in invoices if inv.status == InvoiceStatus.OPEN)
-        
-        # Convert subscription to dict if it exists
-        subscription_dict = None
-        if subscription:
-            subscription_dict = {
-                "id": subscription.id,
-                "user_id": subscription.user_id,
-                "plan": subscription.plan.value if subscription.plan else None,
-                "status": subscription.status.value if subscription.status else None,
-                "current_period_start": subscription.current_period_start.isoformat() if subscription.current_period_start else None,
-                "current_period_end": subscription.current_period_end.isoformat() if subscription.current_period_end else None,
-                "created_at": subscription.created_at.isoformat() if subscription.created_at else None
-            }
+        rows = db.execute(
+            select(
+                subscription_row, invoice_row,
+                invoice_totals.c.total_paid, invoice_totals.c.outstanding_balance
+            )
+            .select_from(User)
+            .outerjoin(active_subscription, true())
+            .outerjoin(recent_invoices, true())
+            .join(invoice_totals, true())
+            .where(User.id == user_id)
+            .order_by(invoice_row.created_at.desc())
+        ).all()
+        subscription = rows[0][0] if rows else None
+        invoices = [row[1] for row in rows if row[1] is not None]
+        total_paid, outstanding_balance = (rows[0][2], rows[0][3]) if rows else (0, 0)
         
-        # Convert invoices to list of dicts
-        invoices_list = []
-        for inv in invoices:
-            invoices_list.append({
-                "id": inv.id,
-                "user_id": inv.user_id,
-                "invoice_number": inv.invoice_number,
-                "status": inv.status.value if inv.status else None,
-                "subtotal": float(inv.subtotal or 0),
-                "total": float(inv.total or 0),
-                "amount_due": float(inv.amount_due or 0),
-                "amount_paid": float(inv.amount_paid or 0),
-                "invoice_date": inv.invoice_date.isoformat() if inv.invoice_date else None,
-                "due_date": inv.due_date.isoformat() if inv.due_date else None,
-                "paid_at": inv.paid_at.isoformat() if inv.paid_at else None,
-                "created_at": inv.created_at.isoformat() if inv.created_at else None
-            })
+        return BillingSummaryResponse.model_validate({
+            "current_subscription": subscription,
+            "recent_invoices": invoices,
+            "total_paid": total_paid,
+            "outstanding_balance": outstanding_balance,
+            "next_billing_date": subscription.current_period_end if subscription else None
+        }, from_attributes=True)
+    
+    @staticmethod
+    def get_billing_summary_json(db: Session, user_id: str) -> bytes:
+        """Billing summary rendered as JSON, served from Redis when cached"""
+        key = _billing_summary_key(user_id)
+        try:
+            cached = _summary_cache.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read billing summary cache: {e}")
+            cached = None
+        if cached is not None:
+            return cached
         
-        return {
-            "current_subscription": subscription_dict,
-            "recent_invoices": invoices_list,
-            "total_paid": float(total_paid),
-            "outstanding_balance": float(outstanding_balance),
-            "next_billing_date": subscription.current_period_end.isoformat() if subscription and subscription.current_period_end else None
-        }
+        body = BillingService.get_billing_summary(db, user_id).model_dump_json().encode()
+        try:
+            _summary_cache.setex(key, BILLING_SUMMARY_CACHE_TTL_SECONDS, body)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to write billing summary cache: {e}")
+        return body
     
     @staticmethod
     def get_revenue_stats(db: Session, days: int = 30) -> Dict[str, Any]:
@@ -319,18 +597,19 @@ class BillingService:
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days)
         
-        # Get invoices in period
-        invoices = db.query(Invoice).filter(
+        # Totals for the period in one aggregate scan instead of loading every invoice
+        total_revenue, total_outstanding, total_invoices = db.query(
+            func.coalesce(func.sum(Invoice.amount_paid), 0),
+            func.coalesce(func.sum(
+                case((Invoice.status == InvoiceStatus.OPEN, Invoice.amount_due), else_=0)
+            ), 0),
+            func.count(Invoice.id)
+        ).filter(
             Invoice.created_at >= start_date,
             Invoice.created_at <= end_date
-        ).all()
-        
-        # Calculate stats
-        total_revenue = sum(inv.amount_paid for inv in invoices)
-        total_outstanding = sum(inv.amount_due for inv in invoices if inv.status == InvoiceStatus.OPEN)
+        ).one()
         
         # Revenue by plan
-        from sqlalchemy import func
         plan_revenue = db.query(
             Subscription.plan,
             func.sum(Invoice.amount_paid).label('revenue')
@@ -343,7 +622,7 @@ class BillingService:
             "period_days": days,
             "total_revenue": total_revenue,
             "total_outstanding": total_outstanding,
-            "total_invoices": len(invoices),
+            "total_invoices": total_invoices,
             "plan_revenue": [
                 {"plan": stat.plan.value, "revenue": float(stat.revenue or 0)}
                 for stat in plan_revenue
@@ -1,12 +1,250 @@
+import asyncio
+import queue
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from loguru import logger
 from jinja2 import Template
 
 from app.core.config import settings
 
+
+class _SplitTemplate:
+    """Template with a single variable, rendered once at import around a marker
+    
+    Sends only join the fixed parts around the value. Equivalent to rendering
+    the template each time since these templates don't autoescape.
+    """
+    
+    _MARKER = "\x00"
+    
+    def __init__(self, source: str, variable: str):
+        self.variable = variable
+        self.parts = Template(source).render({variable: self._MARKER}).split(self._MARKER)
+    
+    def render(self, **context: Any) -> str:
+        return str(context[self.variable]).join(self.parts)
+
+
+# Templates are compiled once at import; sends only render them. The ones with
+# a single variable are pre-rendered down to their static parts.
+_WELCOME_TEMPLATE = _SplitTemplate("""
+<html>
+<head></head>
+<body>
+    <h2>Welcome to SKYCASTER, {{ user_name }}!</h2>
+    <p>Thank you for signing up for our Weather API service.</p>
+
+    <h3>Getting Started:</h3>
+    <ol>
+        <li>Verify your email address</li>
+        <li>Generate your API key</li>
+        <li>Start making weather API calls</li>
+    </ol>
+
+    <h3>Your Free Plan Includes:</h3>
+    <ul>
+        <li>5,000 API calls per month</li>
+        <li>60 requests per minute</li>
+        <li>Access to all weather endpoints</li>
+        <li>Community support</li>
+    </ul>
+
+    <p>Visit our documentation at <a href="https://docs.skycaster.com">docs.skycaster.com</a> to get started.</p>
+
+    <p>Best regards,<br>The SKYCASTER Team</p>
+</body>
+</html>
+""", "user_name")
+
+_PASSWORD_RESET_TEMPLATE = _SplitTemplate("""
+<html>
+<head></head>
+<body>
+    <h2>Password Reset Request</h2>
+    <p>You requested to reset your password for your SKYCASTER account.</p>
+
+    <p>Click the link below to reset your password:</p>
+    <p><a href="https://skycaster.com/reset-password?token={{ reset_token }}">Reset Password</a></p>
+
+    <p>This link will expire in 1 hour.</p>
+
+    <p>If you didn't request this, please ignore this email.</p>
+
+    <p>Best regards,<br>The SKYCASTER Team</p>
+</body>
+</html>
+""", "reset_token")
+
+_EMAIL_VERIFICATION_TEMPLATE = _SplitTemplate("""
+<html>
+<head></head>
+<body>
+    <h2>Verify Your Email Address</h2>
+    <p>Please verify your email address to complete your SKYCASTER registration.</p>
+
+    <p>Click the link below to verify your email:</p>
+    <p><a href="https://skycaster.com/verify-email?token={{ verification_token }}">Verify Email</a></p>
+
+    <p>This link will expire in 24 hours.</p>
+
+    <p>If you didn't create this account, please ignore this email.</p>
+
+    <p>Best regards,<br>The SKYCASTER Team</p>
+</body>
+</html>
+""", "verification_token")
+
+_USAGE_ALERT_TEMPLATE = Template("""
+<html>
+<head></head>
+<body>
+    <h2>Usage Alert</h2>
+    <p>Hi {{ user_name }},</p>
+
+    <p>You have used {{ usage_percent }}% of your monthly API quota on your {{ plan_name }} plan.</p>
+
+    <p>To avoid service interruption, consider:</p>
+    <ul>
+        <li>Optimizing your API usage</li>
+        <li>Upgrading to a higher plan</li>
+        <li>Implementing caching</li>
+    </ul>
+
+    <p>Visit your dashboard to monitor usage and manage your plan.</p>
+
+    <p>Best regards,<br>The SKYCASTER Team</p>
+</body>
+</html>
+""")
+
+_INVOICE_TEMPLATE = Template("""
+<html>
+<head></head>
+<body>
+    <h2>Invoice {{ invoice_number }}</h2>
+    <p>Hi {{ user_name }},</p>
+
+    <p>Your invoice for SKYCASTER services is ready.</p>
+
+    <p><strong>Amount: ${{ amount }}</strong></p>
+
+    <p>You can view and pay your invoice in your dashboard.</p>
+
+    <p>Thank you for using SKYCASTER!</p>
+
+    <p>Best regards,<br>The SKYCASTER Team</p>
+</body>
+</html>
+""")
+
+_SUBSCRIPTION_CANCELLED_TEMPLATE = Template("""
+<html>
+<head></head>
+<body>
+    <h2>Subscription Cancelled</h2>
+    <p>Hi {{ user_name }},</p>
+
+    <p>Your {{ plan_name }} subscription has been cancelled.</p>
+
+    <p>You'll continue to have access until the end of your current billing period.</p>
+
+    <p>We're sorry to see you go. If you change your mind, you can reactivate your subscription at any time.</p>
+
+    <p>Best regards,<br>The SKYCASTER Team</p>
+</body>
+</html>
+""")
+
+SMTP_TIMEOUT_SECONDS = 30
+SMTP_SEND_ATTEMPTS = 3
+SMTP_RETRY_BACKOFF_SECONDS = 0.5
+# Sessions kept open per process; also the number of concurrent bulk sends
+SMTP_POOL_SIZE = 10
+
+
+class SmtpConnection:
+    """Authenticated SMTP_SSL session reused across sends in this process
+    
+    Connects lazily, sends one message at a time under a lock, and reconnects
+    with exponential backoff when the server has dropped the session.
+    """
+    
+    def __init__(self):
+        self._server: Optional[smtplib.SMTP_SSL] = None
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> smtplib.SMTP_SSL:
+        server = smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT, timeout=SMTP_TIMEOUT_SECONDS)
+        try:
+            server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def _discard(self):
+        if self._server is not None:
+            try:
+                self._server.close()
+            except Exception:
+                pass
+            self._server = None
+    
+    def send_message(self, msg: MIMEMultipart):
+        with self._lock:
+            for attempt in range(SMTP_SEND_ATTEMPTS):
+                try:
+                    if self._server is None:
+                        self._server = self._connect()
+                    self._server.send_message(msg)
+                    return
+                except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError):
+                    # Idle sessions get closed server-side; anything else
+                    # (e.g. a refused recipient) is not retried
+                    self._discard()
+                    if attempt == SMTP_SEND_ATTEMPTS - 1:
+                        raise
+                    time.sleep(SMTP_RETRY_BACKOFF_SECONDS * 2 ** attempt)
+    
+    def close(self):
+        with self._lock:
+            if self._server is not None:
+                try:
+                    self._server.quit()
+                except Exception:
+                    pass
+                self._discard()
+
+
+class SmtpConnectionPool:
+    """Fixed set of SmtpConnection sessions; each send checks one out"""
+    
+    def __init__(self, size: int):
+        self._connections = [SmtpConnection() for _ in range(size)]
+        # LIFO so a lightly loaded process keeps reusing its warmest session
+        self._idle: "queue.LifoQueue[SmtpConnection]" = queue.LifoQueue()
+        for connection in self._connections:
+            self._idle.put(connection)
+    
+    def send_message(self, msg: MIMEMultipart):
+        connection = self._idle.get()
+        try:
+            connection.send_message(msg)
+        finally:
+            self._idle.put(connection)
+    
+    def close(self):
+        for connection in self._connections:
+            connection.close()
+
+
+smtp_connection = SmtpConnectionPool(SMTP_POOL_SIZE)
+
+
 class EmailService:
     @staticmethod
     def send_email(
@@ -32,10 +270,8 @@ class EmailService:
             html_part = MIMEText(html_content, 'html')
             msg.attach(html_part)
             
-            # Send email
-            with smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-                server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
-                server.send_message(msg)
+            # Send email over the shared session
+            smtp_connection.send_message(msg)
             
             logger.info(f"Email sent successfully to {to_email}")
             return True
@@ -45,7 +281,42 @@ class EmailService:
             return False
     
     @staticmethod
-    def send_support_ticket_notification(
+    async def queue_email(
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None
+    ) -> bool:
+        """Hand an email to the Celery worker, which sends it with retries
+        
+        Returns once the job is queued, so request handlers don't wait on SMTP;
+        the broker publish itself runs off the event loop.
+        """
+        from app.worker import send_email_task
+        
+        try:
+            await asyncio.to_thread(send_email_task.delay, to_email, subject, html_content, text_content)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to queue email to {to_email}: {e}")
+            return False
+    
+    @staticmethod
+    async def send_bulk(messages: List[Dict[str, Any]]) -> List[bool]:
+        """Send many emails concurrently, one per pooled SMTP session at a time
+        
+        Each message is a dict of send_email keyword arguments.
+        """
+        semaphore = asyncio.Semaphore(SMTP_POOL_SIZE)
+        
+        async def send_one(message: Dict[str, Any]) -> bool:
+            async with semaphore:
+                return await asyncio.to_thread(EmailService.send_email, **message)
+        
+        return await asyncio.gather(*(send_one(message) for message in messages))
+    
+    @staticmethod
+    async def send_support_ticket_notification(
         user_email: str,
         user_name: str,
         ticket_id: str,
@@ -87,7 +358,7 @@ class EmailService:
         """
         
         # Send to support team (admin email)
-        return EmailService.send_email(
+        return await EmailService.queue_email(
             to_email=settings.ADMIN_EMAIL,
             subject=subject,
             html_content=html_content,
@@ -95,200 +366,66 @@ class EmailService:
         )
 
     @staticmethod
-    def send_welcome_email(user_email: str, user_name: str) -> bool:
+    async def send_welcome_email(user_email: str, user_name: str) -> bool:
         """Send welcome email to new user"""
         subject = "Welcome to SKYCASTER Weather API!"
         
-        html_template = """
-        <html>
-        <head></head>
-        <body>
-            <h2>Welcome to SKYCASTER, {{ user_name }}!</h2>
-            <p>Thank you for signing up for our Weather API service.</p>
-            
-            <h3>Getting Started:</h3>
-            <ol>
-                <li>Verify your email address</li>
-                <li>Generate your API key</li>
-                <li>Start making weather API calls</li>
-            </ol>
-            
-            <h3>Your Free Plan Includes:</h3>
-            <ul>
-                <li>5,000 API calls per month</li>
-                <li>60 requests per minute</li>
-                <li>Access to all weather endpoints</li>
-                <li>Community support</li>
-            </ul>
-            
-            <p>Visit our documentation at <a href="https://docs.skycaster.com">docs.skycaster.com</a> to get started.</p>
-            
-            <p>Best regards,<br>The SKYCASTER Team</p>
-        </body>
-        </html>
-        """
-        
-        template = Template(html_template)
-        html_content = template.render(user_name=user_name)
+        html_content = _WELCOME_TEMPLATE.render(user_name=user_name)
         
-        return EmailService.send_email(user_email, subject, html_content)
+        return await EmailService.queue_email(user_email, subject, html_content)
     
     @staticmethod
-    def send_password_reset_email(user_email: str, reset_token: str) -> bool:
+    async def send_password_reset_email(user_email: str, reset_token: str) -> bool:
         """Send password reset email"""
         subject = "Reset Your SKYCASTER Password"
         
-        html_template = """
-        <html>
-        <head></head>
-        <body>
-            <h2>Password Reset Request</h2>
-            <p>You requested to reset your password for your SKYCASTER account.</p>
-            
-            <p>Click the link below to reset your password:</p>
-            <p><a href="https://skycaster.com/reset-password?token={{ reset_token }}">Reset Password</a></p>
-            
-            <p>This link will expire in 1 hour.</p>
-            
-            <p>If you didn't request this, please ignore this email.</p>
-            
-            <p>Best regards,<br>The SKYCASTER Team</p>
-        </body>
-        </html>
-        """
-        
-        template = Template(html_template)
-        html_content = template.render(reset_token=reset_token)
+        html_content = _PASSWORD_RESET_TEMPLATE.render(reset_token=reset_token)
         
-        return EmailService.send_email(user_email, subject, html_content)
+        return await EmailService.queue_email(user_email, subject, html_content)
     
     @staticmethod
-    def send_email_verification(user_email: str, verification_token: str) -> bool:
+    async def send_email_verification(user_email: str, verification_token: str) -> bool:
         """Send email verification"""
         subject = "Verify Your SKYCASTER Email"
         
-        html_template = """
-        <html>
-        <head></head>
-        <body>
-            <h2>Verify Your Email Address</h2>
-            <p>Please verify your email address to complete your SKYCASTER registration.</p>
-            
-            <p>Click the link below to verify your email:</p>
-            <p><a href="https://skycaster.com/verify-email?token={{ verification_token }}">Verify Email</a></p>
-            
-            <p>This link will expire in 24 hours.</p>
-            
-            <p>If you didn't create this account, please ignore this email.</p>
-            
-            <p>Best regards,<br>The SKYCASTER Team</p>
-        </body>
-        </html>
-        """
-        
-        template = Template(html_template)
-        html_content = template.render(verification_token=verification_token)
+        html_content = _EMAIL_VERIFICATION_TEMPLATE.render(verification_token=verification_token)
         
-        return EmailService.send_email(user_email, subject, html_content)
+        return await EmailService.queue_email(user_email, subject, html_content)
     
     @staticmethod
-    def send_usage_alert(user_email: str, user_name: str, usage_percent: float, plan_name: str) -> bool:
+    async def send_usage_alert(user_email: str, user_name: str, usage_percent: float, plan_name: str) -> bool:
         """Send usage alert email"""
         subject = f"SKYCASTER Usage Alert - {usage_percent}% of quota used"
         
-        html_template = """
-        <html>
-        <head></head>
-        <body>
-            <h2>Usage Alert</h2>
-            <p>Hi {{ user_name }},</p>
-            
-            <p>You have used {{ usage_percent }}% of your monthly API quota on your {{ plan_name }} plan.</p>
-            
-            <p>To avoid service interruption, consider:</p>
-            <ul>
-                <li>Optimizing your API usage</li>
-                <li>Upgrading to a higher plan</li>
-                <li>Implementing caching</li>
-            </ul>
-            
-            <p>Visit your dashboard to monitor usage and manage your plan.</p>
-            
-            <p>Best regards,<br>The SKYCASTER Team</p>
-        </body>
-        </html>
-        """
-        
-        template = Template(html_template)
-        html_content = template.render(
+        html_content = _USAGE_ALERT_TEMPLATE.render(
             user_name=user_name,
             usage_percent=usage_percent,
             plan_name=plan_name
         )
         
-        return EmailService.send_email(user_email, subject, html_content)
+        return await EmailService.queue_email(user_email, subject, html_content)
     
     @staticmethod
-    def send_invoice_email(user_email: str, user_name: str, invoice_number: str, amount: float) -> bool:
+    async def send_invoice_email(user_email: str, user_name: str, invoice_number: str, amount: float) -> bool:
         """Send invoice email"""
         subject = f"Invoice {invoice_number} - SKYCASTER"
         
-        html_template = """
-        <html>
-        <head></head>
-        <body>
-            <h2>Invoice {{ invoice_number }}</h2>
-            <p>Hi {{ user_name }},</p>
-            
-            <p>Your invoice for SKYCASTER services is ready.</p>
-            
-            <p><strong>Amount: ${{ amount }}</strong></p>
-            
-            <p>You can view and pay your invoice in your dashboard.</p>
-            
-            <p>Thank you for using SKYCASTER!</p>
-            
-            <p>Best regards,<br>The SKYCASTER Team</p>
-        </body>
-        </html>
-        """
-        
-        template = Template(html_template)
-        html_content = template.render(
+        html_content = _INVOICE_TEMPLATE.render(
             user_name=user_name,
             invoice_number=invoice_number,
             amount=amount
         )
         
-        return EmailService.send_email(user_email, subject, html_content)
+        return await EmailService.queue_email(user_email, subject, html_content)
     
     @staticmethod
-    def send_subscription_cancelled_email(user_email: str, user_name: str, plan_name: str) -> bool:
+    async def send_subscription_cancelled_email(user_email: str, user_name: str, plan_name: str) -> bool:
         """Send subscription cancelled email"""
         subject = "Subscription Cancelled - SKYCASTER"
         
-        html_template = """
-        <html>
-        <head></head>
-        <body>
-            <h2>Subscription Cancelled</h2>
-            <p>Hi {{ user_name }},</p>
-            
-            <p>Your {{ plan_name }} subscription has been cancelled.</p>
-            
-            <p>You'll continue to have access until the end of your current billing period.</p>
-            
-            <p>We're sorry to see you go. If you change your mind, you can reactivate your subscription at any time.</p>
-            
-            <p>Best regards,<br>The SKYCASTER Team</p>
-        </body>
-        </html>
-        """
-        
-        template = Template(html_template)
-        html_content = template.render(
+        html_content = _SUBSCRIPTION_CANCELLED_TEMPLATE.render(
             user_name=user_name,
             plan_name=plan_name
         )
         
-        return EmailService.send_email(user_email, subject, html_content)
\ No newline at end of file
+        return await EmailService.queue_email(user_email, subject, html_content)
\ No newline at end of file
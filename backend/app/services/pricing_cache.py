@@ -0,0 +1,112 @@
+"""
+Process-local read-through cache for pricing, currency and variable configuration
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.pricing_config import PricingConfig, CurrencyConfig, VariableMapping
+
+# Admin writes invalidate this process immediately; other workers pick up
+# changes once their entries expire.
+PRICING_CACHE_TTL_SECONDS = 60
+
+
+class PricingSnapshot(NamedTuple):
+    """Detached copy of the PricingConfig columns used for price calculation"""
+    variable_name: str
+    endpoint_type: str
+    base_price: float
+    currency: str
+    tax_rate: float
+    tax_enabled: bool
+    free_plan_price: Optional[float]
+    developer_plan_price: Optional[float]
+    business_plan_price: Optional[float]
+    enterprise_plan_price: Optional[float]
+
+
+class PricingCache:
+    """TTL cache over the rarely-written pricing configuration tables"""
+
+    _entries: Dict[str, Tuple[float, Any]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def _get_or_load(cls, key: str, loader: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        entry = cls._entries.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        value = loader()
+        with cls._lock:
+            cls._entries[key] = (now + PRICING_CACHE_TTL_SECONDS, value)
+        return value
+
+    @classmethod
+    def get_active_pricing(cls, db: Session) -> Dict[str, PricingSnapshot]:
+        """Active pricing configs keyed by variable name"""
+        def load() -> Dict[str, PricingSnapshot]:
+            configs = db.query(PricingConfig).filter(PricingConfig.is_active == True).all()
+            return {
+                config.variable_name: PricingSnapshot(
+                    variable_name=config.variable_name,
+                    endpoint_type=config.endpoint_type,
+                    base_price=config.base_price,
+                    currency=config.currency,
+                    tax_rate=config.tax_rate,
+                    tax_enabled=config.tax_enabled,
+                    free_plan_price=config.free_plan_price,
+                    developer_plan_price=config.developer_plan_price,
+                    business_plan_price=config.business_plan_price,
+                    enterprise_plan_price=config.enterprise_plan_price
+                )
+                for config in configs
+            }
+
+        return cls._get_or_load("pricing", load)
+
+    @classmethod
+    def get_exchange_rates(cls, db: Session) -> Dict[str, float]:
+        """Exchange rates (from INR) of active currencies keyed by currency code"""
+        def load() -> Dict[str, float]:
+            currencies = db.query(CurrencyConfig).filter(CurrencyConfig.is_active == True).all()
+            return {currency.currency_code: currency.exchange_rate for currency in currencies}
+
+        return cls._get_or_load("exchange_rates", load)
+
+    @classmethod
+    def get_variable_info(cls, db: Session) -> List[Dict[str, Any]]:
+        """Details of all active variable mappings"""
+        def load() -> List[Dict[str, Any]]:
+            variables = db.query(VariableMapping).filter(VariableMapping.is_active == True).all()
+            return [
+                {
+                    "variable_name": var.variable_name,
+                    "endpoint_type": var.endpoint_type,
+                    "description": var.description,
+                    "unit": var.unit,
+                    "data_type": var.data_type
+                }
+                for var in variables
+            ]
+
+        return cls._get_or_load("variables", load)
+
+    @classmethod
+    def get_rendered(cls, key: str, render: Callable[[], bytes]) -> bytes:
+        """Serialized response body derived from the cached configuration
+        
+        Shares the TTL and invalidation of the entries it is built from, so
+        endpoints can skip model construction and serialization on a hit.
+        """
+        return cls._get_or_load(f"rendered:{key}", render)
+    
+    @classmethod
+    def invalidate(cls):
+        """Drop all cached entries after a pricing, currency or variable write"""
+        with cls._lock:
+            cls._entries.clear()
@@ -1,19 +1,82 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from sqlalchemy import case, func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, raiseload
+from pydantic import TypeAdapter, ValidationError
+from typing import Iterator, List, Optional, Dict, Any
 from datetime import datetime, timedelta
-import json
+import orjson
 import csv
 import io
-import pandas as pd
+import logging
+import redis
+import xlsxwriter
 
+from app.core.config import settings
 from app.models.pricing_config import PricingConfig, CurrencyConfig, VariableMapping, WeatherRequest
 from app.models.user import User
+from app.services.pricing_cache import PricingCache
 from app.schemas.pricing import (
     PricingConfigCreate, PricingConfigUpdate, CurrencyConfigCreate, CurrencyConfigUpdate,
     VariableMappingCreate, VariableMappingUpdate, BulkPricingUpdate, PricingAnalytics,
     RevenueAnalytics, PricingExportRequest, PricingImportRequest, PricingImportResult
 )
 
+# Built once: validates a whole import/bulk-update batch in a single pydantic-core call.
+# Items' extra keys (e.g. 'id') are ignored, as when constructing the models directly.
+_BULK_CREATE_ADAPTER = TypeAdapter(List[PricingConfigCreate])
+_BULK_UPDATE_ADAPTER = TypeAdapter(List[PricingConfigUpdate])
+
+def _validate_batch(adapter: TypeAdapter, items: List[Dict[str, Any]]) -> Optional[list]:
+    """Validate all items at once; None if any is invalid so callers report per item"""
+    try:
+        return adapter.validate_python(items)
+    except ValidationError:
+        return None
+
+logger = logging.getLogger(__name__)
+
+# Pricing analytics are cached across workers; PricingService writes drop the
+# entry, so the TTL only bounds staleness from writes made elsewhere
+PRICING_ANALYTICS_CACHE_KEY = "pricing:analytics:v1"
+PRICING_ANALYTICS_CACHE_TTL_SECONDS = 30
+_analytics_cache = redis.from_url(settings.REDIS_URL)
+
+def _invalidate_pricing():
+    """Drop this process's PricingCache and the shared analytics entry after a pricing write"""
+    PricingCache.invalidate()
+    try:
+        _analytics_cache.delete(PRICING_ANALYTICS_CACHE_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Failed to invalidate pricing analytics cache: {e}")
+
+# SQLSTATE of a unique constraint violation
+UNIQUE_VIOLATION = "23505"
+
+# Columns of a pricing export, in output order
+_EXPORT_FIELDS = [
+    'id', 'variable_name', 'endpoint_type', 'base_price', 'currency', 'tax_rate',
+    'tax_enabled', 'hsn_sac_code', 'free_plan_price', 'developer_plan_price',
+    'business_plan_price', 'enterprise_plan_price', 'is_active', 'created_at',
+    'updated_at', 'created_by'
+]
+_EXPORT_COLUMNS = [getattr(PricingConfig, field) for field in _EXPORT_FIELDS]
+_EXPORT_TIMESTAMP_INDEXES = (_EXPORT_FIELDS.index('created_at'), _EXPORT_FIELDS.index('updated_at'))
+# Rows fetched per round trip, and per chunk written, when streaming an export
+EXPORT_BATCH_SIZE = 1000
+
+def _export_row(values: tuple) -> list:
+    """One selected _EXPORT_COLUMNS row as output values, timestamps as ISO strings"""
+    row = list(values)
+    for index in _EXPORT_TIMESTAMP_INDEXES:
+        if row[index] is not None:
+            row[index] = row[index].isoformat()
+    return row
+
+def _raise_if_duplicate(error: IntegrityError, variable_name: str):
+    """Turn a unique violation on pricing_config into the service's ValueError"""
+    if getattr(error.orig, "pgcode", None) == UNIQUE_VIOLATION:
+        raise ValueError(f"Pricing config already exists for variable '{variable_name}'") from error
+
 class PricingService:
     """Service for managing pricing configurations"""
     
@@ -28,7 +91,8 @@ class PricingService:
         search: Optional[str] = None
     ) -> List[PricingConfig]:
         """Get pricing configurations with filtering"""
-        query = db.query(PricingConfig)
+        # Responses only carry columns; fail loudly if anything lazy-loads creator per row
+        query = db.query(PricingConfig).options(raiseload('*'))
         
         # Apply filters
         if endpoint_type:
@@ -53,7 +117,7 @@ class PricingService:
     @staticmethod
     def get_pricing_config_by_id(db: Session, config_id: str) -> Optional[PricingConfig]:
         """Get pricing configuration by ID"""
-        return db.query(PricingConfig).filter(PricingConfig.id == config_id).first()
+        return db.query(PricingConfig).options(raiseload('*')).filter(PricingConfig.id == config_id).first()
     
     @staticmethod
     def create_pricing_config(
@@ -62,23 +126,21 @@ class PricingService:
         created_by: str
     ) -> PricingConfig:
         """Create new pricing configuration"""
-        # Check if variable already exists for the endpoint type
-        existing = db.query(PricingConfig).filter(
-            PricingConfig.variable_name == pricing_config.variable_name,
-            PricingConfig.endpoint_type == pricing_config.endpoint_type
-        ).first()
-        
-        if existing:
-            raise ValueError(f"Pricing config already exists for variable '{pricing_config.variable_name}' on endpoint '{pricing_config.endpoint_type}'")
-        
         db_config = PricingConfig(
-            **pricing_config.dict(),
+            **pricing_config.model_dump(),
             created_by=created_by
         )
         
+        # The unique constraint on variable_name rejects duplicates; no pre-check SELECT
         db.add(db_config)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            _raise_if_duplicate(e, pricing_config.variable_name)
+            raise
         db.refresh(db_config)
+        _invalidate_pricing()
         
         return db_config
     
@@ -89,34 +151,27 @@ class PricingService:
         pricing_config: PricingConfigUpdate
     ) -> Optional[PricingConfig]:
         """Update pricing configuration"""
-        db_config = db.query(PricingConfig).filter(PricingConfig.id == config_id).first()
-        
-        if not db_config:
-            return None
-        
-        # Update fields
-        update_data = pricing_config.dict(exclude_unset=True)
-        
-        # Check for conflicts if updating variable name or endpoint type
-        if 'variable_name' in update_data or 'endpoint_type' in update_data:
-            new_variable = update_data.get('variable_name', db_config.variable_name)
-            new_endpoint = update_data.get('endpoint_type', db_config.endpoint_type)
-            
-            existing = db.query(PricingConfig).filter(
-                PricingConfig.variable_name == new_variable,
-                PricingConfig.endpoint_type == new_endpoint,
-                PricingConfig.id != config_id
-            ).first()
-            
-            if existing:
-                raise ValueError(f"Pricing config already exists for variable '{new_variable}' on endpoint '{new_endpoint}'")
-        
-        for field, value in update_data.items():
-            setattr(db_config, field, value)
-        
-        db_config.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(db_config)
+        update_data = pricing_config.model_dump(exclude_unset=True)
+        if not update_data:
+            return db.query(PricingConfig).filter(PricingConfig.id == config_id).first()
+        
+        # Apply the fields and load the updated row in the same statement; a
+        # rename onto an existing variable is rejected by the unique constraint
+        try:
+            db_config = db.scalars(
+                update(PricingConfig)
+                .where(PricingConfig.id == config_id)
+                .values(**update_data)
+                .returning(PricingConfig)
+            ).one_or_none()
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            _raise_if_duplicate(e, update_data.get("variable_name"))
+            raise
+        
+        if db_config is not None:
+            _invalidate_pricing()
         
         return db_config
     
@@ -130,6 +185,7 @@ class PricingService:
         
         db.delete(db_config)
         db.commit()
+        _invalidate_pricing()
         
         return True
     
@@ -146,7 +202,12 @@ class PricingService:
             "errors": []
         }
         
-        for update_item in bulk_update.pricing_updates:
+        validated = _validate_batch(_BULK_UPDATE_ADAPTER, bulk_update.pricing_updates)
+        
+        # Field updates per config id, merged in item order
+        updates: Dict[str, Dict[str, Any]] = {}
+        item_counts: Dict[str, int] = {}
+        for i, update_item in enumerate(bulk_update.pricing_updates):
             try:
                 config_id = update_item.get('id')
                 if not config_id:
@@ -154,74 +215,156 @@ class PricingService:
                     results["failed_count"] += 1
                     continue
                 
-                # Remove id from update data
-                update_data = {k: v for k, v in update_item.items() if k != 'id'}
-                
                 # Create update schema
-                pricing_update = PricingConfigUpdate(**update_data)
+                if validated is not None:
+                    pricing_update = validated[i]
+                else:
+                    update_data = {k: v for k, v in update_item.items() if k != 'id'}
+                    pricing_update = PricingConfigUpdate(**update_data)
                 
-                # Update configuration
-                updated_config = PricingService.update_pricing_config(
-                    db, config_id, pricing_update
-                )
+                updates.setdefault(config_id, {}).update(pricing_update.model_dump(exclude_unset=True))
+                item_counts[config_id] = item_counts.get(config_id, 0) + 1
                 
-                if updated_config:
-                    results["updated_count"] += 1
-                else:
-                    results["errors"].append(f"Configuration with id '{config_id}' not found")
-                    results["failed_count"] += 1
-                    
             except Exception as e:
                 results["errors"].append(f"Error updating config: {str(e)}")
                 results["failed_count"] += 1
         
+        if not updates:
+            return results
+        
+        # Current names of every target in one query
+        current_names = {
+            row.id: row.variable_name
+            for row in db.query(PricingConfig.id, PricingConfig.variable_name).filter(
+                PricingConfig.id.in_(updates.keys())
+            )
+        }
+        
+        # variable_name is unique on its own, across endpoints
+        new_names: Dict[str, str] = {}
+        for config_id in list(updates):
+            if config_id not in current_names:
+                results["errors"].append(f"Configuration with id '{config_id}' not found")
+                results["failed_count"] += item_counts.pop(config_id)
+                del updates[config_id]
+                continue
+            variable_name = updates[config_id].get('variable_name')
+            if variable_name is not None and variable_name != current_names[config_id]:
+                new_names[config_id] = variable_name
+        
+        # Conflicts for renamed configs, against the table and within the batch, in one query
+        if new_names:
+            taken = {
+                row.variable_name: row.id
+                for row in db.query(PricingConfig.id, PricingConfig.variable_name).filter(
+                    PricingConfig.variable_name.in_(set(new_names.values()))
+                )
+            }
+            for config_id, variable_name in new_names.items():
+                if taken.setdefault(variable_name, config_id) != config_id:
+                    results["errors"].append(
+                        f"Error updating config: Pricing config already exists for variable '{variable_name}'"
+                    )
+                    results["failed_count"] += item_counts.pop(config_id)
+                    del updates[config_id]
+        
+        if not updates:
+            return results
+        
+        # One UPDATE for the whole batch: each changed column becomes a CASE on id
+        columns = {field for update_data in updates.values() for field in update_data}
+        values = {
+            field: case(
+                {
+                    config_id: update_data[field]
+                    for config_id, update_data in updates.items()
+                    if field in update_data
+                },
+                value=PricingConfig.id,
+                else_=getattr(PricingConfig, field)
+            )
+            for field in columns
+        }
+        
+        try:
+            db.query(PricingConfig).filter(
+                PricingConfig.id.in_(updates.keys())
+            ).update(values, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            results["errors"].append(f"Error updating config: {str(e)}")
+            results["failed_count"] += sum(item_counts[config_id] for config_id in updates)
+            return results
+        
+        _invalidate_pricing()
+        results["updated_count"] += sum(item_counts[config_id] for config_id in updates)
+        
         return results
     
     @staticmethod
     def get_pricing_analytics(db: Session) -> PricingAnalytics:
-        """Get pricing analytics"""
-        configs = db.query(PricingConfig).all()
-        active_configs = [c for c in configs if c.is_active]
+        """Get pricing analytics, served from Redis for up to PRICING_ANALYTICS_CACHE_TTL_SECONDS"""
+        try:
+            cached = _analytics_cache.get(PRICING_ANALYTICS_CACHE_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read pricing analytics cache: {e}")
+            cached = None
+        if cached is not None:
+            return PricingAnalytics.model_validate_json(cached)
+        
+        analytics = PricingService._compute_pricing_analytics(db)
+        try:
+            _analytics_cache.setex(
+                PRICING_ANALYTICS_CACHE_KEY, PRICING_ANALYTICS_CACHE_TTL_SECONDS, analytics.model_dump_json()
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Failed to write pricing analytics cache: {e}")
+        return analytics
+    
+    @staticmethod
+    def _compute_pricing_analytics(db: Session) -> PricingAnalytics:
+        # Totals, price stats and the cheapest/priciest variable in one row
+        most_expensive_subquery = db.query(PricingConfig.variable_name).order_by(
+            PricingConfig.base_price.desc()
+        ).limit(1).scalar_subquery()
+        least_expensive_subquery = db.query(PricingConfig.variable_name).order_by(
+            PricingConfig.base_price.asc()
+        ).limit(1).scalar_subquery()
+        
+        stats = db.query(
+            func.count().label("total_configs"),
+            func.count().filter(PricingConfig.is_active.is_(True)).label("active_configs"),
+            func.avg(PricingConfig.base_price).label("avg_price"),
+            func.min(PricingConfig.base_price).label("min_price"),
+            func.max(PricingConfig.base_price).label("max_price"),
+            most_expensive_subquery.label("most_expensive"),
+            least_expensive_subquery.label("least_expensive")
+        ).select_from(PricingConfig).one()
         
         # Endpoint distribution
-        endpoint_dist = {}
-        for config in configs:
-            endpoint_dist[config.endpoint_type] = endpoint_dist.get(config.endpoint_type, 0) + 1
+        endpoint_dist = dict(
+            db.query(PricingConfig.endpoint_type, func.count())
+            .group_by(PricingConfig.endpoint_type)
+            .all()
+        )
         
         # Currency distribution
-        currency_dist = {}
-        for config in configs:
-            currency_dist[config.currency] = currency_dist.get(config.currency, 0) + 1
-        
-        # Price analytics
-        if configs:
-            prices = [c.base_price for c in configs]
-            avg_price = sum(prices) / len(prices)
-            min_price = min(prices)
-            max_price = max(prices)
-            
-            # Find most/least expensive variables
-            min_config = min(configs, key=lambda x: x.base_price)
-            max_config = max(configs, key=lambda x: x.base_price)
-            
-            most_expensive = max_config.variable_name
-            least_expensive = min_config.variable_name
-        else:
-            avg_price = 0
-            min_price = 0
-            max_price = 0
-            most_expensive = None
-            least_expensive = None
+        currency_dist = dict(
+            db.query(PricingConfig.currency, func.count())
+            .group_by(PricingConfig.currency)
+            .all()
+        )
         
         return PricingAnalytics(
-            total_configs=len(configs),
-            active_configs=len(active_configs),
+            total_configs=stats.total_configs,
+            active_configs=stats.active_configs,
             endpoint_distribution=endpoint_dist,
             currency_distribution=currency_dist,
-            average_base_price=avg_price,
-            price_range={"min": min_price, "max": max_price},
-            most_expensive_variable=most_expensive,
-            least_expensive_variable=least_expensive
+            average_base_price=stats.avg_price or 0,
+            price_range={"min": stats.min_price or 0, "max": stats.max_price or 0},
+            most_expensive_variable=stats.most_expensive,
+            least_expensive_variable=stats.least_expensive
         )
     
     @staticmethod
@@ -231,34 +374,36 @@ class PricingService:
         end_date: datetime
     ) -> RevenueAnalytics:
         """Get revenue analytics for a date range"""
-        weather_requests = db.query(WeatherRequest).filter(
+        in_period = (
             WeatherRequest.created_at >= start_date,
             WeatherRequest.created_at <= end_date,
             WeatherRequest.success == True
-        ).all()
-        
-        total_revenue = sum(r.final_amount for r in weather_requests)
-        transaction_count = len(weather_requests)
-        
-        # Revenue by currency
-        revenue_by_currency = {}
-        for request in weather_requests:
-            currency = request.currency
-            revenue_by_currency[currency] = revenue_by_currency.get(currency, 0) + request.final_amount
-        
-        # Revenue by endpoint
-        revenue_by_endpoint = {}
-        for request in weather_requests:
-            endpoints = json.loads(request.endpoints_called) if request.endpoints_called else []
-            for endpoint in endpoints:
-                revenue_by_endpoint[endpoint] = revenue_by_endpoint.get(endpoint, 0) + (request.final_amount / len(endpoints))
-        
-        # Revenue by variable
-        revenue_by_variable = {}
-        for request in weather_requests:
-            variables = json.loads(request.variables) if request.variables else []
-            for variable in variables:
-                revenue_by_variable[variable] = revenue_by_variable.get(variable, 0) + (request.final_amount / len(variables))
+        )
+        
+        # Revenue by currency; the overall totals are its sums
+        currency_rows = db.query(
+            WeatherRequest.currency,
+            func.sum(WeatherRequest.final_amount),
+            func.count()
+        ).filter(*in_period).group_by(WeatherRequest.currency).all()
+        
+        revenue_by_currency = {currency: revenue for currency, revenue, _ in currency_rows}
+        total_revenue = sum(revenue_by_currency.values())
+        transaction_count = sum(count for _, _, count in currency_rows)
+        
+        # Revenue by endpoint and by variable: each request's amount is split
+        # evenly across the elements of the array, unnested in SQL
+        def revenue_by_element(array_column) -> Dict[str, float]:
+            element = func.unnest(array_column).column_valued("element")
+            return dict(
+                db.query(
+                    element,
+                    func.sum(WeatherRequest.final_amount / func.cardinality(array_column))
+                ).filter(*in_period).group_by(element).all()
+            )
+        
+        revenue_by_endpoint = revenue_by_element(WeatherRequest.endpoints_called)
+        revenue_by_variable = revenue_by_element(WeatherRequest.variables)
         
         # Revenue by plan (would need to join with user/subscription data)
         revenue_by_plan = {"free": 0, "developer": 0, "business": 0, "enterprise": 0}
@@ -275,13 +420,13 @@ class PricingService:
         )
     
     @staticmethod
-    def export_pricing_data(
-        db: Session, 
-        export_request: PricingExportRequest
-    ) -> bytes:
-        """Export pricing data in specified format"""
-        # Get pricing configurations with filters
-        query = db.query(PricingConfig)
+    def _export_query(db: Session, export_request: PricingExportRequest):
+        """Export columns of the configurations selected by an export request
+        
+        Selects plain column tuples, skipping ORM instance construction and
+        identity-map bookkeeping for every exported row.
+        """
+        query = db.query(*_EXPORT_COLUMNS)
         
         if not export_request.include_inactive:
             query = query.filter(PricingConfig.is_active == True)
@@ -292,46 +437,69 @@ class PricingService:
         if export_request.currencies:
             query = query.filter(PricingConfig.currency.in_(export_request.currencies))
         
-        configs = query.all()
-        
-        # Prepare data
-        data = []
-        for config in configs:
-            data.append({
-                'id': config.id,
-                'variable_name': config.variable_name,
-                'endpoint_type': config.endpoint_type,
-                'base_price': config.base_price,
-                'currency': config.currency,
-                'tax_rate': config.tax_rate,
-                'tax_enabled': config.tax_enabled,
-                'hsn_sac_code': config.hsn_sac_code,
-                'free_plan_price': config.free_plan_price,
-                'developer_plan_price': config.developer_plan_price,
-                'business_plan_price': config.business_plan_price,
-                'enterprise_plan_price': config.enterprise_plan_price,
-                'is_active': config.is_active,
-                'created_at': config.created_at.isoformat(),
-                'updated_at': config.updated_at.isoformat(),
-                'created_by': config.created_by
-            })
-        
-        # Export based on format
-        if export_request.format == "json":
-            return json.dumps(data, indent=2).encode('utf-8')
-        
-        elif export_request.format == "csv":
-            output = io.StringIO()
-            if data:
-                writer = csv.DictWriter(output, fieldnames=data[0].keys())
-                writer.writeheader()
-                writer.writerows(data)
-            return output.getvalue().encode('utf-8')
+        return query
+    
+    @staticmethod
+    def iter_pricing_export(
+        db: Session,
+        export_request: PricingExportRequest
+    ) -> Iterator[bytes]:
+        """Yield a CSV or JSON export in chunks of EXPORT_BATCH_SIZE rows
+        
+        Rows are fetched EXPORT_BATCH_SIZE at a time from a server-side cursor
+        and written straight to the output, so memory stays flat however many
+        configurations are exported.
+        """
+        if export_request.format not in ("csv", "json"):
+            raise ValueError(f"Unsupported streaming export format: {export_request.format}")
+        
+        rows = PricingService._export_query(db, export_request).yield_per(EXPORT_BATCH_SIZE)
+        
+        if export_request.format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(_EXPORT_FIELDS)
+            for count, values in enumerate(rows, 1):
+                writer.writerow(_export_row(values))
+                if count % EXPORT_BATCH_SIZE == 0:
+                    yield buffer.getvalue().encode('utf-8')
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue().encode('utf-8')
+        
+        else:
+            # orjson writes the timestamps itself, in the same ISO format as _export_row
+            chunk = [b"["]
+            for count, values in enumerate(rows):
+                chunk.append(
+                    (b",\n" if count else b"\n")
+                    + orjson.dumps(dict(zip(_EXPORT_FIELDS, values)), option=orjson.OPT_INDENT_2)
+                )
+                if len(chunk) >= EXPORT_BATCH_SIZE:
+                    yield b"".join(chunk)
+                    chunk = []
+            chunk.append(b"\n]")
+            yield b"".join(chunk)
+    
+    @staticmethod
+    def export_pricing_data(
+        db: Session, 
+        export_request: PricingExportRequest
+    ) -> bytes:
+        """Export pricing data in specified format"""
+        if export_request.format in ("csv", "json"):
+            return b"".join(PricingService.iter_pricing_export(db, export_request))
         
         elif export_request.format == "xlsx":
-            df = pd.DataFrame(data)
+            # constant_memory flushes each row to a temp file as soon as the next one starts
             output = io.BytesIO()
-            df.to_excel(output, index=False)
+            workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+            worksheet = workbook.add_worksheet()
+            worksheet.write_row(0, 0, _EXPORT_FIELDS)
+            query = PricingService._export_query(db, export_request).yield_per(EXPORT_BATCH_SIZE)
+            for row_number, values in enumerate(query, 1):
+                worksheet.write_row(row_number, 0, _export_row(values))
+            workbook.close()
             return output.getvalue()
         
         else:
@@ -353,73 +521,60 @@ class PricingService:
             warnings=[]
         )
         
+        if import_request.import_mode == "update":
+            validated = _validate_batch(_BULK_UPDATE_ADAPTER, import_request.data)
+        else:
+            validated = _validate_batch(_BULK_CREATE_ADAPTER, import_request.data)
+        
         if import_request.validate_only:
             # Only validate, don't actually import
-            for item in import_request.data:
+            for i, item in enumerate(import_request.data):
                 try:
                     # Validate each item
                     if import_request.import_mode == "create":
-                        PricingConfigCreate(**item)
+                        if validated is None:
+                            PricingConfigCreate(**item)
                     else:
                         # For update mode, at least id is required
                         if 'id' not in item:
                             result.errors.append("Missing 'id' field for update mode")
                             result.failed_count += 1
-                        else:
+                        elif validated is None:
                             update_data = {k: v for k, v in item.items() if k != 'id'}
                             PricingConfigUpdate(**update_data)
                             
                 except Exception as e:
                     result.errors.append(f"Validation error: {str(e)}")
                     result.failed_count += 1
+        elif import_request.import_mode in ("create", "replace"):
+            PricingService._import_new_configs(
+                db, import_request, validated, imported_by, result
+            )
         else:
-            # Actually import the data
-            for item in import_request.data:
+            # Update existing configurations
+            for i, item in enumerate(import_request.data):
                 try:
-                    if import_request.import_mode == "create":
-                        # Create new configuration
-                        pricing_config = PricingConfigCreate(**item)
-                        PricingService.create_pricing_config(db, pricing_config, imported_by)
-                        result.created_count += 1
-                        
-                    elif import_request.import_mode == "update":
-                        # Update existing configuration
-                        if 'id' not in item:
-                            result.errors.append("Missing 'id' field for update mode")
-                            result.failed_count += 1
-                            continue
-                        
-                        config_id = item['id']
+                    if 'id' not in item:
+                        result.errors.append("Missing 'id' field for update mode")
+                        result.failed_count += 1
+                        continue
+                    
+                    config_id = item['id']
+                    if validated is not None:
+                        pricing_update = validated[i]
+                    else:
                         update_data = {k: v for k, v in item.items() if k != 'id'}
                         pricing_update = PricingConfigUpdate(**update_data)
-                        
-                        updated_config = PricingService.update_pricing_config(
-                            db, config_id, pricing_update
-                        )
-                        
-                        if updated_config:
-                            result.updated_count += 1
-                        else:
-                            result.errors.append(f"Configuration with id '{config_id}' not found")
-                            result.failed_count += 1
-                            
-                    elif import_request.import_mode == "replace":
-                        # Replace: delete existing and create new
-                        if 'variable_name' in item and 'endpoint_type' in item:
-                            # Find and delete existing
-                            existing = db.query(PricingConfig).filter(
-                                PricingConfig.variable_name == item['variable_name'],
-                                PricingConfig.endpoint_type == item['endpoint_type']
-                            ).first()
-                            
-                            if existing:
-                                db.delete(existing)
-                                result.warnings.append(f"Replaced existing config for {item['variable_name']}")
-                        
-                        # Create new
-                        pricing_config = PricingConfigCreate(**item)
-                        PricingService.create_pricing_config(db, pricing_config, imported_by)
-                        result.created_count += 1
+                    
+                    updated_config = PricingService.update_pricing_config(
+                        db, config_id, pricing_update
+                    )
+                    
+                    if updated_config:
+                        result.updated_count += 1
+                    else:
+                        result.errors.append(f"Configuration with id '{config_id}' not found")
+                        result.failed_count += 1
                         
                 except Exception as e:
                     result.errors.append(f"Import error: {str(e)}")
@@ -430,6 +585,84 @@ class PricingService:
         
         return result
 
+    @staticmethod
+    def _import_new_configs(
+        db: Session,
+        import_request: PricingImportRequest,
+        validated: Optional[list],
+        imported_by: str,
+        result: PricingImportResult
+    ):
+        """Insert the configs of a create/replace import with one bulk INSERT and one commit
+        
+        variable_name is unique across endpoints, so configs are keyed on it
+        alone. Create mode rejects items whose variable_name already exists,
+        in the table or earlier in the import. Replace mode deletes the
+        existing configs for the imported names in one DELETE and keeps the
+        last item per name.
+        """
+        replace = import_request.import_mode == "replace"
+        
+        configs: Dict[str, PricingConfigCreate] = {}
+        for i, item in enumerate(import_request.data):
+            try:
+                pricing_config = validated[i] if validated is not None else PricingConfigCreate(**item)
+            except Exception as e:
+                result.errors.append(f"Import error: {str(e)}")
+                result.failed_count += 1
+                continue
+            
+            variable_name = pricing_config.variable_name
+            if variable_name in configs:
+                if not replace:
+                    result.errors.append(
+                        f"Import error: Pricing config already exists for variable '{variable_name}'"
+                    )
+                    result.failed_count += 1
+                    continue
+                result.warnings.append(f"Replaced existing config for {variable_name}")
+            configs[variable_name] = pricing_config
+        
+        if not configs:
+            return
+        
+        existing = {
+            row.variable_name for row in
+            db.query(PricingConfig.variable_name).filter(PricingConfig.variable_name.in_(configs.keys()))
+        }
+        
+        try:
+            if replace:
+                if existing:
+                    db.query(PricingConfig).filter(
+                        PricingConfig.variable_name.in_(existing)
+                    ).delete(synchronize_session=False)
+                    result.warnings.extend(
+                        f"Replaced existing config for {variable_name}" for variable_name in existing
+                    )
+            else:
+                for variable_name in existing:
+                    result.errors.append(
+                        f"Import error: Pricing config already exists for variable '{variable_name}'"
+                    )
+                    result.failed_count += 1
+                    del configs[variable_name]
+            
+            if configs:
+                db.bulk_insert_mappings(PricingConfig, [
+                    {**pricing_config.model_dump(), "created_by": imported_by}
+                    for pricing_config in configs.values()
+                ])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            result.errors.append(f"Import error: {str(e)}")
+            result.failed_count += len(configs)
+            return
+        
+        _invalidate_pricing()
+        result.created_count += len(configs)
+
 class CurrencyService:
     """Service for managing currency configurations"""
     
@@ -446,11 +679,12 @@ class CurrencyService:
     @staticmethod
     def create_currency(db: Session, currency: CurrencyConfigCreate) -> CurrencyConfig:
         """Create new currency configuration"""
-        db_currency = CurrencyConfig(**currency.dict())
+        db_currency = CurrencyConfig(**currency.model_dump())
         
         db.add(db_currency)
         db.commit()
         db.refresh(db_currency)
+        PricingCache.invalidate()
         
         return db_currency
     
@@ -466,14 +700,14 @@ class CurrencyService:
         if not db_currency:
             return None
         
-        update_data = currency.dict(exclude_unset=True)
+        update_data = currency.model_dump(exclude_unset=True)
         
         for field, value in update_data.items():
             setattr(db_currency, field, value)
         
-        db_currency.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(db_currency)
+        PricingCache.invalidate()
         
         return db_currency
 
@@ -500,11 +734,12 @@ class VariableService:
     @staticmethod
     def create_variable(db: Session, variable: VariableMappingCreate) -> VariableMapping:
         """Create new variable mapping"""
-        db_variable = VariableMapping(**variable.dict())
+        db_variable = VariableMapping(**variable.model_dump())
         
         db.add(db_variable)
         db.commit()
         db.refresh(db_variable)
+        PricingCache.invalidate()
         
         return db_variable
     
@@ -520,13 +755,13 @@ class VariableService:
         if not db_variable:
             return None
         
-        update_data = variable.dict(exclude_unset=True)
+        update_data = variable.model_dump(exclude_unset=True)
         
         for field, value in update_data.items():
             setattr(db_variable, field, value)
         
-        db_variable.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(db_variable)
+        PricingCache.invalidate()
         
         return db_variable
\ No newline at end of file
@@ -1,7 +1,9 @@
+import calendar
 import redis
 import time
-from typing import Optional, Tuple
-from datetime import datetime, timedelta
+from redis.utils import HIREDIS_AVAILABLE
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 import logging
 
 from app.core.config import settings
@@ -9,12 +11,102 @@ from app.models.subscription import SubscriptionPlan
 
 logger = logging.getLogger(__name__)
 
+# Each API key keeps both windows in one small hash, rate_limit:{api_key},
+# with fields m/mc (current minute bucket and its count) and mo/moc (current
+# month and its count). A counter whose window tag no longer matches is
+# treated as 0 and overwritten, so stale windows never pile up as extra keys
+# or fields; the hash itself expires when the month does.
+#
+# Checks both windows and, if neither is exhausted, counts the request — all
+# in one atomic round trip. Returns {status, minute_count, month_count} where
+# status is 0 (allowed), 1 (minute limit hit) or 2 (month limit hit); counts
+# are the values before this request.
+# KEYS: hash_key. ARGV: minute_bucket, month, minute_limit, month_limit, month_expire_at.
+_CHECK_AND_INCREMENT_LUA = """
+local state = redis.call('HMGET', KEYS[1], 'm', 'mc', 'mo', 'moc')
+local minute = 0
+if state[1] == ARGV[1] then
+    minute = tonumber(state[2])
+end
+if minute >= tonumber(ARGV[3]) then
+    return {1, minute, 0}
+end
+local month = 0
+if state[3] == ARGV[2] then
+    month = tonumber(state[4])
+end
+if month >= tonumber(ARGV[4]) then
+    return {2, minute, month}
+end
+redis.call('HSET', KEYS[1], 'm', ARGV[1], 'mc', minute + 1, 'mo', ARGV[2], 'moc', month + 1)
+redis.call('EXPIREAT', KEYS[1], ARGV[5])
+return {0, minute, month}
+"""
+
+# (requests_per_minute, requests_per_month) per plan value, unpacked once
+_LIMITS: Dict[str, Tuple[int, int]] = {
+    plan: (limits["requests_per_minute"], limits["requests_per_month"])
+    for plan, limits in settings.RATE_LIMITS.items()
+}
+
+
+def _plan_limits(plan: SubscriptionPlan) -> Tuple[int, int]:
+    return _LIMITS.get(plan.value, _LIMITS["free"])
+
+
+@lru_cache(maxsize=4)
+def _month_reset(year: int, month: int) -> int:
+    """Unix time of the start of the month after (year, month), UTC; computed once per month"""
+    return calendar.timegm((year + month // 12, month % 12 + 1, 1, 0, 0, 0))
+
+
+def _counter_key(api_key: str) -> bytes:
+    return b"rate_limit:%s" % api_key.encode()
+
+
+def _windows(now: float) -> Tuple[bytes, bytes, int, int]:
+    """Minute bucket and month tags at now, with when each window resets"""
+    minute_bucket = int(now) // 60
+    year, month = time.gmtime(now)[:2]
+    return (
+        b"%d" % minute_bucket,
+        b"%04d-%02d" % (year, month),
+        (minute_bucket + 1) * 60,
+        _month_reset(year, month)
+    )
+
+
+def _current_counts(state, minute_bucket: bytes, month: bytes) -> Tuple[int, int]:
+    """Minute and month counts from a counter hash's m/mc/mo/moc fields, 0 for stale windows"""
+    minute_tag, minute_count, month_tag, month_count = state
+    return (
+        int(minute_count) if minute_tag == minute_bucket else 0,
+        int(month_count) if month_tag == month else 0
+    )
+
+
+# Keys visited per SCAN step, and per MGET/pipeline batch in the admin helpers
+RATE_LIMIT_SCAN_COUNT = 500
+
+# RateLimitService is built per request; sharing one pool keeps connections
+# (and hiredis' C reply parser, picked up automatically when installed) warm
+RATE_LIMIT_MAX_CONNECTIONS = 64
+_redis_pool = redis.ConnectionPool.from_url(settings.REDIS_URL, max_connections=RATE_LIMIT_MAX_CONNECTIONS)
+_redis_verified = False
+
 class RateLimitService:
     def __init__(self):
+        global _redis_verified
         try:
-            self.redis_client = redis.from_url(settings.REDIS_URL)
-            # Test the connection
-            self.redis_client.ping()
+            self.redis_client = redis.Redis(connection_pool=_redis_pool)
+            # Test the connection once per process rather than on every request
+            if not _redis_verified:
+                self.redis_client.ping()
+                if not HIREDIS_AVAILABLE:
+                    logger.warning("hiredis not installed, Redis replies use the pure-Python parser")
+                _redis_verified = True
+            # Sent by SHA; redis-py loads the script on first use
+            self._check_and_increment = self.redis_client.register_script(_CHECK_AND_INCREMENT_LUA)
         except Exception as e:
             logger.error(f"Redis connection failed: {e}")
             self.redis_client = None
@@ -30,52 +122,36 @@ class RateLimitService:
             return True, {"limit_type": "none", "limit": 0, "current": 0, "reset_time": 0}
             
         try:
-            limits = settings.RATE_LIMITS.get(plan.value, settings.RATE_LIMITS["free"])
+            minute_limit, month_limit = _plan_limits(plan)
+            minute_bucket, month, minute_reset, month_reset = _windows(time.time())
             
-            # Check minute rate limit
-            minute_key = f"rate_limit:minute:{api_key}:{int(time.time() // 60)}"
-            minute_requests = self.redis_client.get(minute_key)
-            minute_requests = int(minute_requests) if minute_requests else 0
+            status, minute_requests, month_requests = self._check_and_increment(
+                keys=[_counter_key(api_key)],
+                args=[minute_bucket, month, minute_limit, month_limit, month_reset]
+            )
             
-            if minute_requests >= limits["requests_per_minute"]:
+            if status == 1:
                 return False, {
                     "limit_type": "minute",
-                    "limit": limits["requests_per_minute"],
+                    "limit": minute_limit,
                     "current": minute_requests,
-                    "reset_time": int(time.time() // 60 + 1) * 60
+                    "reset_time": minute_reset
                 }
             
-            # Check monthly rate limit
-            current_month = datetime.utcnow().strftime("%Y-%m")
-            month_key = f"rate_limit:month:{api_key}:{current_month}"
-            month_requests = self.redis_client.get(month_key)
-            month_requests = int(month_requests) if month_requests else 0
-            
-            if month_requests >= limits["requests_per_month"]:
-                # Calculate next month's timestamp
-                next_month = (datetime.utcnow().replace(day=1) + timedelta(days=32)).replace(day=1)
+            if status == 2:
                 return False, {
                     "limit_type": "month",
-                    "limit": limits["requests_per_month"],
+                    "limit": month_limit,
                     "current": month_requests,
-                    "reset_time": int(next_month.timestamp())
+                    "reset_time": month_reset
                 }
             
-            # Increment counters
-            self.redis_client.incr(minute_key)
-            self.redis_client.expire(minute_key, 60)
-            
-            self.redis_client.incr(month_key)
-            # Set expiry for end of month
-            next_month = (datetime.utcnow().replace(day=1) + timedelta(days=32)).replace(day=1)
-            self.redis_client.expireat(month_key, int(next_month.timestamp()))
-            
             return True, {
                 "limit_type": "none",
-                "minute_limit": limits["requests_per_minute"],
-                "month_limit": limits["requests_per_month"],
-                "minute_remaining": limits["requests_per_minute"] - minute_requests - 1,
-                "month_remaining": limits["requests_per_month"] - month_requests - 1
+                "minute_limit": minute_limit,
+                "month_limit": month_limit,
+                "minute_remaining": minute_limit - minute_requests - 1,
+                "month_remaining": month_limit - month_requests - 1
             }
         except Exception as e:
             logger.error(f"Redis error during rate limit check: {e}")
@@ -84,54 +160,36 @@ class RateLimitService:
     
     def get_rate_limit_info(self, api_key: str, plan: SubscriptionPlan) -> dict:
         """Get current rate limit information without incrementing counters"""
+        minute_limit, month_limit = _plan_limits(plan)
+        minute_requests = month_requests = 0
+        
         if self.redis_client is None:
             logger.warning("Redis not available, returning default rate limit info")
-            limits = settings.RATE_LIMITS.get(plan.value, settings.RATE_LIMITS["free"])
-            return {
-                "plan": plan.value,
-                "minute_limit": limits["requests_per_minute"],
-                "month_limit": limits["requests_per_month"],
-                "minute_used": 0,
-                "month_used": 0,
-                "minute_remaining": limits["requests_per_minute"],
-                "month_remaining": limits["requests_per_month"]
-            }
-            
-        try:
-            limits = settings.RATE_LIMITS.get(plan.value, settings.RATE_LIMITS["free"])
-            
-            # Get current minute usage
-            minute_key = f"rate_limit:minute:{api_key}:{int(time.time() // 60)}"
-            minute_requests = self.redis_client.get(minute_key)
-            minute_requests = int(minute_requests) if minute_requests else 0
-            
-            # Get current month usage
-            current_month = datetime.utcnow().strftime("%Y-%m")
-            month_key = f"rate_limit:month:{api_key}:{current_month}"
-            month_requests = self.redis_client.get(month_key)
-            month_requests = int(month_requests) if month_requests else 0
-            
-            return {
-                "plan": plan.value,
-                "minute_limit": limits["requests_per_minute"],
-                "month_limit": limits["requests_per_month"],
-                "minute_used": minute_requests,
-                "month_used": month_requests,
-                "minute_remaining": limits["requests_per_minute"] - minute_requests,
-                "month_remaining": limits["requests_per_month"] - month_requests
-            }
-        except Exception as e:
-            logger.error(f"Redis error during rate limit info retrieval: {e}")
-            limits = settings.RATE_LIMITS.get(plan.value, settings.RATE_LIMITS["free"])
-            return {
-                "plan": plan.value,
-                "minute_limit": limits["requests_per_minute"],
-                "month_limit": limits["requests_per_month"],
-                "minute_used": 0,
-                "month_used": 0,
-                "minute_remaining": limits["requests_per_minute"],
-                "month_remaining": limits["requests_per_month"]
-            }
+        else:
+            try:
+                # Current minute and month usage in one round trip
+                minute_bucket, month, _, _ = _windows(time.time())
+                minute_requests, month_requests = _current_counts(
+                    self.redis_client.hmget(_counter_key(api_key), "m", "mc", "mo", "moc"),
+                    minute_bucket, month
+                )
+            except Exception as e:
+                logger.error(f"Redis error during rate limit info retrieval: {e}")
+                minute_requests = month_requests = 0
+        
+        return {
+            "plan": plan.value,
+            "minute_limit": minute_limit,
+            "month_limit": month_limit,
+            "minute_used": minute_requests,
+            "month_used": month_requests,
+            "minute_remaining": minute_limit - minute_requests,
+            "month_remaining": month_limit - month_requests
+        }
+    
+    def _scan(self, pattern: str):
+        """Iterate counter hashes matching pattern in bounded SCAN steps instead of one blocking KEYS"""
+        return self.redis_client.scan_iter(match=pattern, count=RATE_LIMIT_SCAN_COUNT, _type="HASH")
     
     def reset_rate_limit(self, api_key: str) -> bool:
         """Reset rate limits for an API key (admin only)"""
@@ -140,10 +198,7 @@ class RateLimitService:
             return False
             
         try:
-            # Delete all rate limit keys for this API key
-            keys = self.redis_client.keys(f"rate_limit:*:{api_key}:*")
-            if keys:
-                self.redis_client.delete(*keys)
+            self.redis_client.delete(_counter_key(api_key))
             return True
         except Exception as e:
             logger.error(f"Redis error during rate limit reset: {e}")
@@ -152,14 +207,23 @@ class RateLimitService:
     def get_all_rate_limits(self) -> dict:
         """Get all current rate limits (admin only)"""
         try:
-            keys = self.redis_client.keys("rate_limit:*")
+            keys = list(self._scan("rate_limit:*"))
             rate_limits = {}
+            minute_bucket, month, _, _ = _windows(time.time())
             
-            for key in keys:
-                key_str = key.decode('utf-8')
-                value = self.redis_client.get(key)
-                if value:
-                    rate_limits[key_str] = int(value)
+            # Counters fetched in pipelined HMGET batches rather than one call per key
+            for start in range(0, len(keys), RATE_LIMIT_SCAN_COUNT):
+                batch = keys[start:start + RATE_LIMIT_SCAN_COUNT]
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key in batch:
+                    pipe.hmget(key, "m", "mc", "mo", "moc")
+                for key, state in zip(batch, pipe.execute()):
+                    minute_requests, month_requests = _current_counts(state, minute_bucket, month)
+                    key_str = key.decode('utf-8')
+                    if minute_requests:
+                        rate_limits[f"{key_str}:minute"] = minute_requests
+                    if month_requests:
+                        rate_limits[f"{key_str}:month"] = month_requests
             
             return rate_limits
         except Exception:
@@ -169,20 +233,23 @@ class RateLimitService:
         """Clean up expired rate limit keys"""
         try:
             # This is handled automatically by Redis TTL, but we can do manual cleanup
-            keys = self.redis_client.keys("rate_limit:*")
+            keys = list(self._scan("rate_limit:*"))
             cleaned = 0
+            month_reset = _month_reset(*time.gmtime()[:2])
             
-            for key in keys:
-                ttl = self.redis_client.ttl(key)
-                if ttl == -1:  # Key has no expiry
-                    # Set appropriate expiry based on key type
-                    key_str = key.decode('utf-8')
-                    if ":minute:" in key_str:
-                        self.redis_client.expire(key, 60)
-                    elif ":month:" in key_str:
-                        next_month = (datetime.utcnow().replace(day=1) + timedelta(days=32)).replace(day=1)
-                        self.redis_client.expireat(key, int(next_month.timestamp()))
-                    cleaned += 1
+            for start in range(0, len(keys), RATE_LIMIT_SCAN_COUNT):
+                batch = keys[start:start + RATE_LIMIT_SCAN_COUNT]
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key in batch:
+                    pipe.ttl(key)
+                ttls = pipe.execute()
+                
+                for key, ttl in zip(batch, ttls):
+                    if ttl == -1:  # Key has no expiry
+                        # Counter hashes hold at most the current month
+                        pipe.expireat(key, month_reset)
+                        cleaned += 1
+                pipe.execute()
             
             return cleaned
         except Exception:
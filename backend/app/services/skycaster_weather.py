@@ -1,16 +1,17 @@
 import httpx
-import json
 import asyncio
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import pytz
+import numpy as np
 from loguru import logger
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.models.pricing_config import PricingConfig, CurrencyConfig, VariableMapping, WeatherRequest
+from app.models.pricing_config import WeatherRequest
 from app.models.user import User
 from app.models.api_key import ApiKey
+from app.services.pricing_cache import PricingCache, PricingSnapshot
 
 class SkycasterWeatherService:
     """
@@ -69,7 +70,7 @@ class SkycasterWeatherService:
             # Validate timestamp is in the future
             try:
                 # Parse the timestamp
-                timestamp_dt = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
+                timestamp_dt = datetime.fromisoformat(timestamp)
                 # Add timezone awareness
                 tz = pytz.timezone(timezone)
                 timestamp_dt = tz.localize(timestamp_dt)
@@ -412,10 +413,9 @@ class SkycasterWeatherService:
     ) -> Dict[str, Any]:
         """Calculate pricing for the request"""
         # Get pricing configs
-        pricing_configs = db.query(PricingConfig).filter(
-            PricingConfig.variable_name.in_(variables),
-            PricingConfig.is_active == True
-        ).all()
+        active_pricing = PricingCache.get_active_pricing(db)
+        # Each configured variable is charged once, however often it is requested
+        pricing_configs = [active_pricing[var] for var in dict.fromkeys(variables) if var in active_pricing]
         
         # Calculate base cost
         total_cost = 0.0
@@ -461,7 +461,7 @@ class SkycasterWeatherService:
             "final_amount": f"{final_amount:.2f}"
         }
     
-    def _get_plan_price(self, config: PricingConfig, user: User) -> float:
+    def _get_plan_price(self, config: PricingSnapshot, user: User) -> float:
         """Get plan-specific price for a variable"""
         if not user:
             return config.base_price
@@ -494,16 +494,13 @@ class SkycasterWeatherService:
             return amount
         
         # Get exchange rates
-        to_currency_config = db.query(CurrencyConfig).filter(
-            CurrencyConfig.currency_code == to_currency,
-            CurrencyConfig.is_active == True
-        ).first()
+        exchange_rate = PricingCache.get_exchange_rates(db).get(to_currency)
         
-        if not to_currency_config:
+        if exchange_rate is None:
             return amount  # Return original amount if currency not found
         
         # Convert from INR to target currency
-        return amount * to_currency_config.exchange_rate
+        return amount * exchange_rate
     
     async def _log_weather_request(
         self,
@@ -536,11 +533,11 @@ class SkycasterWeatherService:
             weather_request = WeatherRequest(
                 user_id=user.id if user else None,
                 api_key_id=api_key.id if api_key else None,
-                locations=json.dumps(locations),
-                variables=json.dumps(variables),
+                locations=locations,
+                variables=variables,
                 timestamp=timestamp,
                 timezone=timezone,
-                endpoints_called=json.dumps(endpoints_called),
+                endpoints_called=endpoints_called,
                 response_status=response_status,
                 response_time=response_time,
                 success=success,
@@ -564,7 +561,7 @@ class SkycasterWeatherService:
         """Format timestamp according to specified timezone"""
         try:
             # Parse timestamp
-            dt = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
+            dt = datetime.fromisoformat(timestamp)
             
             # Set timezone
             tz = pytz.timezone(timezone)
@@ -581,23 +578,35 @@ class SkycasterWeatherService:
         """Close HTTP client"""
         await self.client.aclose()
     
+    @staticmethod
+    def to_columnar(
+        response: Dict[str, Any],
+        locations: List[List[float]],
+        variables: List[str]
+    ) -> Tuple[List[Tuple[float, float]], np.ndarray]:
+        """Pivot a forecast's per-location dicts into a (locations x variables) float32 matrix
+        
+        Cells with no numeric value from the upstream endpoint are NaN.
+        """
+        location_data = response["location_data"]
+        values = np.full((len(locations), len(variables)), np.nan, dtype=np.float32)
+        coords = []
+        
+        for i, location in enumerate(locations):
+            lat, lon = location
+            coords.append((lat, lon))
+            data = location_data.get(f"{lat},{lon}", {})
+            for j, var in enumerate(variables):
+                value = data.get(var)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    values[i, j] = value
+        
+        return coords, values
+    
     def get_supported_variables(self) -> Dict[str, List[str]]:
         """Get list of supported variables grouped by endpoint"""
         return self.endpoint_variables.copy()
     
     def get_variable_info(self, db: Session) -> List[Dict[str, Any]]:
         """Get detailed information about all supported variables"""
-        variables = db.query(VariableMapping).filter(
-            VariableMapping.is_active == True
-        ).all()
-        
-        return [
-            {
-                "variable_name": var.variable_name,
-                "endpoint_type": var.endpoint_type,
-                "description": var.description,
-                "unit": var.unit,
-                "data_type": var.data_type
-            }
-            for var in variables
-        ]
\ No newline at end of file
+        return PricingCache.get_variable_info(db)
\ No newline at end of file
@@ -54,7 +54,7 @@ class SubscriptionService:
         if not subscription:
             return None
         
-        update_dict = update_data.dict(exclude_unset=True)
+        update_dict = update_data.model_dump(exclude_unset=True)
         for field, value in update_dict.items():
             setattr(subscription, field, value)
         
@@ -142,12 +142,17 @@ class SubscriptionService:
     
     @staticmethod
     def increment_usage(db: Session, user_id: str, amount: int = 1) -> Optional[Subscription]:
-        """Increment usage for user's subscription"""
+        """Increment usage for user's subscription.
+
+        Inserts into usage_logs are already counted by the database trigger;
+        use this only for usage that is not recorded there.
+        """
         subscription = SubscriptionService.get_user_subscription(db, user_id)
         if not subscription:
             return None
         
-        subscription.current_month_usage += amount
+        # Atomic in SQL so concurrent requests cannot lose increments
+        subscription.current_month_usage = Subscription.current_month_usage + amount
         db.commit()
         db.refresh(subscription)
         return subscription
@@ -167,6 +172,16 @@ class SubscriptionService:
         db.refresh(subscription)
         return subscription
     
+    @staticmethod
+    def reset_all_monthly_usage(db: Session) -> int:
+        """Reset the usage counter of every active subscription, returning the row count"""
+        reset_count = db.query(Subscription).filter(
+            Subscription.status == SubscriptionStatus.ACTIVE
+        ).update({Subscription.current_month_usage: 0}, synchronize_session=False)
+        
+        db.commit()
+        return reset_count
+    
     @staticmethod
     def get_expired_subscriptions(db: Session) -> List[Subscription]:
         """Get subscriptions that have expired"""
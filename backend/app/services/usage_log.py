@@ -1,11 +1,97 @@
 from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, desc
-from datetime import datetime, timedelta
+from sqlalchemy import func, and_, desc, insert
+from datetime import datetime, timedelta, timezone
+import asyncio
+import logging
 
+from app.core.database import SessionLocal
 from app.models.usage_log import UsageLog
 from app.schemas.usage_log import UsageLogCreate
 
+logger = logging.getLogger(__name__)
+
+USAGE_LOG_BATCH_SIZE = 500
+USAGE_LOG_FLUSH_INTERVAL_SECONDS = 0.5
+
+class UsageLogBuffer:
+    """Collects usage log rows in memory and writes each batch with one multi-row INSERT
+    
+    A batch is flushed when it reaches USAGE_LOG_BATCH_SIZE rows or
+    USAGE_LOG_FLUSH_INTERVAL_SECONDS after its first row, whichever is first.
+    Rows still queued when the process is killed without stop() are lost.
+    """
+    
+    def __init__(self):
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+    
+    def enqueue(self, usage_data: UsageLogCreate, user_id: str, api_key_id: str):
+        row = usage_data.model_dump()
+        row["user_id"] = user_id
+        row["api_key_id"] = api_key_id
+        # Stamp now rather than at flush time
+        row["created_at"] = datetime.now(timezone.utc)
+        self.queue.put_nowait(row)
+    
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        
+        rows = []
+        while not self.queue.empty():
+            rows.append(self.queue.get_nowait())
+        if rows:
+            await asyncio.to_thread(self._write, rows)
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        batch: List[Dict[str, Any]] = []
+        try:
+            while True:
+                batch = [await self.queue.get()]
+                deadline = loop.time() + USAGE_LOG_FLUSH_INTERVAL_SECONDS
+                while len(batch) < USAGE_LOG_BATCH_SIZE:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                # Handed to the writer thread, which finishes it even if we are cancelled
+                rows, batch = batch, []
+                await asyncio.to_thread(self._write, rows)
+        except asyncio.CancelledError:
+            # Rows already taken off the queue are no longer seen by stop()'s drain
+            if batch:
+                await asyncio.to_thread(self._write, batch)
+            raise
+    
+    @staticmethod
+    def _write(rows: List[Dict[str, Any]]):
+        db = SessionLocal()
+        try:
+            # executemany: SQLAlchemy batches this into multi-row INSERT ... VALUES
+            db.execute(insert(UsageLog), rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to write {len(rows)} usage logs: {e}")
+        finally:
+            db.close()
+
+usage_log_buffer = UsageLogBuffer()
+
 class UsageLogService:
     @staticmethod
     def create_usage_log(db: Session, usage_data: UsageLogCreate, user_id: str, api_key_id: str) -> UsageLog:
@@ -13,7 +99,7 @@ class UsageLogService:
         usage_log = UsageLog(
             user_id=user_id,
             api_key_id=api_key_id,
-            **usage_data.dict()
+            **usage_data.model_dump()
         )
         
         db.add(usage_log)
@@ -21,6 +107,11 @@ class UsageLogService:
         db.refresh(usage_log)
         return usage_log
     
+    @staticmethod
+    def queue_usage_log(usage_data: UsageLogCreate, user_id: str, api_key_id: str):
+        """Buffer a usage log entry for the next batched insert (no commit per request)"""
+        usage_log_buffer.enqueue(usage_data, user_id, api_key_id)
+    
     @staticmethod
     def get_usage_log(db: Session, log_id: str) -> Optional[UsageLog]:
         """Get usage log by ID"""
@@ -8,6 +8,7 @@ import logging
 from datetime import datetime
 from typing import Dict, Any, Optional
 from celery import Celery
+from celery.schedules import crontab
 from celery.signals import task_success, task_failure, task_prerun, task_postrun
 from app.core.config import settings
 from app.core.database import get_db
@@ -222,6 +223,38 @@ def cleanup_expired_api_keys(self):
         logger.error(f"API key cleanup failed: {exc}")
         raise self.retry(exc=exc, countdown=120, max_retries=3)
 
+@celery_app.task(bind=True, name="reset_monthly_usage")
+def reset_monthly_usage(self):
+    """
+    Reset the denormalized subscription usage counters at the start of each month
+    """
+    try:
+        from app.services.subscription import SubscriptionService
+        
+        db = next(get_db())
+        try:
+            reset_count = SubscriptionService.reset_all_monthly_usage(db)
+        finally:
+            db.close()
+        
+        logger.info(
+            "Monthly usage reset",
+            extra={
+                "type": "task_event",
+                "task": "reset_monthly_usage",
+                "status": "completed",
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "queue": "redis_main",
+                "subscriptions_reset": reset_count
+            }
+        )
+        
+        return {"subscriptions_reset": reset_count}
+        
+    except Exception as exc:
+        logger.error(f"Monthly usage reset failed: {exc}")
+        raise self.retry(exc=exc, countdown=300, max_retries=3)
+
 @celery_app.task(bind=True, name="monitor_queue_health")
 def monitor_queue_health(self):
     """
@@ -267,6 +300,52 @@ def monitor_queue_health(self):
         logger.error(f"Queue health monitoring failed: {exc}")
         raise self.retry(exc=exc, countdown=60, max_retries=2)
 
+@celery_app.task(bind=True, name="process_stripe_event")
+def process_stripe_event(self, event_id: str, event_type: str, data: Dict[str, Any]):
+    """
+    Apply a verified Stripe webhook event outside the webhook request
+    """
+    try:
+        from app.services.billing import BillingService
+        
+        db = next(get_db())
+        try:
+            BillingService.process_webhook_event(db, event_id, event_type, data)
+        finally:
+            db.close()
+        
+        logger.info(
+            "Stripe event processed",
+            extra={
+                "type": "task_event",
+                "task": "process_stripe_event",
+                "status": "completed",
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "queue": "redis_main",
+                "event_id": event_id,
+                "event_type": event_type
+            }
+        )
+        
+        return {"event_id": event_id, "event_type": event_type}
+        
+    except Exception as exc:
+        logger.error(f"Stripe event {event_id} processing failed: {exc}")
+        raise self.retry(exc=exc, countdown=60, max_retries=5)
+
+@celery_app.task(bind=True, name="send_email")
+def send_email_task(self, to_email: str, subject: str, html_content: str, text_content: Optional[str] = None):
+    """
+    Send an email queued by EmailService.queue_email, backing off between attempts
+    """
+    from app.services.email import EmailService
+    
+    # send_email logs and returns False on failure rather than raising
+    if not EmailService.send_email(to_email, subject, html_content, text_content):
+        raise self.retry(countdown=30 * 2 ** self.request.retries, max_retries=5)
+    
+    return {"to_email": to_email, "subject": subject}
+
 # Periodic tasks configuration (for Celery Beat)
 celery_app.conf.beat_schedule = {
     'cleanup-expired-keys': {
@@ -277,6 +356,10 @@ celery_app.conf.beat_schedule = {
         'task': 'monitor_queue_health',
         'schedule': 300.0,   # Every 5 minutes
     },
+    'reset-monthly-usage': {
+        'task': 'reset_monthly_usage',
+        'schedule': crontab(minute=0, hour=0, day_of_month=1),  # Midnight UTC on the 1st
+    },
     'process-monthly-billing': {
         'task': 'process_billing_cycle',
         'schedule': 86400.0, # Daily check for billing
@@ -290,5 +373,8 @@ __all__ = [
     'send_usage_report',
     'process_billing_cycle',
     'cleanup_expired_api_keys',
-    'monitor_queue_health'
+    'reset_monthly_usage',
+    'monitor_queue_health',
+    'process_stripe_event',
+    'send_email_task'
 ]
\ No newline at end of file
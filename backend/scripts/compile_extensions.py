@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-time compile hot pure-Python modules with Cython
+
+Builds the Pydantic schema modules and the audit logging path into extension
+modules next to their sources. The import system prefers an extension module
+over the .py of the same name, so a container that ran this step picks up the
+compiled modules and anywhere else keeps importing the pure-Python ones.
+Requires Cython at build time:
+
+    pip install cython && python scripts/compile_extensions.py
+"""
+import sys
+import os
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SCHEMAS_DIR = BACKEND_DIR / "app" / "schemas"
+
+# Glue run on every authenticated request: event templating, row dict
+# building and the audit queue hand-off
+SERVICE_MODULES = [
+    "app/services/audit_service.py",
+    "app/services/audit_queue.py",
+]
+
+def main():
+    try:
+        from Cython.Build import cythonize
+        from setuptools import setup
+    except ImportError:
+        print("❌ Cython and setuptools are required: pip install cython setuptools")
+        return 1
+
+    modules = sorted(
+        str(path.relative_to(BACKEND_DIR))
+        for path in SCHEMAS_DIR.glob("*.py")
+        if path.name != "__init__.py"
+    ) + SERVICE_MODULES
+
+    os.chdir(BACKEND_DIR)
+    setup(
+        name="skycaster-extensions",
+        ext_modules=cythonize(
+            modules,
+            compiler_directives={
+                "language_level": 3,
+                # Pydantic and SQLAlchemy introspect __annotations__ and need
+                # real function objects
+                "binding": True,
+                "annotation_typing": False,
+            },
+        ),
+        script_args=["build_ext", "--inplace"],
+    )
+    print(f"✅ Compiled {len(modules)} modules")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Admin pricing response models must accept ORM rows returned by routes
+"""
+from datetime import datetime
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.models  # noqa: F401  (configures the mappers)
+from app.models.pricing_config import PricingConfig, CurrencyConfig, VariableMapping
+from app.schemas.pricing import PricingConfigResponse, CurrencyConfigResponse, VariableMappingResponse
+
+NOW = datetime(2026, 10, 16, 12, 0, 0)
+
+
+def _pricing_config() -> PricingConfig:
+    return PricingConfig(
+        id="cfg-1", variable_name="ghi(W/m2)", endpoint_type="omega", base_price=1.5,
+        currency="INR", tax_rate=18.0, tax_enabled=True, hsn_sac_code=None,
+        free_plan_price=None, developer_plan_price=1.0, business_plan_price=None,
+        enterprise_plan_price=None, is_active=True, created_at=NOW, updated_at=NOW,
+        created_by="user-1"
+    )
+
+
+def _currency_config() -> CurrencyConfig:
+    return CurrencyConfig(
+        id="cur-1", currency_code="USD", currency_symbol="$", currency_name="US Dollar",
+        country_codes=None, exchange_rate=0.012, is_active=True, created_at=NOW, updated_at=NOW
+    )
+
+
+def _variable_mapping() -> VariableMapping:
+    return VariableMapping(
+        id="var-1", variable_name="ghi(W/m2)", endpoint_type="omega", endpoint_url="/omega",
+        description=None, unit="W/m2", data_type="float", is_active=True,
+        created_at=NOW, updated_at=NOW
+    )
+
+
+api = FastAPI()
+
+
+@api.get("/configs", response_model=List[PricingConfigResponse])
+def list_configs():
+    return [_pricing_config()]
+
+
+@api.get("/configs/one", response_model=PricingConfigResponse)
+def get_config():
+    return _pricing_config()
+
+
+@api.get("/currencies", response_model=List[CurrencyConfigResponse])
+def list_currencies():
+    return [_currency_config()]
+
+
+@api.get("/variables", response_model=List[VariableMappingResponse])
+def list_variables():
+    return [_variable_mapping()]
+
+
+client = TestClient(api)
+
+
+def test_pricing_config_response_from_orm():
+    response = client.get("/configs")
+    assert response.status_code == 200
+    assert response.json()[0]["variable_name"] == "ghi(W/m2)"
+    
+    response = client.get("/configs/one")
+    assert response.status_code == 200
+    assert response.json()["id"] == "cfg-1"
+
+
+def test_currency_config_response_from_orm():
+    response = client.get("/currencies")
+    assert response.status_code == 200
+    assert response.json()[0]["currency_code"] == "USD"
+
+
+def test_variable_mapping_response_from_orm():
+    response = client.get("/variables")
+    assert response.status_code == 200
+    assert response.json()[0]["endpoint_url"] == "/omega"